@@ -1,9 +1,19 @@
 from fast_abtest.decorator import ab_test
 from fast_abtest.monitoring import MetricLabel, Metric
 from fast_abtest.interface import Exporter, Context, Metric as IMetric
+from fast_abtest.monitoring.interface import AsyncExporter
+from fast_abtest.cache import CacheConfig
 from fast_abtest.config import ABTestConfig, ConfigManager
+from fast_abtest.experiment_scope import ExperimentContext, current_experiment_context, experiment_context
+from fast_abtest.guardrail import LatencyGuardrail
+from fast_abtest.layer import Layer
+from fast_abtest.snapshot import SnapshotStore
+from fast_abtest.warmup import Warmup
+from fast_abtest.monitoring.srm import SrmConfig
 
 from fast_abtest.exporter.prometheus import PrometheusExporter as _PrometheusExporter
+from fast_abtest.exporter.opentelemetry import OpenTelemetryExporter as _OpenTelemetryExporter
+from fast_abtest.exporter.statsd import StatsDExporter as _StatsDExporter
 
 __version__ = "0.3.0"
 __version_info__ = (0, 3, 0)
@@ -13,11 +23,25 @@ __all__ = [
     "Metric",
     "MetricLabel",
     "Exporter",
+    "AsyncExporter",
     "Context",
     "ABTestConfig",
     "ConfigManager",
     "PrometheusExporter",
+    "OpenTelemetryExporter",
+    "StatsDExporter",
     "IMetric",
+    "ExperimentContext",
+    "experiment_context",
+    "current_experiment_context",
+    "Layer",
+    "CacheConfig",
+    "SrmConfig",
+    "LatencyGuardrail",
+    "Warmup",
+    "SnapshotStore",
 ]
 
 PrometheusExporter = _PrometheusExporter
+OpenTelemetryExporter = _OpenTelemetryExporter
+StatsDExporter = _StatsDExporter
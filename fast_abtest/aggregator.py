@@ -0,0 +1,502 @@
+import argparse
+import asyncio
+import os
+import socket
+import struct
+import time
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass, field
+from logging import Logger, getLogger
+from threading import Event, Lock, Thread
+from time import perf_counter_ns
+from typing import Any, Iterable, Self
+from weakref import WeakValueDictionary
+
+from fast_abtest.monitoring.histogram import LogHistogram
+from fast_abtest.monitoring.interface import Context
+
+Address = tuple[str, int] | str
+
+MAGIC = b"ABAG"
+VERSION = 1
+PUSH = 1
+DECISION = 2
+MAX_FRAME = 16 * 1024 * 1024
+
+# magic, version, frame type, entry count, payload length, unix second of the batch
+HEADER = struct.Struct("<4sBBHIq")
+STRING = struct.Struct("<H")
+PUSH_ENTRY = struct.Struct("<QQdBH")  # calls, errors, disable threshold, flags, number of latency buckets
+BUCKET = struct.Struct("<HI")  # LogHistogram index of the latency in microseconds, count
+DECISION_ENTRY = struct.Struct("<BQQ")  # flags, fleet calls and errors of the window
+ACTIVE = 1
+RESET = 1  # push flag: the variant was re-enabled on the node (`enable_variant`)
+
+
+def parse_address(value: Address) -> Address:
+    """Parses "host:port" (TCP) or "unix:/path" / "/path" (Unix socket) into a socket address."""
+    if isinstance(value, tuple):
+        return value
+    if value.startswith("unix:"):
+        return value[len("unix:") :]
+    if value.startswith("/") or value.startswith("."):
+        return value
+    host, separator, port = value.rpartition(":")
+    if not separator:
+        raise ValueError(f"Invalid aggregator address {value!r}, expected host:port or unix:/path")
+    return host or "127.0.0.1", int(port)
+
+
+@dataclass
+class Summary:
+    """Mergeable summary of one variant: counters and a sparse latency sketch (`LogHistogram` buckets)."""
+
+    calls: int = 0
+    errors: int = 0
+    threshold: float = 1.0
+    buckets: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    reset: bool = False
+
+    def merge(self: Self, other: "Summary") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.threshold = other.threshold
+        self.reset = self.reset or other.reset
+        for index, count in other.buckets.items():
+            self.buckets[index] += count
+
+
+@dataclass
+class Decision:
+    """Fleet-wide state of a variant pushed back to the nodes."""
+
+    active: bool
+    calls: int
+    errors: int
+
+
+def _pack_string(buffer: bytearray, value: str) -> None:
+    encoded = value.encode()
+    buffer += STRING.pack(len(encoded))
+    buffer += encoded
+
+
+def _unpack_string(payload: bytes, offset: int) -> tuple[str, int]:
+    (length,) = STRING.unpack_from(payload, offset)
+    offset += STRING.size
+    return payload[offset : offset + length].decode(), offset + length
+
+
+def _frame(kind: int, count: int, payload: bytearray, second: int) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, kind, count, len(payload), second) + payload
+
+
+def _parse_header(header: bytes) -> tuple[int, int, int, int]:
+    magic, version, kind, count, length, second = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or length > MAX_FRAME:
+        raise ValueError("Invalid aggregator frame")
+    return kind, count, length, second
+
+
+def encode_push(node: str, summaries: dict[tuple[str, str], Summary], second: int) -> bytes:
+    payload = bytearray()
+    _pack_string(payload, node)
+    for (scenario, variant), summary in summaries.items():
+        _pack_string(payload, scenario)
+        _pack_string(payload, variant)
+        buckets = [(index, count) for index, count in summary.buckets.items() if count]
+        flags = RESET if summary.reset else 0
+        payload += PUSH_ENTRY.pack(summary.calls, summary.errors, summary.threshold, flags, len(buckets))
+        for bucket in buckets:
+            payload += BUCKET.pack(*bucket)
+    return _frame(PUSH, len(summaries), payload, second)
+
+
+def decode_push(payload: bytes, count: int) -> tuple[str, dict[tuple[str, str], Summary]]:
+    node, offset = _unpack_string(payload, 0)
+    summaries = {}
+    for _ in range(count):
+        scenario, offset = _unpack_string(payload, offset)
+        variant, offset = _unpack_string(payload, offset)
+        calls, errors, threshold, flags, bucket_count = PUSH_ENTRY.unpack_from(payload, offset)
+        offset += PUSH_ENTRY.size
+        summary = Summary(calls, errors, threshold, reset=bool(flags & RESET))
+        for _ in range(bucket_count):
+            index, bucket = BUCKET.unpack_from(payload, offset)
+            offset += BUCKET.size
+            summary.buckets[index] += bucket
+        summaries[(scenario, variant)] = summary
+    return node, summaries
+
+
+def encode_decisions(decisions: dict[tuple[str, str], Decision], second: int) -> bytes:
+    payload = bytearray()
+    for (scenario, variant), decision in decisions.items():
+        _pack_string(payload, scenario)
+        _pack_string(payload, variant)
+        payload += DECISION_ENTRY.pack(ACTIVE if decision.active else 0, decision.calls, decision.errors)
+    return _frame(DECISION, len(decisions), payload, second)
+
+
+def decode_decisions(payload: bytes, count: int) -> dict[tuple[str, str], Decision]:
+    decisions = {}
+    offset = 0
+    for _ in range(count):
+        scenario, offset = _unpack_string(payload, offset)
+        variant, offset = _unpack_string(payload, offset)
+        flags, calls, errors = DECISION_ENTRY.unpack_from(payload, offset)
+        offset += DECISION_ENTRY.size
+        decisions[(scenario, variant)] = Decision(bool(flags & ACTIVE), calls, errors)
+    return decisions
+
+
+class _VariantState:
+    def __init__(self: Self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.threshold = 1.0
+        self.active = True
+        self.latency = LogHistogram()
+        self.seconds: dict[int, list[int]] = {}
+        self.window_calls = 0
+        self.window_errors = 0
+
+
+class Aggregator:
+    """Fleet-wide experiment statistics merged from node summaries.
+
+    Nodes (`AggregatorClient`) push per-variant call/error deltas and latency buckets in one binary
+    frame per interval, over TCP or a Unix socket. The aggregator merges them into fleet totals and
+    per-second window buckets, disables a variant once the fleet error rate of the last `window`
+    seconds exceeds its threshold (the rule nodes apply locally) and answers every push with the
+    state of the node's variants. A variant re-enabled on any node (`enable_variant`) or with
+    `enable()` starts a new window and is re-enabled on the nodes it was disabled on.
+
+    Example (standalone process):
+        python -m fast_abtest.aggregator 127.0.0.1:7070
+        python -m fast_abtest.aggregator unix:/run/abtest.sock
+    """
+
+    def __init__(self: Self, window: int = 300, logger: Logger | None = None) -> None:
+        self._window = window
+        self._logger = logger or getLogger(__name__)
+        self._variants: dict[tuple[str, str], _VariantState] = defaultdict(_VariantState)
+        self._nodes: dict[str, float] = {}
+        self._lock = Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: Thread | None = None
+
+    def merge(self: Self, node: str, summaries: dict[tuple[str, str], Summary], second: int) -> None:
+        with self._lock:
+            self._nodes[node] = time.time()
+            for key, summary in summaries.items():
+                self._merge_variant(key, summary, second)
+
+    def enable(self: Self, scenario: str, variant: str) -> None:
+        """Re-enables a variant disabled by the fleet error rate, discarding its window."""
+        with self._lock:
+            self._reset(self._variants[(scenario, variant)])
+
+    @staticmethod
+    def _reset(state: _VariantState) -> None:
+        state.active = True
+        state.seconds.clear()
+        state.window_calls = state.window_errors = 0
+
+    def _merge_variant(self: Self, key: tuple[str, str], summary: Summary, second: int) -> None:
+        state = self._variants[key]
+        if summary.reset:
+            self._reset(state)
+        state.calls += summary.calls
+        state.errors += summary.errors
+        state.threshold = summary.threshold
+        state.latency.record_buckets(summary.buckets.items())
+        window = state.seconds.setdefault(second, [0, 0])
+        window[0] += summary.calls
+        window[1] += summary.errors
+        for expired in [s for s in state.seconds if s <= second - self._window]:
+            del state.seconds[expired]
+        state.window_calls = sum(counts[0] for counts in state.seconds.values())
+        state.window_errors = sum(counts[1] for counts in state.seconds.values())
+        if state.active and state.window_calls > 10 and state.window_errors / state.window_calls > state.threshold:
+            state.active = False
+            self._logger.warning(
+                "Variant %s of %s disabled by fleet error rate (error rate: %.2f)",
+                key[1],
+                key[0],
+                state.window_errors / state.window_calls,
+            )
+
+    def decisions(self: Self, scenarios: Iterable[str]) -> dict[tuple[str, str], Decision]:
+        names = set(scenarios)
+        with self._lock:
+            return {
+                key: Decision(state.active, state.window_calls, state.window_errors)
+                for key, state in self._variants.items()
+                if key[0] in names
+            }
+
+    def stats(self: Self, window: int = 60, now: float | None = None) -> dict[str, Any]:
+        """Returns fleet totals, the last `window` seconds and latency percentiles (seconds) per variant."""
+        second = int(now if now is not None else time.time())
+        variants: dict[str, dict[str, dict[str, float]]] = defaultdict(dict)
+        # Pushes mutate the window buckets and histograms under the lock, so they are read under it too.
+        with self._lock:
+            nodes = len(self._nodes)
+            for (scenario, variant), state in self._variants.items():
+                recent = [counts for s, counts in state.seconds.items() if s > second - window]
+                calls = sum(counts[0] for counts in recent)
+                errors = sum(counts[1] for counts in recent)
+                variants[scenario][variant] = {
+                    "active": state.active,
+                    "calls": state.calls,
+                    "errors": state.errors,
+                    "window_calls": calls,
+                    "window_error_rate": errors / calls if calls else 0.0,
+                    "p50": state.latency.quantile(0.5) / 1e6,
+                    "p99": state.latency.quantile(0.99) / 1e6,
+                }
+        return {"nodes": nodes, "scenarios": dict(variants)}
+
+    async def serve(self: Self, address: Address) -> asyncio.AbstractServer:
+        address = parse_address(address)
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = await asyncio.start_unix_server(self._handle, path=address)
+        else:
+            self._server = await asyncio.start_server(self._handle, *address)
+        return self._server
+
+    def start(self: Self, address: Address) -> Address:
+        """Serves in a background thread and returns the bound address (TCP port 0 picks a free port)."""
+        started = Event()
+        bound: list[Address] = []
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            server = self._loop.run_until_complete(self.serve(address))
+            bound.append(server.sockets[0].getsockname())
+            started.set()
+            self._loop.run_forever()
+            server.close()
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+        self._thread = Thread(target=run, name="abtest-aggregator", daemon=True)
+        self._thread.start()
+        started.wait()
+        return bound[0] if isinstance(bound[0], str) else tuple(bound[0][:2])  # type: ignore
+
+    def stop(self: Self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = self._thread = None
+
+    async def _handle(self: Self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                kind, count, length, second = _parse_header(await reader.readexactly(HEADER.size))
+                payload = await reader.readexactly(length)
+                if kind != PUSH:
+                    raise ValueError(f"Unexpected frame type {kind}")
+                node, summaries = decode_push(payload, count)
+                self.merge(node, summaries, second)
+                decisions = self.decisions(scenario for scenario, _ in summaries)
+                writer.write(encode_decisions(decisions, second))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:  # noqa
+            self._logger.error(traceback.format_exc())
+        finally:
+            writer.close()
+
+
+class AggregatorClient:
+    """Node side of the `Aggregator`: pushes summaries of tracked scenarios and applies fleet decisions.
+
+    Calls are summarized by a recorder hook (calls, errors, latency buckets); a daemon thread sends
+    one frame every `interval` seconds and disables the variants the fleet has disabled. Summaries
+    of a failed push are kept and sent with the next one.
+    """
+
+    _clients: dict[Address, "AggregatorClient"] = {}
+    _clients_lock = Lock()
+
+    def __init__(
+        self: Self,
+        address: Address,
+        interval: float = 1.0,
+        node: str | None = None,
+        timeout: float = 2.0,
+        logger: Logger | None = None,
+    ) -> None:
+        self._address = parse_address(address)
+        self._interval = interval
+        self._node = node or f"{socket.gethostname()}:{os.getpid()}"
+        self._timeout = timeout
+        self._logger = logger or getLogger(__name__)
+        self._scenarios: WeakValueDictionary[str, Any] = WeakValueDictionary()
+        self._pending: dict[tuple[str, str], Summary] = defaultdict(Summary)
+        self._decisions: dict[tuple[str, str], Decision] = {}
+        self._fleet_disabled: set[tuple[str, str]] = set()
+        self._socket: socket.socket | None = None
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name="abtest-aggregator-client", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def connect(cls: type["AggregatorClient"], address: Address, interval: float = 1.0) -> "AggregatorClient":
+        """Returns the client of an aggregator address, shared by all scenarios pushing to it."""
+        key = parse_address(address)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = cls._clients[key] = cls(key, interval)
+            return client
+
+    def track(self: Self, scenario: Any) -> None:
+        self._scenarios[scenario._name] = scenario
+        scenario._metric_recorder.add(_AggregatorHook(self))
+
+    def observe(self: Self, scenario: str, variant: str, microseconds: int, is_error: bool, count: int = 1) -> None:
+        index = LogHistogram.bucket_index(microseconds)
+        with self._lock:
+            summary = self._pending[(scenario, variant)]
+            summary.calls += count
+            summary.errors += count if is_error else 0
+            summary.buckets[index] += count
+
+    def fleet(self: Self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Returns the last fleet-wide state received for every tracked variant."""
+        fleet: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        for (scenario, variant), decision in self._decisions.items():
+            fleet[scenario][variant] = {"active": decision.active, "calls": decision.calls, "errors": decision.errors}
+        return dict(fleet)
+
+    def push(self: Self) -> bool:
+        """Sends pending summaries and applies the answer; returns False if the aggregator is unreachable."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Summary)
+        for scenario in list(self._scenarios.values()):
+            for variant in [scenario._main_scenario, *scenario._variants]:
+                key = (scenario._name, variant.handler.__name__)
+                pending[key].threshold = variant.threshold
+                if key in self._fleet_disabled and variant.is_active:
+                    # Re-enabled locally after a fleet disable: the aggregator starts a new window.
+                    pending[key].reset = True
+                    self._fleet_disabled.discard(key)
+        try:
+            answer = self._exchange(encode_push(self._node, pending, int(time.time())))
+        except (OSError, ValueError, struct.error):
+            self._close()
+            with self._lock:
+                for key, summary in pending.items():
+                    summary.merge(self._pending[key])
+                    self._pending[key] = summary
+            return False
+        self._decisions.update(answer)
+        self._apply(answer)
+        return True
+
+    def close(self: Self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self.push()
+        self._close()
+        with self._clients_lock:
+            if self._clients.get(self._address) is self:
+                del self._clients[self._address]
+
+    def _exchange(self: Self, frame: bytes) -> dict[tuple[str, str], Decision]:
+        if self._socket is None:
+            if isinstance(self._address, str):
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.settimeout(self._timeout)
+                self._socket.connect(self._address)
+            else:
+                self._socket = socket.create_connection(self._address, timeout=self._timeout)
+        self._socket.sendall(frame)
+        kind, count, length, _ = _parse_header(self._receive(HEADER.size))
+        if kind != DECISION:
+            raise ValueError(f"Unexpected frame type {kind}")
+        return decode_decisions(self._receive(length), count)
+
+    def _receive(self: Self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(size - len(data))  # type: ignore
+            if not chunk:
+                raise ConnectionError("Aggregator closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def _close(self: Self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _apply(self: Self, decisions: dict[tuple[str, str], Decision]) -> None:
+        for key, decision in decisions.items():
+            scenario = self._scenarios.get(key[0])
+            if scenario is None:
+                continue
+            if decision.active:
+                if key in self._fleet_disabled:
+                    # Re-enabled on another node or on the aggregator.
+                    self._fleet_disabled.discard(key)
+                    scenario.enable_variant(key[1])
+                continue
+            self._fleet_disabled.add(key)
+            for variant in scenario._variants:
+                if variant.handler.__name__ == key[1] and variant.is_active:
+                    variant.is_active = False
+                    scenario._logger.warning(
+                        f"Variant {key[1]} disabled by fleet error rate "
+                        f"(error rate: {decision.errors / max(decision.calls, 1):.2})"
+                    )
+
+    def _run(self: Self) -> None:
+        while not self._stopped.wait(self._interval):
+            try:
+                self.push()
+            except Exception:  # noqa
+                self._logger.error(traceback.format_exc())
+
+
+class _AggregatorHook:
+    def __init__(self: Self, client: AggregatorClient) -> None:
+        self._client = client
+
+    def on_start(self: Self, context: Context) -> Context:
+        # Kept per call in the context: a scenario calling itself must not overwrite it.
+        context.extra["aggregator_start"] = perf_counter_ns()
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        microseconds = (perf_counter_ns() - context.extra["aggregator_start"]) // 1000
+        count = context.extra.get("batch_size", 1)
+        self._client.observe(context.scenario, context.variant, microseconds, is_error, count)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="fast_abtest fleet aggregator")
+    parser.add_argument("address", help="host:port or unix:/path")
+    parser.add_argument("--window", type=int, default=300, help="seconds of window buckets kept per variant")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = await Aggregator(args.window).serve(args.address)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import json
+from http.cookies import SimpleCookie
+from typing import Any, Awaitable, Callable, Iterable, MutableMapping, Self
+from urllib.parse import parse_qs
+
+from fast_abtest.experiment_scope import experiment_context
+from fast_abtest.registred_scenario import RegisteredScenario
+
+Scope = MutableMapping[str, Any]
+ASGIApp = Callable[[Scope, Callable[[], Awaitable[Any]], Callable[[Any], Awaitable[None]]], Awaitable[None]]
+KeyExtractor = Callable[[Scope], Any]
+
+
+def header_key(name: str) -> KeyExtractor:
+    """Uses a request header (e.g. `x-user-id`) as the assignment key."""
+    raw_name = name.lower().encode()
+
+    def extract(scope: Scope) -> str | None:
+        for header, value in scope.get("headers", ()):
+            if header == raw_name:
+                return value.decode()
+        return None
+
+    return extract
+
+
+def cookie_key(name: str) -> KeyExtractor:
+    """Uses a cookie (e.g. a session id) as the assignment key."""
+    cookie_header = header_key("cookie")
+
+    def extract(scope: Scope) -> str | None:
+        raw = cookie_header(scope)
+        if raw is None:
+            return None
+        morsel = SimpleCookie(raw).get(name)
+        return morsel.value if morsel is not None else None
+
+    return extract
+
+
+def query_key(name: str) -> KeyExtractor:
+    """Uses a query parameter (e.g. `user_id`) as the assignment key."""
+
+    def extract(scope: Scope) -> str | None:
+        values = parse_qs(scope.get("query_string", b"").decode()).get(name)
+        return values[0] if values else None
+
+    return extract
+
+
+class ExperimentMiddleware:
+    """ASGI middleware assigning variants of mounted scenarios before routing.
+
+    The request path is rewritten to the selected variant's route (see `RegisteredScenario.mount`),
+    so only that variant's dependencies are resolved. The request runs inside an
+    `experiment_context` keyed by `key`, which nested `ab_test` calls share.
+
+    Example:
+        @ab_test(metrics=[Metric.LATENCY], routed=True)
+        async def feed(user_id: int, db: Session = Depends(get_db)): ...
+
+        @feed.register_variant(traffic_percent=30)
+        async def feed_b(user_id: int, cache: Cache = Depends(get_cache)): ...
+
+        feed.mount(app, "/feed")
+        app.add_middleware(ExperimentMiddleware, experiments=[feed], key=header_key("x-user-id"))
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        experiments: Iterable[RegisteredScenario],
+        key: KeyExtractor | None = None,
+    ) -> None:
+        self._app = app
+        self._experiments = list(experiments)
+        self._key = key
+
+    async def __call__(self: Self, scope: Scope, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        key = self._key(scope) if self._key is not None else None
+        with experiment_context(key=key) as experiment:
+            root_path = scope.get("root_path", "")
+            path = scope["path"]
+            route_path = path[len(root_path) :] if root_path and path.startswith(root_path) else path
+            for scenario in self._experiments:
+                if scenario.route(route_path, scope["method"]) is None:
+                    continue
+                if scenario._short_circuit is not None:
+                    variant = scenario._killed or scenario._main_scenario
+                else:
+                    variant = scenario._assign(experiment)
+                if variant is not None and variant is not scenario._main_scenario:
+                    variant_path = root_path + scenario._variant_path(variant, route_path)
+                    scope = {**scope, "path": variant_path, "raw_path": variant_path.encode()}
+                break
+            await self._app(scope, receive, send)
+
+
+def stats_app(experiments: Iterable[RegisteredScenario], default_window: int = 60) -> ASGIApp:
+    """ASGI app returning live stats of scenarios (`ab_test(stats_retention=...)`) as compact JSON.
+
+    The window in seconds is read from the `window` query parameter.
+
+    Example:
+        app.mount("/abtest/stats", stats_app([feed, search]))
+    """
+    experiments = list(experiments)
+    window_param = query_key("window")
+
+    async def app(scope: Scope, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            return
+        try:
+            window = int(window_param(scope) or default_window)
+            body = {scenario._name: scenario.stats(window) for scenario in experiments}
+            status, payload = 200, json.dumps(body, separators=(",", ":")).encode()
+        except ValueError as exc:
+            status, payload = 400, json.dumps({"detail": str(exc)}, separators=(",", ":")).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    return app
@@ -0,0 +1,151 @@
+import asyncio
+import inspect
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Self
+
+from fast_abtest.monitoring.interface import Context
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    """Per-variant result memoization settings.
+
+    Attributes:
+        maxsize: Maximum number of cached results per variant (least recently used are evicted)
+        ttl: Time to live of a cached result in seconds, None to keep results until evicted
+    """
+
+    maxsize: int = 1024
+    ttl: float | None = None
+
+    def __post_init__(self: Self) -> None:
+        if self.maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+
+def freeze(value: Any) -> Hashable:
+    """Converts an argument into a hashable value, raising TypeError when impossible."""
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def make_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> Hashable | None:
+    """Normalizes call arguments (positional/keyword, defaults) into a key or None if unhashable."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return freeze(tuple(bound.arguments.items()))
+    except TypeError:
+        return None
+
+
+class VariantCache:
+    """Size-bounded LRU cache with TTL for the results of a single variant.
+
+    Cache hits are reported through `Context.extra["cache_hit"]`. Concurrent coroutine
+    misses on the same key and event loop await a single in-flight execution; when that
+    execution is cancelled, a waiter runs the handler itself.
+    """
+
+    def __init__(self: Self, handler: Callable[..., Any], config: CacheConfig) -> None:
+        self._signature = inspect.signature(handler)
+        self._maxsize = config.maxsize
+        self._ttl = config.ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = Lock()
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def call(self: Self, handler: Callable[..., Any], context: Context, args: tuple, kwargs: dict) -> Any:
+        key = make_key(self._signature, args, kwargs)
+        if key is None:
+            return handler(*args, **kwargs)
+        value = self._get(key)
+        context.extra["cache_hit"] = value is not _MISSING
+        if value is _MISSING:
+            value = handler(*args, **kwargs)
+            self._set(key, value)
+        return value
+
+    async def acall(self: Self, handler: Callable[..., Any], context: Context, args: tuple, kwargs: dict) -> Any:
+        key = make_key(self._signature, args, kwargs)
+        if key is None:
+            return await handler(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            value = self._get(key)
+            if value is not _MISSING:
+                context.extra["cache_hit"] = True
+                return value
+            in_flight = self._in_flight.get(flight_key)
+            if in_flight is None:
+                break
+            context.extra["cache_hit"] = True
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The call running the handler was cancelled, not this one: run it again.
+                if not in_flight.cancelled():
+                    raise
+
+        context.extra["cache_hit"] = False
+        future = self._in_flight[flight_key] = loop.create_future()
+        try:
+            value = await handler(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise the exception; mark it retrieved for the owner.
+            future.exception()
+            raise
+        else:
+            self._set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(flight_key, None)
+
+    def _get(self: Self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at and expires_at < monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self: Self, key: Hashable, value: Any) -> None:
+        expires_at = monotonic() + self._ttl if self._ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
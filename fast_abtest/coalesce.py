@@ -0,0 +1,109 @@
+import asyncio
+import inspect
+from collections.abc import Hashable
+from threading import Event, Lock
+from typing import Any, Callable, Self
+
+from fast_abtest.cache import make_key
+from fast_abtest.monitoring.interface import Context
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self: Self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class Coalescer:
+    """Single-flight execution of concurrent calls with equal arguments for a single variant.
+
+    The first call with a given key runs the handler, concurrent calls with the same key
+    (threads or coroutines of the same event loop) wait for its result or exception. Nothing
+    is kept after the execution completes. Waiters are marked with `Context.extra["coalesced"]`;
+    when a coroutine leader is cancelled, one of its waiters takes over the execution.
+    """
+
+    def __init__(self: Self, handler: Callable[..., Any]) -> None:
+        self._signature = inspect.signature(handler)
+        self._flights: dict[Hashable, _Flight] = {}
+        self._async_flights: dict[tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = Lock()
+
+    def bind(self: Self, handler: Callable[..., Any], context: Context, asynchronous: bool) -> Callable[..., Any]:
+        if asynchronous:
+
+            async def run_async(*args, **kwargs) -> Any:
+                return await self.acall(handler, context, args, kwargs)
+
+            return run_async
+
+        def run(*args, **kwargs) -> Any:
+            return self.call(handler, context, args, kwargs)
+
+        return run
+
+    def call(self: Self, handler: Callable[..., Any], context: Context, args: tuple, kwargs: dict) -> Any:
+        key = make_key(self._signature, args, kwargs)
+        if key is None:
+            return handler(*args, **kwargs)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            context.extra["coalesced"] = True
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = handler(*args, **kwargs)
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def acall(self: Self, handler: Callable[..., Any], context: Context, args: tuple, kwargs: dict) -> Any:
+        key = make_key(self._signature, args, kwargs)
+        if key is None:
+            return await handler(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        while True:
+            in_flight = self._async_flights.get(flight_key)
+            if in_flight is None:
+                break
+            context.extra["coalesced"] = True
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not this call: take over the execution.
+                if not in_flight.cancelled():
+                    raise
+
+        context.extra["coalesced"] = False
+        future = self._async_flights[flight_key] = loop.create_future()
+        try:
+            value = await handler(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise the exception; mark it retrieved for the leader.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._async_flights.pop(flight_key, None)
@@ -9,26 +9,50 @@ class ABTestConfig:
 
     Attributes:
         prometheus_port (int): Port for Prometheus metrics server (1024-65535)
+        statsd_port (int): Port of the StatsD agent `StatsDExporter` pushes to (1024-65535)
         default_labels (list[str]): Default metric label names for all exporters
         histogram_buckets (list[float]): Bucket values for histogram metrics
+        allocation_sample_rate (float): Share of calls measured by `Metric.ALLOCATIONS` (0 < rate <= 1)
+        exclude_gc_from_latency (bool): Subtract garbage collection pauses (tracked by `Metric.GC_COLLECTIONS`
+            or `Metric.GC_PAUSE_LATENCY`) from `Metric.LATENCY`
+        async_export (bool): Buffer records of coroutine scenarios on the event loop and export them from
+            a background task instead of calling the exporter on every call. Exporters are then called up
+            to a second later, from executor threads
 
     Examples:
        config = ABTestConfig(prometheus_port=9000)
        env_config = ABTestConfig.from_env()
     """
 
-    __slots__ = ("prometheus_port", "default_labels", "histogram_buckets", "extra")
+    __slots__ = (
+        "prometheus_port",
+        "statsd_port",
+        "default_labels",
+        "histogram_buckets",
+        "allocation_sample_rate",
+        "exclude_gc_from_latency",
+        "async_export",
+        "extra",
+    )
 
     def __init__(
         self,
         *,
         prometheus_port: int = 8009,
+        statsd_port: int = 8125,
         default_labels: list[str] | None = None,
         histogram_buckets: list[float] | None = None,
+        allocation_sample_rate: float = 0.1,
+        exclude_gc_from_latency: bool = False,
+        async_export: bool = False,
     ):
         self.prometheus_port = self._validate_port(prometheus_port)
+        self.statsd_port = self._validate_port(statsd_port)
         self.default_labels = default_labels or ["variant", "func", "metric"]
         self.histogram_buckets = histogram_buckets or [0.1, 0.5, 1.0, 2.0, 5.0]
+        self.allocation_sample_rate = self._validate_sample_rate(allocation_sample_rate)
+        self.exclude_gc_from_latency = exclude_gc_from_latency
+        self.async_export = async_export
 
     def __setattr__(self, name, value):
         if hasattr(self, name):
@@ -41,23 +65,37 @@ class ABTestConfig:
             raise ValueError("Port must be between 1024 and 65535")
         return value
 
+    @staticmethod
+    def _validate_sample_rate(value: float) -> float:
+        if not 0 < value <= 1:
+            raise ValueError("Sample rate must be between 0 (exclusive) and 1")
+        return float(value)
+
     @classmethod
     def from_env(cls: type["ABTestConfig"]) -> "ABTestConfig":
         """Create configuration from environment variables.
 
         Reads:
             ABTEST_PORT: Prometheus exporter port (default: 8009)
+            ABTEST_STATSD_PORT: StatsD agent port (default: 8125)
             ABTEST_LABELS: Comma-separated default labels
             ABTEST_BUCKETS: Comma-separated histogram bucket values
+            ABTEST_ALLOCATION_SAMPLE_RATE: Share of calls measured by `Metric.ALLOCATIONS` (default: 0.1)
+            ABTEST_EXCLUDE_GC_FROM_LATENCY: "1" to subtract GC pauses from latency (default: 0)
+            ABTEST_ASYNC_EXPORT: "1" to export records of coroutine scenarios from a background task (default: 0)
 
         Returns:
             New ABTestConfig instance populated from environment
         """
         return cls(
             prometheus_port=int(os.getenv("ABTEST_PORT", "8009")),
+            statsd_port=int(os.getenv("ABTEST_STATSD_PORT", "8125")),
             default_labels=os.getenv("ABTEST_LABELS", "0").split(",") or None,
             histogram_buckets=[float(value) for value in os.getenv("ABTEST_BUCKETS", "0").split(",")]
             or [0.1, 0.5, 1.0, 2.0, 5.0],
+            allocation_sample_rate=float(os.getenv("ABTEST_ALLOCATION_SAMPLE_RATE", "0.1")),
+            exclude_gc_from_latency=os.getenv("ABTEST_EXCLUDE_GC_FROM_LATENCY", "0") == "1",
+            async_export=os.getenv("ABTEST_ASYNC_EXPORT", "0") == "1",
         )
 
 
@@ -1,18 +1,30 @@
+import os
 from collections.abc import Iterable
 from enum import Enum
-from functools import wraps
+from functools import partial, wraps
 from inspect import iscoroutinefunction, markcoroutinefunction
 from logging import Logger, getLogger
 from typing import Callable
 
-from fast_abtest.exporter import PrometheusExporter
-from .config import ConfigManager
+from fast_abtest.aggregator import Address, AggregatorClient
+from fast_abtest.exporter import PrometheusExporter, StatsDExporter
+from fast_abtest.exporter.fanout import FanOutExporter
+from fast_abtest.exporter.loop import LoopExporter, is_async_exporter
+from .cache import CacheConfig, VariantCache
+from .coalesce import Coalescer
+from .config import ABTestConfig, ConfigManager
+from .executor import ProcessTask, validate_executor
 from .interface import ABTestFunction, Metric, R, ScenarioHandler, _ScenarioVariant  # type: ignore
-from .monitoring.interface import Exporter
+from .layer import Layer
+from .monitoring.interface import AsyncExporter, Exporter
 from .monitoring.metrics import Metric as MetricEnum
+from .monitoring.profiler import OverheadProfiler
+from .monitoring.srm import SrmConfig, SrmMonitor
+from .monitoring.timeseries import TimeSeries
 from .registred_scenario import (  # type: ignore
     RegisteredScenario,
 )
+from .snapshot import SnapshotStore
 
 
 def _get_metric_class_name(metric: type[Metric] | MetricEnum):
@@ -21,33 +33,112 @@ def _get_metric_class_name(metric: type[Metric] | MetricEnum):
     return metric.__class__.__name__
 
 
+def _exporter_port(exporter_class: Callable[..., Exporter | AsyncExporter], config: ABTestConfig) -> dict[str, int]:
+    """Returns the configured port of an exporter class, unless a `functools.partial` already binds one."""
+    if isinstance(exporter_class, partial):
+        if "port" in exporter_class.keywords:
+            return {}
+        exporter_class = exporter_class.func
+    if isinstance(exporter_class, type) and issubclass(exporter_class, StatsDExporter):
+        return {"port": config.statsd_port}
+    return {"port": config.prometheus_port}
+
+
 def _create_registered_scenario(
     func: ScenarioHandler[R],
     metrics: Iterable[type[Metric] | MetricEnum],
     exporter: type[Exporter],
     logger: Logger,
+    profile: bool = False,
+    layer: Layer | None = None,
+    layer_traffic_percent: int = 100,
+    routed: bool = False,
+    cache: CacheConfig | None = None,
+    executor: str | None = None,
+    stats_retention: int | None = None,
+    srm: SrmConfig | None = None,
+    coalesce: bool = False,
+    snapshot: str | os.PathLike | SnapshotStore | None = None,
+    exporters: Iterable[type[Exporter] | type[AsyncExporter]] | None = None,
+    aggregator: Address | AggregatorClient | None = None,
 ) -> RegisteredScenario[R]:
     config = ConfigManager.get_config()
     main_scenario = _ScenarioVariant(
         handler=func,
         traffic_percent=100,
         threshold=1.0,
+        cache=VariantCache(func, cache) if cache is not None else None,
+        coalescer=Coalescer(func) if coalesce else None,
+        executor=ProcessTask(func) if validate_executor(executor) else None,
     )
     metric_names = [_get_metric_class_name(metric) for metric in metrics]
-    initialized_exporter = exporter(
-        metrics=metric_names,
-        func_name=func.__name__,
-        labelnames=config.default_labels,
-        port=config.prometheus_port,
+    labelnames = list(config.default_labels)
+    if profile:
+        metric_names.append(OverheadProfiler.METRIC_NAME)
+        labelnames.append("phase")
+    if srm is not None:
+        metric_names.append(SrmMonitor.METRIC_NAME)
+    initialized_exporters = [
+        exporter_class(
+            metrics=metric_names,
+            func_name=func.__name__,
+            labelnames=labelnames,
+            **_exporter_port(exporter_class, config),
+        )
+        for exporter_class in ((exporter,) if exporters is None else exporters)
+    ]
+    fanout = FanOutExporter(initialized_exporters, logger=logger) if exporters is not None else None
+    initialized_exporter = fanout or initialized_exporters[0]
+    if is_async_exporter(initialized_exporter) and not iscoroutinefunction(func):
+        raise TypeError("AsyncExporter requires a coroutine scenario")
+    if (
+        iscoroutinefunction(func)
+        and fanout is None
+        and (config.async_export or is_async_exporter(initialized_exporter))
+    ):
+        initialized_exporter = LoopExporter(initialized_exporter, logger=logger)
+    profiler = OverheadProfiler(initialized_exporter) if profile else None
+    metrics_exporter = profiler.wrap_exporter(initialized_exporter) if profiler else initialized_exporter
+    initialized_metrics = [metric(metrics_exporter) for metric in metrics]
+    scenario = RegisteredScenario[R](
+        main_scenario,
+        initialized_metrics,
+        logger,
+        profiler=profiler,
+        layer=layer,
+        layer_traffic_percent=layer_traffic_percent,
+        routed=routed,
+        cache=cache,
+        timeseries=TimeSeries(stats_retention) if stats_retention is not None else None,
+        srm=SrmMonitor(srm, initialized_exporter) if srm is not None else None,
+        coalesce=coalesce,
+        snapshot=(
+            snapshot if snapshot is None or isinstance(snapshot, SnapshotStore) else SnapshotStore.open(snapshot)
+        ),
+        fanout=fanout,
     )
-    initialized_metrics = [metric(initialized_exporter) for metric in metrics]
-    return RegisteredScenario[R](main_scenario, initialized_metrics, logger)
+    if aggregator is not None:
+        client = aggregator if isinstance(aggregator, AggregatorClient) else AggregatorClient.connect(aggregator)
+        client.track(scenario)
+    return scenario
 
 
 def ab_test(
     metrics: Iterable[type[Metric] | MetricEnum],
     exporter: type[Exporter] = PrometheusExporter,
     logger: Logger = getLogger(__name__),
+    profile: bool = False,
+    layer: Layer | None = None,
+    layer_traffic_percent: int = 100,
+    routed: bool = False,
+    cache: CacheConfig | None = None,
+    executor: str | None = None,
+    stats_retention: int | None = None,
+    srm: SrmConfig | None = None,
+    coalesce: bool = False,
+    snapshot: str | os.PathLike | SnapshotStore | None = None,
+    exporters: Iterable[type[Exporter] | type[AsyncExporter]] | None = None,
+    aggregator: Address | AggregatorClient | None = None,
 ) -> Callable[[ScenarioHandler[R]], ABTestFunction[R]]:
     """Decorator for implementing A/B testing of methods.
     Enables easy creation and management of multiple functions variants (A/B/C...)
@@ -56,8 +147,36 @@ def ab_test(
     Args:
         metrics: Collection of metrics to track (Metric.LATENCY, Metric.CALLS_TOTAL etc.)
         exporter: A class that implements the Exporter interface for uploading metrics
-        (PrometheusExporter, ConsoleExporter, or custom exporter)
+        (PrometheusExporter, ConsoleExporter, or custom exporter). Records are exported inline; coroutine
+        scenarios buffer them on the event loop and export them from a background task
+        (`fast_abtest.exporter.loop.LoopExporter`) with `ABTestConfig(async_export=True)` or for
+        `AsyncExporter` classes
+        exporters: Several exporter classes replacing `exporter`. Each record is built once and queued to
+        every exporter, drained by one thread per exporter (`fast_abtest.exporter.fanout.FanOutExporter`),
+        so a slow or failing exporter does not delay the others. See `exporter_stats()`
+        aggregator: Address ("host:port", "unix:/path") of a `fast_abtest.aggregator.Aggregator` receiving
+        per-variant summaries every second; variants disabled by the fleet error rate are disabled locally
         logger: Custom Logger instance
+        profile: Enables overhead profiling of the A/B layer itself (selection, metric hooks,
+        handler and export phases). Statistics are available through `overhead()` and exported
+        as the `OverheadLatency` metric with a `phase` label
+        layer: Layer of mutually exclusive experiments to join. Requests outside the experiment's
+        slice of the layer are served by the main function and are not recorded
+        layer_traffic_percent: Share of the layer traffic allocated to this experiment. 1 <= ltp <= 100
+        routed: Variants are served as separate routes (see `mount` and `fast_abtest.asgi.ExperimentMiddleware`)
+        and may have different signatures and dependencies
+        cache: Memoizes results per variant in a separate LRU/TTL cache keyed on normalized arguments.
+        Variants inherit this setting unless `register_variant(cache=...)` overrides it
+        executor: "process" runs the main function of a sync scenario in the shared process pool
+        (`fast_abtest.executor.ProcessPool`). Variants opt in with `register_variant(executor="process")`
+        stats_retention: Number of seconds of per-second calls, errors and latencies kept in memory
+        for `stats()` (see `fast_abtest.asgi.stats_app`)
+        srm: Periodically tests the observed split of recorded calls against `traffic_percent`
+        (chi-square), logging a warning and exporting `SampleRatioMismatch` on mismatch
+        coalesce: Concurrent calls with equal normalized arguments assigned to the same variant share
+        one in-flight execution. Variants inherit this setting unless `register_variant(coalesce=...)` overrides it
+        snapshot: File (or `SnapshotStore`) keeping variant call/error counts and disabled state across
+        restarts. It is written every 30 seconds and at exit, and restored when variants are registered
     Returns:
         A decorator that converts the original function into an A/B-testable class version.
         The class supports following methods:
@@ -65,6 +184,11 @@ def ab_test(
             self: Self,
             traffic_percent: int,  # The percentage of traffic redirected to the variant. 1 <= tp <= 99
             disable_threshold: float = 1.0,  # Error rate threshold leading to termination of redirection
+            cache: CacheConfig | None = None,  # Result memoization settings of the variant
+            executor: str | None = None,  # "process" to run a sync module-level variant in a process pool
+            latency_threshold: float | LatencyGuardrail | None = None,  # Max relative p99 regression vs main
+            warmup: Warmup | None = None,  # Warm-up function and/or first calls/seconds excluded from statistics
+            coalesce: bool | None = None,  # Single-flight execution of identical concurrent calls
         ) -> Callable[[ScenarioHandler[R]], ScenarioHandler[R]]:
 
         def enable_variant(
@@ -72,6 +196,14 @@ def ab_test(
             variant_name: str  # Name of the disabled variant
         ) -> None:
 
+        def overhead(self: Self) -> dict[str, dict[str, float]]:  # Per-phase overhead in ns (profile=True)
+
+        def stats(self: Self, window: int = 60) -> dict[str, dict[str, float]]:  # Live per-variant stats
+
+        def check_srm(self: Self) -> SrmResult | None:  # Sample ratio mismatch test (srm=SrmConfig())
+
+        def exporter_stats(self: Self) -> dict[str, dict[str, float]]:  # Per-exporter counters (exporters=[...])
+
     Examples:
         Basic A/B test:
         ```
@@ -138,7 +270,24 @@ def ab_test(
     """
 
     def _wrapper(func: ScenarioHandler[R]) -> ABTestFunction[R]:
-        ab_func = _create_registered_scenario(func, metrics, exporter, logger)
+        ab_func = _create_registered_scenario(
+            func,
+            metrics,
+            exporter,
+            logger,
+            profile=profile,
+            layer=layer,
+            layer_traffic_percent=layer_traffic_percent,
+            routed=routed,
+            cache=cache,
+            executor=executor,
+            stats_retention=stats_retention,
+            srm=srm,
+            coalesce=coalesce,
+            snapshot=snapshot,
+            exporters=exporters,
+            aggregator=aggregator,
+        )
         if iscoroutinefunction(func):
             markcoroutinefunction(ab_func)
         return wraps(func)(ab_func)
@@ -0,0 +1,168 @@
+import asyncio
+import importlib
+import inspect
+import multiprocessing
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic_ns, perf_counter_ns
+from typing import Any, Callable, Iterable, Self
+
+from fast_abtest.monitoring.interface import Context
+
+
+@dataclass
+class ExecutionStats:
+    """Cost breakdown of a call executed in the process pool, exposed as `Context.extra["executor"]`.
+
+    Durations are in seconds; pickling covers both the arguments and the result. Queue wait
+    and execution are measured with the system-wide
+    monotonic clock, so they are comparable between the caller and the worker process.
+    """
+
+    pickle_latency: float = 0.0
+    pickle_bytes: int = 0
+    queue_latency: float = 0.0
+    execution_latency: float = 0.0
+
+
+class ProcessPool:
+    """Process pool shared by all variants declared with `executor="process"`.
+
+    Workers are started lazily and import the modules of every process variant (plus
+    `preload`) in their initializer, so the first call does not pay for imports.
+    """
+
+    _pool: ProcessPoolExecutor | None = None
+    _max_workers: int | None = None
+    _mp_context: str | None = None
+    _modules: set[str] = set()
+    _lock = Lock()
+
+    @classmethod
+    def configure(
+        cls: type["ProcessPool"],
+        max_workers: int | None = None,
+        preload: Iterable[str] = (),
+        mp_context: str | None = None,
+    ) -> None:
+        """Sets the pool size, start method and extra modules to import; restarts a running pool."""
+        with cls._lock:
+            cls._max_workers = max_workers
+            cls._mp_context = mp_context
+            cls._modules.update(preload)
+        cls.shutdown()
+
+    @classmethod
+    def register_module(cls: type["ProcessPool"], module: str) -> None:
+        with cls._lock:
+            cls._modules.add(module)
+
+    @classmethod
+    def get(cls: type["ProcessPool"]) -> ProcessPoolExecutor:
+        if cls._pool is None:
+            with cls._lock:
+                if cls._pool is None:
+                    cls._pool = ProcessPoolExecutor(
+                        max_workers=cls._max_workers,
+                        mp_context=multiprocessing.get_context(cls._mp_context) if cls._mp_context else None,
+                        initializer=_preload,
+                        initargs=(tuple(sorted(cls._modules)),),
+                    )
+        return cls._pool
+
+    @classmethod
+    def shutdown(cls: type["ProcessPool"]) -> None:
+        with cls._lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+def _preload(modules: tuple[str, ...]) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _resolve(module: str, qualname: str) -> Callable[..., Any]:
+    target: Any = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        target = getattr(target, attribute)
+    from fast_abtest.registred_scenario import RegisteredScenario
+
+    # The main function of a scenario is replaced by the RegisteredScenario in its module;
+    # other decorators applied with functools.wraps are part of the handler and are kept.
+    if isinstance(target, RegisteredScenario):
+        return target.__wrapped__
+    return target
+
+
+def _execute(module: str, qualname: str, payload: bytes) -> tuple[bytes, int, int, int]:
+    started = monotonic_ns()
+    args, kwargs = pickle.loads(payload)
+    result = _resolve(module, qualname)(*args, **kwargs)
+    finished = monotonic_ns()
+    result_payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    return result_payload, started, finished, monotonic_ns() - finished
+
+
+def validate_executor(executor: str | None) -> str | None:
+    if executor not in (None, "process"):
+        raise ValueError("executor must be None or 'process'")
+    return executor
+
+
+class ProcessTask:
+    """Runs a variant handler in the shared process pool.
+
+    Arguments and results are pickled explicitly, so their size and (de)serialization time
+    are reported along with the queue wait and the execution time in the worker.
+    """
+
+    def __init__(self: Self, handler: Callable[..., Any]) -> None:
+        if "<locals>" in handler.__qualname__:
+            raise TypeError("executor='process' requires a module-level function")
+        if inspect.iscoroutinefunction(handler):
+            raise TypeError("executor='process' requires a sync function")
+        self._module = handler.__module__
+        self._qualname = handler.__qualname__
+        ProcessPool.register_module(self._module)
+
+    def bind(self: Self, context: Context, asynchronous: bool) -> Callable[..., Any]:
+        """Returns a handler-compatible callable recording `ExecutionStats` into the context."""
+        if asynchronous:
+
+            async def run_async(*args, **kwargs) -> Any:
+                stats = context.extra["executor"] = ExecutionStats()
+                future, submitted = self._submit(stats, args, kwargs)
+                return self._collect(stats, submitted, await asyncio.wrap_future(future))
+
+            return run_async
+
+        def run(*args, **kwargs) -> Any:
+            stats = context.extra["executor"] = ExecutionStats()
+            future, submitted = self._submit(stats, args, kwargs)
+            return self._collect(stats, submitted, future.result())
+
+        return run
+
+    def _submit(self: Self, stats: ExecutionStats, args: tuple, kwargs: dict) -> tuple[Future, int]:
+        """Submits the call; returns its future and the submission time (`monotonic_ns`)."""
+        started = perf_counter_ns()
+        payload = pickle.dumps((args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+        stats.pickle_latency = (perf_counter_ns() - started) / 1e9
+        stats.pickle_bytes = len(payload)
+        submitted = monotonic_ns()
+        return ProcessPool.get().submit(_execute, self._module, self._qualname, payload), submitted
+
+    @staticmethod
+    def _collect(stats: ExecutionStats, submitted: int, outcome: tuple[bytes, int, int, int]) -> Any:
+        result_payload, started, finished, dump_ns = outcome
+        stats.queue_latency = max(started - submitted, 0) / 1e9
+        stats.execution_latency = (finished - started) / 1e9
+        loading = perf_counter_ns()
+        result = pickle.loads(result_payload)
+        stats.pickle_latency += (dump_ns + perf_counter_ns() - loading) / 1e9
+        stats.pickle_bytes += len(result_payload)
+        return result
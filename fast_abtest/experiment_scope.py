@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Any, Iterator, Self
+
+_MASK = (1 << 64) - 1
+
+
+def stable_hash(value: Any) -> int:
+    """Process-independent 64-bit hash (unlike `hash()`, which is salted per process)."""
+    return int.from_bytes(blake2b(str(value).encode(), digest_size=8).digest(), "little")
+
+
+def mix_hash(value: int) -> int:
+    """SplitMix64 finalizer, used to derive per-experiment buckets from one key hash."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+@dataclass
+class ExperimentContext:
+    """Request-scoped state shared by every `ab_test` function called within one request.
+
+    Attributes:
+        key: Assignment key (user id, session id...). Without a key variants are drawn randomly,
+            but still only once per experiment and request.
+        assignments: Experiment name -> selected variant name for every experiment hit so far.
+    """
+
+    key: Any = None
+    assignments: dict[str, str] = field(default_factory=dict)
+    _selected: dict[int, Any] = field(default_factory=dict, repr=False)
+    _key_hash: int | None = field(default=None, repr=False)
+    _owner: int | None = field(default=None, repr=False)
+
+    @property
+    def key_hash(self: Self) -> int | None:
+        if self.key is None:
+            return None
+        if self._key_hash is None:
+            self._key_hash = stable_hash(self.key)
+        return self._key_hash
+
+    def bucket(self: Self, salt: int, size: int = 100) -> int | None:
+        """Returns the key bucket for an experiment salt, computing the key hash once per request."""
+        key_hash = self.key_hash
+        if key_hash is None:
+            return None
+        return mix_hash(key_hash ^ salt) % size
+
+
+_current_context: ContextVar[ExperimentContext | None] = ContextVar("abtest_experiment_context", default=None)
+
+
+def current_experiment_context() -> ExperimentContext | None:
+    return _current_context.get()
+
+
+@contextmanager
+def experiment_context(key: Any = None) -> Iterator[ExperimentContext]:
+    """Opens a request-scoped experiment context.
+
+    Every `ab_test` function called inside the block reuses one assignment per experiment,
+    derives its bucket from a single hash of `key` and exposes the full assignment set
+    through `Context.extra["assignments"]`.
+
+    Example:
+        with experiment_context(key=user_id) as experiments:
+            recommendations = recommendation_service(user_id)
+            logger.info("assignments: %s", experiments.assignments)
+    """
+    context = ExperimentContext(key=key)
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
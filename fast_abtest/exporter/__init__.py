@@ -1 +1,3 @@
 from .prometheus import PrometheusExporter
+from .opentelemetry import OpenTelemetryExporter
+from .statsd import StatsDExporter
@@ -0,0 +1,111 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Iterable, Iterator, Self
+
+
+@dataclass
+class StoreSnapshot:
+    """Copy of the slots of an `ArrayMetricStore`.
+
+    Attributes:
+        labelnames: Label names of a series, in the order of `series` values
+        series: Metric name and label values of every series; the position is the series index
+        counters: Counter values per metric, indexed by series
+        histograms: Per metric `(buckets, counts, sums)`. `counts` holds `len(buckets) + 1`
+            non-cumulative slots per series (the last one is +Inf), `sums` one slot per series
+    """
+
+    labelnames: list[str]
+    series: list[tuple[str, tuple[str, ...]]]
+    counters: dict[str, array]
+    histograms: dict[str, tuple[list[float], array, array]]
+
+
+class ArrayMetricStore:
+    """Preallocated metric slots indexed by (series, metric, bucket), read by Prometheus at scrape time.
+
+    `record` only increments array slots, and `collect` (the prometheus_client `Collector`
+    protocol) builds metric families from them, so scrape cost depends on the number of series
+    and metrics, not on the number of observations.
+    """
+
+    def __init__(
+        self: Self,
+        counters: Iterable[str],
+        histograms: dict[str, list[float]],
+        labelnames: list[str],
+        max_series: int = 64,
+    ) -> None:
+        self._labelnames = labelnames
+        self._max_series = max_series
+        self._series: dict[tuple[str, tuple[str, ...]], int] = {}
+        self._counters = {name: array("d", bytes(8 * max_series)) for name in counters}
+        self._histograms = {
+            name: (
+                list(buckets),
+                array("Q", bytes(8 * max_series * (len(buckets) + 1))),
+                array("d", bytes(8 * max_series)),
+            )
+            for name, buckets in histograms.items()
+        }
+        self._lock = Lock()
+
+    def record(self: Self, metric: str, labelvalues: tuple[str, ...], value: float | int) -> None:
+        index = self._series.get((metric, labelvalues))
+        if index is None:
+            index = self._add_series(metric, labelvalues)
+        with self._lock:
+            counter = self._counters.get(metric)
+            if counter is not None:
+                counter[index] += value
+                return
+            buckets, counts, sums = self._histograms[metric]
+            counts[index * (len(buckets) + 1) + bisect_left(buckets, value)] += 1
+            sums[index] += value
+
+    def snapshot(self: Self) -> StoreSnapshot:
+        with self._lock:
+            return StoreSnapshot(
+                labelnames=list(self._labelnames),
+                series=list(self._series),
+                counters={name: array("d", values) for name, values in self._counters.items()},
+                histograms={
+                    name: (list(buckets), array("Q", counts), array("d", sums))
+                    for name, (buckets, counts, sums) in self._histograms.items()
+                },
+            )
+
+    def collect(self: Self) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+        snapshot = self.snapshot()
+        for name, values in snapshot.counters.items():
+            family = CounterMetricFamily(name, f"{name} ('counter')", labels=snapshot.labelnames)
+            for index, (metric, labelvalues) in enumerate(snapshot.series):
+                if metric == name:
+                    family.add_metric(labelvalues, values[index])
+            yield family
+        for name, (buckets, counts, sums) in snapshot.histograms.items():
+            family = HistogramMetricFamily(name, f"{name} ('histogram')", labels=snapshot.labelnames)
+            width = len(buckets) + 1
+            for index, (metric, labelvalues) in enumerate(snapshot.series):
+                if metric != name:
+                    continue
+                cumulative = 0
+                exposed = []
+                for bound, count in zip([*map(str, buckets), "+Inf"], counts[index * width : (index + 1) * width]):
+                    cumulative += count
+                    exposed.append((bound, cumulative))
+                family.add_metric(labelvalues, exposed, sums[index])
+            yield family
+
+    def _add_series(self: Self, metric: str, labelvalues: tuple[str, ...]) -> int:
+        with self._lock:
+            index = self._series.get((metric, labelvalues))
+            if index is None:
+                if len(self._series) >= self._max_series:
+                    raise ValueError(f"ArrayMetricStore supports at most {self._max_series} series")
+                index = self._series[(metric, labelvalues)] = len(self._series)
+            return index
@@ -0,0 +1,159 @@
+import asyncio
+import atexit
+import traceback
+from collections import deque
+from logging import Logger, getLogger
+from threading import Condition, Thread
+from time import perf_counter_ns
+from typing import Any, Iterable, Self
+
+from fast_abtest.exporter.loop import is_async_exporter
+from fast_abtest.monitoring.histogram import LogHistogram
+from fast_abtest.monitoring.interface import MetricLabel
+
+Record = tuple[MetricLabel, float | int]
+
+
+class FanOutExporter:
+    """Dispatches every record to several exporters (`ab_test(exporters=[...])`).
+
+    Metrics build each `MetricLabel` once and `record` only appends it to a bounded queue per
+    exporter; every exporter is drained by its own thread, so a slow or failing exporter delays
+    neither the request nor the other exporters. When a queue is full, records for that exporter
+    are dropped. `AsyncExporter`s are awaited with the whole drained batch on their thread's loop.
+    Per-exporter counts, errors, drops and latency (ns per record) are returned by `stats()`.
+    Queued records are exported at interpreter exit.
+    """
+
+    MAX_QUEUE = 100_000
+
+    def __init__(
+        self: Self,
+        exporters: Iterable[Any],
+        max_queue: int = MAX_QUEUE,
+        logger: Logger | None = None,
+    ) -> None:
+        logger = logger or getLogger(__name__)
+        self._workers: list[_ExporterWorker] = []
+        for exporter in exporters:
+            name = type(exporter).__name__
+            if any(worker.name == name for worker in self._workers):
+                name = f"{name}-{len(self._workers)}"
+            self._workers.append(_ExporterWorker(exporter, name, max_queue, logger))
+        if not self._workers:
+            raise ValueError("exporters must not be empty")
+        atexit.register(self.close)
+
+    @property
+    def exporters(self: Self) -> list[Any]:
+        return [worker.exporter for worker in self._workers]
+
+    def record(self: Self, label: MetricLabel, value: float | int) -> None:
+        record = (label, value)
+        for worker in self._workers:
+            worker.put(record)
+
+    def stats(self: Self) -> dict[str, dict[str, float]]:
+        """Returns per-exporter statistics keyed by exporter class name."""
+        return {worker.name: worker.stats() for worker in self._workers}
+
+    def flush(self: Self) -> None:
+        """Blocks until every queued record has been handed to its exporter."""
+        for worker in self._workers:
+            worker.wait_idle()
+
+    def close(self: Self) -> None:
+        """Exports the queued records and stops the exporter threads."""
+        atexit.unregister(self.close)
+        for worker in self._workers:
+            worker.stop()
+
+
+class _ExporterWorker:
+    def __init__(self: Self, exporter: Any, name: str, max_queue: int, logger: Logger) -> None:
+        self.exporter = exporter
+        self.name = name
+        self.errors = 0
+        self.dropped = 0
+        self.latency = LogHistogram()
+        self._is_async = is_async_exporter(exporter)
+        self._queue: deque[Record] = deque()
+        self._max_queue = max_queue
+        self._logger = logger
+        self._busy = False
+        self._stopped = False
+        # Guards the queue and the drop counter; notified on new records, idle and stop.
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, name=f"abtest-exporter-{name}", daemon=True)
+        self._thread.start()
+
+    def put(self: Self, record: Record) -> None:
+        with self._condition:
+            if len(self._queue) >= self._max_queue:
+                self.dropped += 1
+                return
+            self._queue.append(record)
+            if len(self._queue) == 1:
+                self._condition.notify_all()
+
+    def stats(self: Self) -> dict[str, float]:
+        return {
+            "records": self.latency.count,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "latency_mean": self.latency.mean(),
+            "latency_p99": self.latency.quantile(0.99),
+            "latency_max": float(self.latency.max),
+        }
+
+    def wait_idle(self: Self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: not self._queue and not self._busy)
+
+    def stop(self: Self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _take(self: Self) -> list[Record] | None:
+        """Waits for records and returns them all; None once stopped and drained."""
+        with self._condition:
+            self._busy = False
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._queue or self._stopped)
+            if not self._queue:
+                return None
+            batch = list(self._queue)
+            self._queue.clear()
+            self._busy = True
+            return batch
+
+    def _export(self: Self, batch: list[Record], loop: asyncio.AbstractEventLoop | None) -> None:
+        if loop is not None:
+            started = perf_counter_ns()
+            try:
+                loop.run_until_complete(self.exporter.export(batch))
+            except Exception:  # noqa
+                self.errors += 1
+                self._logger.error(traceback.format_exc())
+            self.latency.record_many([(perf_counter_ns() - started) // len(batch)] * len(batch))
+        else:
+            for label, value in batch:
+                started = perf_counter_ns()
+                try:
+                    self.exporter.record(label=label, value=value)
+                except Exception:  # noqa
+                    self.errors += 1
+                    self._logger.error(traceback.format_exc())
+                self.latency.record(perf_counter_ns() - started)
+
+    def _run(self: Self) -> None:
+        loop = asyncio.new_event_loop() if self._is_async else None
+        try:
+            while (batch := self._take()) is not None:
+                self._export(batch, loop)
+        finally:
+            if loop is not None:
+                loop.close()
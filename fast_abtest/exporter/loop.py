@@ -0,0 +1,118 @@
+import asyncio
+import inspect
+import traceback
+from collections import deque
+from logging import Logger, getLogger
+from typing import Any, Self, Sequence
+from weakref import WeakKeyDictionary
+
+from fast_abtest.monitoring.interface import AsyncExporter, Exporter, MetricLabel
+
+Record = tuple[MetricLabel, float | int]
+
+
+def is_async_exporter(exporter: Any) -> bool:
+    return inspect.iscoroutinefunction(getattr(exporter, "export", None))
+
+
+class LoopExporter:
+    """Event loop buffer in front of the exporter of a coroutine scenario.
+
+    `record` appends to a list owned by the running loop, without thread locks, and a background
+    task of that loop exports the buffer every `flush_interval` seconds (or once it holds
+    `max_buffer` records): `AsyncExporter.export` is awaited, while synchronous exporters run in
+    the default executor so a blocking `record` never stalls the loop. The remaining records are
+    exported when the task is cancelled at loop shutdown. Records made outside a running loop
+    (or after its shutdown) go straight to a synchronous exporter, or are queued for the next
+    flush of an `AsyncExporter`.
+    """
+
+    def __init__(
+        self: Self,
+        exporter: Exporter | AsyncExporter,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10_000,
+        logger: Logger | None = None,
+    ) -> None:
+        self._exporter = exporter
+        self._is_async = is_async_exporter(exporter)
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._logger = logger or getLogger(__name__)
+        self._buffers: WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBuffer] = WeakKeyDictionary()
+        self._orphans: deque[Record] = deque()
+
+    def __getattr__(self: Self, name: str) -> Any:
+        return getattr(self._exporter, name)
+
+    def record(self: Self, label: MetricLabel, value: float | int) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._record_outside_loop(label, value)
+            return
+        buffer = self._buffers.get(loop)
+        if buffer is None:
+            buffer = self._buffers[loop] = _LoopBuffer()
+            buffer.task = loop.create_task(self._run(buffer), name="abtest-loop-exporter")
+        elif buffer.closed:
+            self._record_outside_loop(label, value)
+            return
+        buffer.records.append((label, value))
+        if len(buffer.records) >= self._max_buffer:
+            buffer.wakeup.set()
+
+    async def flush(self: Self) -> int:
+        """Exports the records buffered on the running loop and returns their number."""
+        buffer = self._buffers.get(asyncio.get_running_loop())
+        return await self._flush(buffer) if buffer is not None else 0
+
+    async def _flush(self: Self, buffer: "_LoopBuffer") -> int:
+        records, buffer.records = buffer.records, []
+        while self._orphans:
+            records.append(self._orphans.popleft())
+        if not records:
+            return 0
+        try:
+            if self._is_async:
+                await self._exporter.export(records)  # type: ignore
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, self._export_sync, records)
+        except Exception:  # noqa
+            self._logger.error(traceback.format_exc())
+        return len(records)
+
+    def _record_outside_loop(self: Self, label: MetricLabel, value: float | int) -> None:
+        if self._is_async:
+            self._orphans.append((label, value))
+        else:
+            self._exporter.record(label=label, value=value)  # type: ignore
+
+    def _export_sync(self: Self, records: Sequence[Record]) -> None:
+        for label, value in records:
+            self._exporter.record(label=label, value=value)  # type: ignore
+
+    async def _run(self: Self, buffer: "_LoopBuffer") -> None:
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(buffer.wakeup.wait(), self._flush_interval)
+                except TimeoutError:
+                    pass
+                buffer.wakeup.clear()
+                await self._flush(buffer)
+        finally:
+            # Loop shutdown (`asyncio.run` cancels pending tasks): export what is left, later
+            # records of this loop are queued for the next one.
+            buffer.closed = True
+            await self._flush(buffer)
+
+
+class _LoopBuffer:
+    __slots__ = ("records", "wakeup", "task", "closed")
+
+    def __init__(self: Self) -> None:
+        self.records: list[Record] = []
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.closed = False
@@ -0,0 +1,111 @@
+from threading import Lock
+from typing import Any, Self, Iterable
+
+from fast_abtest.monitoring.interface import MetricLabel
+
+
+class OpenTelemetryExporter:
+    """Exporter emitting OpenTelemetry metrics and span attributes.
+
+    Instruments are created once per metric and (instrument, attributes) pairs are
+    pre-bound per variant and tag set, so `record` is an in-memory aggregation only.
+    Network export happens in the background through the meter provider readers
+    (e.g. `PeriodicExportingMetricReader` with an OTLP exporter), never in the request path.
+
+    Requires the optional `opentelemetry-sdk` dependency (`pip install fast-abtest[opentelemetry]`).
+    """
+
+    REQUIRED_LABELS = {"variant", "func", "metric"}
+    SPAN_EXPERIMENT_ATTRIBUTE = "abtest.experiment"
+    SPAN_VARIANT_ATTRIBUTE = "abtest.variant"
+
+    def __init__(
+        self: Self,
+        metrics: Iterable[str],
+        func_name: str,
+        labelnames: Iterable[str],
+        port: int,
+        meter_provider: Any = None,
+    ) -> None:
+        try:
+            from opentelemetry import metrics as otel_metrics, trace
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-sdk, install fast-abtest[opentelemetry]"
+            ) from exc
+
+        provider = meter_provider or otel_metrics.get_meter_provider()
+        self._meter = provider.get_meter("fast_abtest")
+        self._get_current_span = trace.get_current_span
+        self._func_name = func_name
+        self._labelnames = set(labelnames).union(self.REQUIRED_LABELS)
+        self._instruments: dict[str, Any] = {}
+        self._bound: dict[tuple, tuple[Any, dict[str, str]]] = {}
+        self._lock = Lock()
+        for metric in metrics:
+            self._add_metric(metric)
+
+    @staticmethod
+    def create_meter_provider(endpoint: str | None = None, export_interval_millis: int = 10_000) -> Any:
+        """Builds an SDK meter provider that batches metrics to an OTLP endpoint.
+
+        Requires `opentelemetry-exporter-otlp`. Applications with their own provider
+        should pass it to the exporter instead.
+        """
+        from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+
+        reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(endpoint=endpoint),
+            export_interval_millis=export_interval_millis,
+        )
+        return MeterProvider(metric_readers=[reader])
+
+    def record(self: Self, label: MetricLabel, value: float | int) -> None:
+        """Records a metric value with labels.
+        Args:
+            label: MetricLabel containing required fields (variant, func, metric)
+                  and optional tags.
+            value: Numeric value to record.
+        Note:
+            Only tags present in `labelnames` will be used.
+        """
+        key = (label.metric, label.variant, label.func, tuple(sorted(label.tags.items())))
+        bound = self._bound.get(key)
+        if bound is None:
+            bound = self._bind(label, key)
+        record, attributes = bound
+        record(value, attributes)
+
+        span = self._get_current_span()
+        if span.is_recording():
+            span.set_attribute(self.SPAN_EXPERIMENT_ATTRIBUTE, label.func)
+            span.set_attribute(self.SPAN_VARIANT_ATTRIBUTE, label.variant)
+
+    def _bind(self: Self, label: MetricLabel, key: tuple) -> tuple[Any, dict[str, str]]:
+        metric_name = f"abtest_{self._func_name}_{label.metric}"
+        instrument = self._instruments[metric_name]
+        attributes = {"variant": label.variant, "func": label.func, "metric": metric_name}
+        attributes.update({k: str(v) for k, v in label.tags.items() if k in self._labelnames})
+        record = instrument.record if hasattr(instrument, "record") else instrument.add
+        with self._lock:
+            return self._bound.setdefault(key, (record, attributes))
+
+    def _add_metric(
+        self: Self,
+        metric_name: str,
+    ) -> None:
+        metric_name = f"abtest_{self._func_name}_{metric_name}"
+        with self._lock:
+            if "latency" in metric_name.lower():
+                self._instruments[metric_name] = self._meter.create_histogram(
+                    name=metric_name,
+                    unit="s",
+                    description=f"{metric_name} ('histogram')",
+                )
+            else:
+                self._instruments[metric_name] = self._meter.create_counter(
+                    name=metric_name,
+                    description=f"{metric_name} ('counter')",
+                )
@@ -1,13 +1,38 @@
+from collections import OrderedDict
 from threading import Lock
+from time import monotonic
 from typing import Self, Iterable
 
 from prometheus_client import Counter, Histogram
 
+from fast_abtest.exporter.array_store import ArrayMetricStore, StoreSnapshot
 from fast_abtest.monitoring.interface import MetricLabel
 
 
 class PrometheusExporter:
+    """Exporter serving metrics on a Prometheus HTTP endpoint.
+
+    Label sets built from `MetricLabel.tags` are bounded per metric: at most `max_series` series
+    carry custom tag values. Further label sets are recorded in an overflow series (tag values
+    replaced by `OVERFLOW_VALUE`), or evict the least recently used series when `overflow=False`.
+    Series idle for longer than `series_ttl` seconds are removed. Drops are counted in
+    `abtest_{func}_series_dropped_total` with a `reason` label: `lru` and `ttl` count removed
+    series, `overflow` counts records sent to the overflow series (or dropped by the array store),
+    since label sets beyond the limit are deliberately not tracked.
+
+    With `store="array"` observations are written into preallocated `ArrayMetricStore` slots
+    (at most `max_series` label sets, further ones are dropped) read by a custom collector at
+    scrape time; `snapshot()` returns them in-process.
+    """
+
     REQUIRED_LABELS = {"variant", "func", "metric"}
+    DEFAULT_BUCKETS = [0.1, 0.5, 1.0, 2.0, 5.0]
+    OVERHEAD_BUCKETS = [1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2]
+    MAX_SERIES = 1000
+    OVERFLOW_VALUE = "__overflow__"
+    # Created on the first drop and shared by exporters of scenarios with the same function name.
+    _dropped: dict[str, Counter] = {}
+    _dropped_lock = Lock()
 
     def __init__(
         self: Self,
@@ -15,6 +40,10 @@ class PrometheusExporter:
         func_name: str,
         labelnames: Iterable[str],
         port: int,
+        max_series: int = MAX_SERIES,
+        series_ttl: float | None = None,
+        overflow: bool = True,
+        store: str = "client",
     ) -> None:
         from prometheus_client import start_http_server
 
@@ -25,8 +54,26 @@ class PrometheusExporter:
         self._histograms: dict[str, Histogram] = {}
         self._lock = Lock()
         self._labelnames = set(labelnames).union(self.REQUIRED_LABELS)
-        for metric in metrics:
-            self._add_metric(metric)
+        self._label_order = sorted(self._labelnames)
+        self._max_series = max_series
+        self._series_ttl = series_ttl
+        self._overflow = overflow
+        self._series: dict[str, OrderedDict[tuple[str, ...], float]] = {}
+        self._next_sweep = 0.0
+        if store not in ("client", "array"):
+            raise ValueError("store must be 'client' or 'array'")
+        self._store: ArrayMetricStore | None = None
+        if store == "array":
+            self._store = self._create_store(metrics)
+        else:
+            for metric in metrics:
+                self._add_metric(metric)
+
+    def snapshot(self: Self) -> StoreSnapshot:
+        """Returns a copy of the array slots (`store="array"` only)."""
+        if self._store is None:
+            raise RuntimeError("snapshot() requires PrometheusExporter(store='array')")
+        return self._store.snapshot()
 
     def record(self: Self, label: MetricLabel, value: float | int) -> None:
         """Records a metric value with labels.
@@ -42,10 +89,87 @@ class PrometheusExporter:
         extra_labels = {k: v for k, v in label.tags.items() if k in self._labelnames}
         missing_labels = {k: "" for k in self._labelnames if k not in base_labels and k not in extra_labels}
         labels = {**base_labels, **extra_labels, **missing_labels}
+        if self._store is not None:
+            try:
+                self._store.record(metric_name, tuple(str(labels[name]) for name in self._label_order), value)
+            except ValueError:
+                self._drop(metric_name, "overflow")
+            return
+        if extra_labels:
+            labels = self._admit(metric_name, labels)
         if "latency" in metric_name.lower():
             self._histograms[metric_name].labels(**labels).observe(value)
         else:
-            self._metrics[metric_name].labels(**labels).inc()
+            self._metrics[metric_name].labels(**labels).inc(value)
+
+    def _admit(self: Self, metric_name: str, labels: dict[str, str]) -> dict[str, str]:
+        """Tracks the label set of a series, enforcing the cardinality limit and idle eviction."""
+        now = monotonic()
+        key = tuple(str(labels[name]) for name in self._label_order)
+        with self._lock:
+            if self._series_ttl is not None and now >= self._next_sweep:
+                self._sweep(now)
+            series = self._series.setdefault(metric_name, OrderedDict())
+            if key in series:
+                series[key] = now
+                series.move_to_end(key)
+                return labels
+            if len(series) < self._max_series:
+                series[key] = now
+                return labels
+            if not self._overflow:
+                self._remove(metric_name, series.popitem(last=False)[0], "lru")
+                series[key] = now
+                return labels
+        self._drop(metric_name, "overflow")
+        return {name: value if name in self.REQUIRED_LABELS else self.OVERFLOW_VALUE for name, value in labels.items()}
+
+    def _sweep(self: Self, now: float) -> None:
+        deadline = now - self._series_ttl  # type: ignore
+        for metric_name, series in self._series.items():
+            while series:
+                key, last_seen = next(iter(series.items()))
+                if last_seen > deadline:
+                    break
+                del series[key]
+                self._remove(metric_name, key, "ttl")
+        self._next_sweep = now + min(self._series_ttl, 1.0)  # type: ignore
+
+    def _remove(self: Self, metric_name: str, key: tuple[str, ...], reason: str) -> None:
+        metric = self._histograms.get(metric_name) or self._metrics[metric_name]
+        try:
+            metric.remove(*key)
+        except KeyError:
+            pass
+        self._drop(metric_name, reason)
+
+    def _drop(self: Self, metric_name: str, reason: str) -> None:
+        counter = self._dropped.get(self._func_name)
+        if counter is None:
+            with self._dropped_lock:
+                counter = self._dropped.get(self._func_name)
+                if counter is None:
+                    counter = self._dropped[self._func_name] = Counter(
+                        name=f"abtest_{self._func_name}_series_dropped",
+                        documentation="Label sets dropped by the cardinality limit or evicted as idle",
+                        labelnames=["metric", "reason"],
+                    )
+        counter.labels(metric=metric_name, reason=reason).inc()
+
+    def _create_store(self: Self, metrics: Iterable[str]) -> ArrayMetricStore:
+        from prometheus_client import REGISTRY
+
+        counters, histograms = [], {}
+        for metric in metrics:
+            metric_name = f"abtest_{self._func_name}_{metric}"
+            if "latency" in metric_name.lower():
+                overhead = "overhead" in metric_name.lower()
+                histograms[metric_name] = self.OVERHEAD_BUCKETS if overhead else self.DEFAULT_BUCKETS
+            else:
+                counters.append(metric_name)
+        store = ArrayMetricStore(counters, histograms, self._label_order, max_series=self._max_series)
+        REGISTRY.register(store)  # type: ignore
+        return store
 
     def _add_metric(
         self: Self,
@@ -57,12 +181,12 @@ class PrometheusExporter:
                 self._histograms[metric_name] = Histogram(
                     name=metric_name,
                     documentation=f"{metric_name} ('histogram')",
-                    buckets=[0.1, 0.5, 1.0, 2.0, 5.0],
-                    labelnames=self._labelnames,
+                    buckets=self.OVERHEAD_BUCKETS if "overhead" in metric_name.lower() else self.DEFAULT_BUCKETS,
+                    labelnames=self._label_order,
                 )
             else:
                 self._metrics[metric_name] = Counter(
                     name=metric_name,
                     documentation=f"{metric_name} ('counter')",
-                    labelnames=self._labelnames,
+                    labelnames=self._label_order,
                 )
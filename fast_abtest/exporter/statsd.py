@@ -0,0 +1,134 @@
+import atexit
+import socket
+from decimal import Decimal
+from random import randrange
+from threading import Event, Lock, Thread
+from typing import Self, Iterable
+
+from fast_abtest.monitoring.interface import MetricLabel
+
+
+class StatsDExporter:
+    """Push exporter aggregating metrics in memory and flushing them over UDP.
+
+    Counters are summed and timers are kept in a bounded reservoir per series during
+    a flush interval. A flush packs all lines (DogStatsD tag format) into as few
+    datagrams as the MTU allows, so the request path never touches the socket.
+    The last interval is flushed by `close()`, which also runs at interpreter exit.
+    Separators of the line format (`,`, `|`, `:`, `#`, newlines) in tags are replaced by `_`.
+    """
+
+    REQUIRED_LABELS = {"variant", "func", "metric"}
+    RESERVED = str.maketrans({char: "_" for char in ",|:#\n"})
+    MTU = 1432
+    TIMER_RESERVOIR = 128
+
+    def __init__(
+        self: Self,
+        metrics: Iterable[str],
+        func_name: str,
+        labelnames: Iterable[str],
+        port: int,
+        host: str = "127.0.0.1",
+        flush_interval: float = 1.0,
+        mtu: int = MTU,
+    ) -> None:
+        self._func_name = func_name
+        self._labelnames = set(labelnames).union(self.REQUIRED_LABELS)
+        self._address = (host, port)
+        self._mtu = mtu
+        self._counters: dict[tuple[str, str], float] = {}
+        self._timers: dict[tuple[str, str], tuple[list[float], int]] = {}
+        self._lock = Lock()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._stopped = Event()
+        self._flush_interval = flush_interval
+        self._thread = Thread(target=self._run, name=f"abtest-statsd-{func_name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self: Self, label: MetricLabel, value: float | int) -> None:
+        """Records a metric value with labels.
+        Args:
+            label: MetricLabel containing required fields (variant, func, metric)
+                  and optional tags.
+            value: Numeric value to record. Latency values are expected in seconds.
+        Note:
+            Only tags present in `labelnames` will be used.
+        """
+        metric_name = f"abtest.{self._func_name}.{label.metric}"
+        tags = {"variant": label.variant, "func": label.func}
+        tags.update({k: v for k, v in label.tags.items() if k in self._labelnames})
+        key = (metric_name, ",".join(f"{self._tag(k)}:{self._tag(v)}" for k, v in sorted(tags.items())))
+        with self._lock:
+            if "latency" in metric_name.lower():
+                self._add_timer(key, value * 1000)
+            else:
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def flush(self: Self) -> int:
+        """Sends the aggregated interval and returns the number of datagrams sent."""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            timers, self._timers = self._timers, {}
+
+        lines = [f"{name}:{self._number(value)}|c|#{tags}" for (name, tags), value in counters.items()]
+        for (name, tags), (samples, seen) in timers.items():
+            rate = f"|@{len(samples) / seen:.4g}" if seen > len(samples) else ""
+            lines.extend(f"{name}:{sample:.3f}|ms{rate}|#{tags}" for sample in samples)
+
+        datagrams = 0
+        for payload in self._pack(lines):
+            try:
+                self._socket.sendto(payload, self._address)
+                datagrams += 1
+            except OSError:
+                pass
+        return datagrams
+
+    def close(self: Self) -> None:
+        atexit.unregister(self.close)
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+        self._socket.close()
+
+    @classmethod
+    def _tag(cls: type["StatsDExporter"], value: object) -> str:
+        return str(value).translate(cls.RESERVED)
+
+    @staticmethod
+    def _number(value: float | int) -> str:
+        """Formats a counter without rounding or exponent notation."""
+        if isinstance(value, int) or value.is_integer():
+            return str(int(value))
+        # The shortest repr keeps every digit, Decimal drops its exponent (1.5e-05 -> 0.000015).
+        return format(Decimal(repr(value)), "f")
+
+    def _add_timer(self: Self, key: tuple[str, str], value: float) -> None:
+        samples, seen = self._timers.get(key, ([], 0))
+        seen += 1
+        if len(samples) < self.TIMER_RESERVOIR:
+            samples.append(value)
+        else:
+            index = randrange(seen)
+            if index < self.TIMER_RESERVOIR:
+                samples[index] = value
+        self._timers[key] = (samples, seen)
+
+    def _pack(self: Self, lines: list[str]) -> Iterable[bytes]:
+        buffer = bytearray()
+        for line in lines:
+            encoded = line.encode()
+            if buffer and len(buffer) + len(encoded) + 1 > self._mtu:
+                yield bytes(buffer)
+                buffer.clear()
+            if buffer:
+                buffer += b"\n"
+            buffer += encoded
+        if buffer:
+            yield bytes(buffer)
+
+    def _run(self: Self) -> None:
+        while not self._stopped.wait(self._flush_interval):
+            self.flush()
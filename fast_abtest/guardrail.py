@@ -0,0 +1,173 @@
+import math
+from dataclasses import dataclass
+from logging import Logger
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Self
+
+from fast_abtest.interface import _ScenarioVariant
+from fast_abtest.monitoring.histogram import LogHistogram
+from fast_abtest.monitoring.interface import Context
+from fast_abtest.scheduler import PeriodicTask, Scheduler
+
+
+@dataclass(frozen=True)
+class LatencyGuardrail:
+    """Latency regression guardrail of a variant.
+
+    Attributes:
+        max_regression: Maximum relative regression of the variant quantile over the main
+            variant quantile (0.5 allows a variant up to 50% slower)
+        quantile: Compared latency quantile (0.95 for p95, 0.99 for p99)
+        interval: Seconds between two evaluations; the rolling window spans the last two intervals
+        min_calls: Minimum number of calls of both variants in the window to evaluate; at least
+            enough calls for the quantile to exceed a single sample (100 for p99)
+        min_delta: Minimum absolute difference of the quantiles (seconds), which keeps noise on
+            fast handlers from tripping the relative limit
+        action: "disable" stops routing traffic to the variant, "downweight" halves its traffic share
+            (once per window: the next evaluation only uses calls made after the change)
+    """
+
+    max_regression: float
+    quantile: float = 0.99
+    interval: float = 30.0
+    min_calls: int = 100
+    min_delta: float = 0.001
+    action: str = "disable"
+
+    def __post_init__(self: Self) -> None:
+        if self.max_regression <= 0:
+            raise ValueError("max_regression must be positive")
+        if not 0 < self.quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        if self.min_calls < 1:
+            raise ValueError("min_calls must be positive")
+        if self.min_delta < 0:
+            raise ValueError("min_delta must not be negative")
+        if self.action not in ("disable", "downweight"):
+            raise ValueError("action must be 'disable' or 'downweight'")
+
+
+class _RollingHistogram:
+    """Two `LogHistogram` windows (previous and current), rotated on every evaluation."""
+
+    def __init__(self: Self) -> None:
+        self._previous = LogHistogram()
+        self._current = LogHistogram()
+
+    def record(self: Self, value: int) -> None:
+        self._current.record(value)
+
+    def window(self: Self) -> LogHistogram:
+        merged = LogHistogram()
+        merged.merge(self._previous)
+        merged.merge(self._current)
+        return merged
+
+    def rotate(self: Self) -> None:
+        self._previous, self._current = self._current, LogHistogram()
+
+    def clear(self: Self) -> None:
+        self._previous, self._current = LogHistogram(), LogHistogram()
+
+
+class LatencyGuard:
+    """Compares the rolling latency quantile of a variant with the main variant's.
+
+    Latencies (nanoseconds) are fed by a recorder hook; the comparison runs on the shared
+    background scheduler and never on the request path.
+    """
+
+    WARNING = "Variant {} {} by latency regression (p{:g}: {:.4f}s, main: {:.4f}s)"
+
+    def __init__(
+        self: Self,
+        main: _ScenarioVariant[Any],
+        variant: _ScenarioVariant[Any],
+        config: LatencyGuardrail,
+        logger: Logger,
+    ) -> None:
+        self._main = main
+        self._variant = variant
+        self._config = config
+        self._logger = logger
+        self._main_latency = _RollingHistogram()
+        self._variant_latency = _RollingHistogram()
+        self._min_calls = max(config.min_calls, math.ceil(1 / (1 - config.quantile)))
+        self._task: PeriodicTask = Scheduler.every(config.interval, self.evaluate)
+
+    def observe(self: Self, variant: str, nanoseconds: int) -> None:
+        if variant == self._variant.handler.__name__:
+            self._variant_latency.record(nanoseconds)
+        elif variant == self._main.handler.__name__:
+            self._main_latency.record(nanoseconds)
+
+    def stop(self: Self) -> None:
+        self._task.cancel()
+
+    def evaluate(self: Self) -> bool:
+        """Applies the guardrail action if the variant regressed; returns True when it did."""
+        main, variant = self._main_latency.window(), self._variant_latency.window()
+        self._main_latency.rotate()
+        self._variant_latency.rotate()
+        if not self._variant.is_active or min(main.count, variant.count) < self._min_calls:
+            return False
+        main_quantile = main.quantile(self._config.quantile) / 1e9
+        variant_quantile = variant.quantile(self._config.quantile) / 1e9
+        if (
+            main_quantile <= 0
+            or variant_quantile - main_quantile < self._config.min_delta
+            or variant_quantile / main_quantile - 1 <= self._config.max_regression
+        ):
+            return False
+
+        if self._config.action == "disable":
+            self._variant.is_active = False
+            action = "disabled"
+        else:
+            with self._variant._lock:
+                released = self._variant.traffic_percent - max(self._variant.traffic_percent // 2, 1)
+                self._variant.traffic_percent -= released
+            if not released:
+                return False
+            with self._main._lock:
+                self._main.traffic_percent += released
+            # Calls made at the previous share must not trigger another halving.
+            self._main_latency.clear()
+            self._variant_latency.clear()
+            action = f"down-weighted to {self._variant.traffic_percent}%"
+        self._logger.warning(
+            self.WARNING.format(
+                self._variant.handler.__name__,
+                action,
+                self._config.quantile * 100,
+                variant_quantile,
+                main_quantile,
+            )
+        )
+        return True
+
+
+class LatencyGuards:
+    """Recorder hook feeding the latency of every call to the guards of a scenario."""
+
+    def __init__(self: Self) -> None:
+        self.guards: list[LatencyGuard] = []
+        self._lock = Lock()
+
+    def add(self: Self, guard: LatencyGuard) -> None:
+        with self._lock:
+            self.guards = [*self.guards, guard]
+
+    def on_start(self: Self, context: Context) -> Context:
+        context.extra["guardrail_start"] = perf_counter_ns()
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        start = context.extra.get("guardrail_start")
+        if start is None:
+            # The hook was added while the call was running.
+            return
+        nanoseconds = perf_counter_ns() - start
+        for guard in self.guards:
+            guard.observe(context.variant, nanoseconds)
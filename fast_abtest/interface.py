@@ -1,8 +1,13 @@
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Protocol, Callable, TypeVar, Generic, Self
+from typing import Any, Protocol, Callable, Iterable, TypeVar, Generic, Self
 
+from fast_abtest.cache import CacheConfig, VariantCache
+from fast_abtest.coalesce import Coalescer
+from fast_abtest.executor import ProcessTask
 from fast_abtest.monitoring.interface import Exporter, Context
+from fast_abtest.monitoring.srm import SrmResult
+from fast_abtest.warmup import WarmupState
 
 R = TypeVar("R")
 R_co = TypeVar("R_co", covariant=True)
@@ -22,15 +27,20 @@ class _ScenarioVariant(Generic[R]):
     call_count: int = 0
     error_count: int = 0
     is_active: bool = True
+    cache: VariantCache | None = None
+    batch_handler: Callable[[list], Iterable[R]] | None = None
+    executor: ProcessTask | None = None
+    coalescer: Coalescer | None = None
+    warmup: WarmupState | None = None
     _lock: Lock = field(default_factory=Lock, init=False)
 
-    def increment_call(self: Self) -> None:
+    def increment_call(self: Self, count: int = 1) -> None:
         with self._lock:
-            self.call_count += 1
+            self.call_count += count
 
-    def threshold_exceeded(self: Self) -> bool:
+    def threshold_exceeded(self: Self, count: int = 1) -> bool:
         with self._lock:
-            self.error_count += 1
+            self.error_count += count
             if self.call_count > 10 and self.error_count / max(self.call_count, 1) > self.threshold:
                 self.is_active = False
                 return True
@@ -44,10 +54,37 @@ class ABTestFunction(Protocol[R]):
         self: Self,
         traffic_percent: int,
         disable_threshold: float = 1.0,
+        cache: CacheConfig | None = None,
+        executor: str | None = None,
+        latency_threshold: Any = None,
+        warmup: Any = None,
+        coalesce: bool | None = None,
     ) -> Callable[[ScenarioHandler[R]], ScenarioHandler[R]]: ...
 
     def enable_variant(self: Self, variant_name: str) -> None: ...
 
+    def kill(self: Self, winner: str | None = None) -> None: ...
+
+    def revive(self: Self) -> None: ...
+
+    def warmup_progress(self: Self) -> dict[str, float]: ...
+
+    def overhead(self: Self) -> dict[str, dict[str, float]]: ...
+
+    def stats(self: Self, window: int = 60) -> dict[str, dict[str, float]]: ...
+
+    def check_srm(self: Self) -> SrmResult | None: ...
+
+    def map(self: Self, items: Iterable[Any], key: Callable[[Any], Any] | None = None) -> list[R]: ...
+
+    async def amap(self: Self, items: Iterable[Any], key: Callable[[Any], Any] | None = None) -> list[R]: ...
+
+    def register_batch(
+        self: Self, variant_name: str | None = None
+    ) -> Callable[[Callable[[list], Iterable[R]]], Callable[[list], Iterable[R]]]: ...
+
+    def mount(self: Self, app: Any, path: str, methods: Iterable[str] = ("GET",), **route_kwargs: Any) -> None: ...
+
 
 class Metric(Protocol):
     def __init__(
@@ -0,0 +1,54 @@
+import os
+from threading import Lock
+from typing import Any, Protocol, Self
+from weakref import WeakSet
+
+
+class _Switchable(Protocol):
+    _name: str
+
+    def _apply_kill_switch(self: Self) -> None: ...
+
+
+class KillSwitch:
+    """Global kill switch of all experiments.
+
+    When engaged, every scenario serves its main handler (or the winner passed to
+    `RegisteredScenario.kill`) directly, without selection, `Context` creation or metric hooks.
+    The switch can also be set before start-up with `ABTEST_KILL_SWITCH`: `1`/`*` kills all
+    experiments, a comma-separated list of scenario names kills only those.
+    """
+
+    ENV = "ABTEST_KILL_SWITCH"
+
+    _engaged = False
+    _scenarios: "WeakSet[Any]" = WeakSet()
+    _lock = Lock()
+
+    @classmethod
+    def engage(cls: type["KillSwitch"]) -> None:
+        cls._set(True)
+
+    @classmethod
+    def release(cls: type["KillSwitch"]) -> None:
+        cls._set(False)
+
+    @classmethod
+    def is_engaged(cls: type["KillSwitch"]) -> bool:
+        return cls._engaged
+
+    @classmethod
+    def register(cls: type["KillSwitch"], scenario: _Switchable) -> bool:
+        """Tracks a scenario and returns True if the environment kills it at start-up."""
+        with cls._lock:
+            cls._scenarios.add(scenario)
+        names = {name.strip() for name in os.getenv(cls.ENV, "").split(",") if name.strip()}
+        return bool(names & {"1", "*", scenario._name})
+
+    @classmethod
+    def _set(cls: type["KillSwitch"], engaged: bool) -> None:
+        with cls._lock:
+            cls._engaged = engaged
+            scenarios = list(cls._scenarios)
+        for scenario in scenarios:
+            scenario._apply_kill_switch()
@@ -0,0 +1,80 @@
+from array import array
+from random import randrange
+from threading import Lock
+from typing import Self
+
+from fast_abtest.experiment_scope import ExperimentContext, stable_hash
+
+
+class Layer:
+    """Namespace of mutually exclusive experiments.
+
+    The layer splits `buckets` hash buckets into contiguous slices, one per joined experiment.
+    A request is hashed once per layer, and two precomputed arrays map its bucket to the owning
+    experiment and to the bucket (0-99) used by that experiment's `VariantSelector`. Requests
+    outside an experiment's slice are excluded from it and served by its main handler without
+    being recorded.
+
+    Example:
+        checkout = Layer("checkout")
+
+        @ab_test(metrics=[Metric.LATENCY], layer=checkout, layer_traffic_percent=50)
+        def pricing(...): ...
+
+        @ab_test(metrics=[Metric.LATENCY], layer=checkout, layer_traffic_percent=50)
+        def shipping(...): ...
+    """
+
+    def __init__(self: Self, name: str, buckets: int = 10_000) -> None:
+        if buckets < 100:
+            raise ValueError("buckets must be at least 100")
+        self.name = name
+        self._size = buckets
+        self._salt = stable_hash(f"layer:{name}")
+        self._members: list[str] = []
+        self._allocated = 0
+        self._experiments = array("h", [-1]) * buckets
+        self._inner_buckets = array("b", [0]) * buckets
+        self._lock = Lock()
+
+    @property
+    def members(self: Self) -> list[str]:
+        return list(self._members)
+
+    def join(self: Self, experiment_name: str, traffic_percent: int) -> int:
+        """Allocates a slice of the layer to an experiment and returns its index in the layer."""
+        if not 1 <= traffic_percent <= 100:
+            raise ValueError("layer_traffic_percent must be between 1 and 100")
+        with self._lock:
+            size = self._size * traffic_percent // 100
+            if self._allocated + size > self._size:
+                raise ValueError(f"Total traffic percentage of layer {self.name} exceeds 100")
+            index = len(self._members)
+            self._members.append(experiment_name)
+            for offset in range(size):
+                self._experiments[self._allocated + offset] = index
+                self._inner_buckets[self._allocated + offset] = offset * 100 // size
+            self._allocated += size
+        return index
+
+    def bucket(self: Self, experiment: ExperimentContext) -> int:
+        """Returns the request bucket in this layer, hashing the assignment key once per request."""
+        bucket = experiment._selected.get(id(self))
+        if bucket is None:
+            bucket = experiment.bucket(self._salt, self._size)
+            if bucket is None:
+                bucket = randrange(self._size)
+            experiment._selected[id(self)] = bucket
+        return bucket
+
+    def resolve(self: Self, member: int, experiment: ExperimentContext) -> int | None:
+        """Returns the selector bucket for a member experiment or None if the request is excluded."""
+        bucket = self.bucket(experiment)
+        if self._experiments[bucket] != member:
+            return None
+        return self._inner_buckets[bucket]
+
+    def experiment_for(self: Self, experiment: ExperimentContext) -> str | None:
+        """Returns the name of the layer experiment the request belongs to."""
+        index = self._experiments[self.bucket(experiment)]
+        return self._members[index] if index >= 0 else None
@@ -0,0 +1,33 @@
+from typing import Self
+
+from fast_abtest.monitoring.interface import Exporter, MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+class _CacheOutcomeMetric(BaseMetric):
+    HIT: bool
+
+    def __init__(self: Self, exporter: Exporter) -> None:
+        super().__init__(exporter)
+        self._count = 0
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        if context.extra.get("cache_hit") is not self.HIT:
+            return
+        with self._lock:
+            self._count += 1
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=1)
+
+
+class CacheHitsMetric(_CacheOutcomeMetric):
+    HIT = True
+
+
+class CacheMissesMetric(_CacheOutcomeMetric):
+    HIT = False
@@ -10,13 +10,14 @@ class CallsMetric(BaseMetric):
         self._calls = 0
 
     def on_start(self: Self, context: Context) -> Context:
+        calls = context.extra.get("batch_size", 1)
         with self._lock:
-            self._calls += 1
+            self._calls += calls
         label = MetricLabel(
             metric=self.__class__.__name__,
             func=context.scenario,
             variant=context.variant,
             is_error=False,
         )
-        self._exporter.record(label=label, value=1)
+        self._exporter.record(label=label, value=calls)
         return context
@@ -0,0 +1,19 @@
+from typing import Self
+
+from fast_abtest.monitoring.interface import MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+class CoalescedWaitersMetric(BaseMetric):
+    """Calls that waited for an identical in-flight call (`coalesce=True`) instead of executing."""
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        if not context.extra.get("coalesced"):
+            return
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=1)
@@ -11,12 +11,13 @@ class ErrorsMetric(BaseMetric):
 
     def on_end(self: Self, context: Context, is_error: bool) -> None:
         if is_error:
+            errors = context.extra.get("batch_size", 1)
             with self._lock:
-                self._errors += 1
+                self._errors += errors
             label = MetricLabel(
                 metric=self.__class__.__name__,
                 func=context.scenario,
                 variant=context.variant,
                 is_error=True,
             )
-            self._exporter.record(label=label, value=1)
+            self._exporter.record(label=label, value=errors)
@@ -0,0 +1,51 @@
+from abc import ABC, abstractmethod
+from typing import Self
+
+from fast_abtest.executor import ExecutionStats
+from fast_abtest.monitoring.interface import MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+class _ExecutorMetric(BaseMetric, ABC):
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        stats: ExecutionStats | None = context.extra.get("executor")
+        if stats is None:
+            return
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=self._value(stats))
+
+    @abstractmethod
+    def _value(self: Self, stats: ExecutionStats) -> float | int: ...
+
+
+class ExecutorQueueLatencyMetric(_ExecutorMetric):
+    """Time a call waited for a free worker of the process pool (seconds)."""
+
+    def _value(self: Self, stats: ExecutionStats) -> float:
+        return stats.queue_latency
+
+
+class ExecutorExecutionLatencyMetric(_ExecutorMetric):
+    """Time the handler ran in the worker process (seconds)."""
+
+    def _value(self: Self, stats: ExecutionStats) -> float:
+        return stats.execution_latency
+
+
+class ExecutorPickleLatencyMetric(_ExecutorMetric):
+    """Time spent pickling arguments and results (seconds)."""
+
+    def _value(self: Self, stats: ExecutionStats) -> float:
+        return stats.pickle_latency
+
+
+class ExecutorPickleBytesMetric(_ExecutorMetric):
+    """Size of pickled arguments and results."""
+
+    def _value(self: Self, stats: ExecutionStats) -> int:
+        return stats.pickle_bytes
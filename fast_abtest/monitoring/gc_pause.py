@@ -0,0 +1,90 @@
+import gc
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from typing import Any, Self
+
+from fast_abtest.monitoring.interface import Exporter, MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+@dataclass
+class GcStats:
+    """Garbage collections that ran during a call, exposed as `Context.extra["gc"]`.
+
+    Collections are attributed to every call active in the context that triggered them
+    (nested scenarios included), since each of them waited for the pause.
+    """
+
+    collections: int = 0
+    pause: float = 0.0
+    parent: "GcStats | None" = None
+
+
+_active: ContextVar[GcStats | None] = ContextVar("gc_stats", default=None)
+_started = 0.0
+_install_lock = Lock()
+
+
+def _on_gc(phase: str, info: dict[str, Any]) -> None:
+    global _started
+    if phase == "start":
+        _started = perf_counter()
+        return
+    stats = _active.get()
+    if stats is None:
+        return
+    pause = perf_counter() - _started
+    while stats is not None:
+        stats.collections += 1
+        stats.pause += pause
+        stats = stats.parent
+
+
+def _install() -> None:
+    with _install_lock:
+        if _on_gc not in gc.callbacks:
+            gc.callbacks.append(_on_gc)
+
+
+class _GcMetric(BaseMetric, ABC):
+    def __init__(self: Self, exporter: Exporter) -> None:
+        super().__init__(exporter)
+        _install()
+
+    def on_start(self: Self, context: Context) -> Context:
+        if "gc" not in context.extra:
+            stats = context.extra["gc"] = GcStats(parent=_active.get())
+            _active.set(stats)
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        stats: GcStats = context.extra["gc"]
+        if _active.get() is stats:
+            _active.set(stats.parent)
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=self._value(stats))
+
+    @abstractmethod
+    def _value(self: Self, stats: GcStats) -> float | int: ...
+
+
+class GcCollectionsMetric(_GcMetric):
+    """Garbage collections triggered while the variant was running."""
+
+    def _value(self: Self, stats: GcStats) -> int:
+        return stats.collections
+
+
+class GcPauseLatencyMetric(_GcMetric):
+    """Time the variant spent paused by garbage collections (seconds)."""
+
+    def _value(self: Self, stats: GcStats) -> float:
+        return stats.pause
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from threading import Lock
-from typing import Protocol, Self, Iterable
+from typing import Protocol, Self, Iterable, Sequence
 
 
 @dataclass
@@ -32,6 +32,21 @@ class Exporter(Protocol):
     def record(self: Self, label: MetricLabel, value: float | int) -> None: ...
 
 
+class AsyncExporter(Protocol):
+    """Exporter of coroutine scenarios: records are buffered on the event loop and exported in batches
+    by a background task (see `fast_abtest.exporter.loop.LoopExporter`)."""
+
+    def __init__(
+        self: Self,
+        metrics: Iterable[str],  # noqa
+        func_name: str,  # noqa
+        labelnames: Iterable[str],  # noqa
+        port: int,  # noqa
+    ) -> None: ...
+
+    async def export(self: Self, records: Sequence[tuple[MetricLabel, float | int]]) -> None: ...
+
+
 class BaseMetric:
     def __init__(self: Self, exporter: Exporter) -> None:
         self._exporter = exporter
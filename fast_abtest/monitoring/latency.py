@@ -2,6 +2,7 @@ from contextvars import ContextVar
 from time import perf_counter
 from typing import Self
 
+from fast_abtest.config import ConfigManager
 from fast_abtest.monitoring.interface import Exporter, MetricLabel, BaseMetric
 from fast_abtest.registred_scenario import Context
 
@@ -10,6 +11,7 @@ class LatencyMetric(BaseMetric):
     def __init__(self: Self, exporter: Exporter) -> None:
         super().__init__(exporter)
         self._start_time: ContextVar[float] = ContextVar("start_time")
+        self._exclude_gc = ConfigManager.get_config().exclude_gc_from_latency
 
     def on_start(self: Self, context: Context) -> Context:
         self._start_time.set(perf_counter())
@@ -17,6 +19,9 @@ class LatencyMetric(BaseMetric):
 
     def on_end(self: Self, context: Context, is_error: bool) -> None:
         latency = perf_counter() - self._start_time.get()
+        if self._exclude_gc and "gc" in context.extra:
+            # Pauses measured by Metric.GC_COLLECTIONS / Metric.GC_PAUSE_LATENCY.
+            latency = max(latency - context.extra["gc"].pause, 0.0)
         label = MetricLabel(
             metric=self.__class__.__name__,
             func=context.scenario,
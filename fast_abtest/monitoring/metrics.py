@@ -2,15 +2,48 @@ from enum import Enum
 from typing import Self
 
 from fast_abtest.interface import Metric as IMetric
+from fast_abtest.monitoring.cache_counter import CacheHitsMetric, CacheMissesMetric
 from fast_abtest.monitoring.calls_counter import CallsMetric
+from fast_abtest.monitoring.coalesce_counter import CoalescedWaitersMetric
 from fast_abtest.monitoring.errors_counter import ErrorsMetric
+from fast_abtest.monitoring.executor import (
+    ExecutorExecutionLatencyMetric,
+    ExecutorPickleBytesMetric,
+    ExecutorPickleLatencyMetric,
+    ExecutorQueueLatencyMetric,
+)
+from fast_abtest.monitoring.gc_pause import GcCollectionsMetric, GcPauseLatencyMetric
 from fast_abtest.monitoring.latency import LatencyMetric
+from fast_abtest.monitoring.resources import AllocationsMetric, CpuTimeMetric
+from fast_abtest.monitoring.warmup_counter import WarmupCallsMetric
+from fast_abtest.monitoring.stream import (
+    FirstChunkLatencyMetric,
+    StreamBytesMetric,
+    StreamChunksMetric,
+    StreamErrorsMetric,
+)
 
 
 class Metric(Enum):
     LATENCY = LatencyMetric
     CALLS_TOTAL = CallsMetric
     ERRORS_TOTAL = ErrorsMetric
+    CPU_TIME = CpuTimeMetric
+    ALLOCATIONS = AllocationsMetric
+    GC_COLLECTIONS = GcCollectionsMetric
+    GC_PAUSE_LATENCY = GcPauseLatencyMetric
+    CACHE_HITS = CacheHitsMetric
+    CACHE_MISSES = CacheMissesMetric
+    COALESCED_WAITERS = CoalescedWaitersMetric
+    STREAM_FIRST_CHUNK_LATENCY = FirstChunkLatencyMetric
+    STREAM_CHUNKS = StreamChunksMetric
+    STREAM_BYTES = StreamBytesMetric
+    STREAM_ERRORS = StreamErrorsMetric
+    WARMUP_CALLS = WarmupCallsMetric
+    EXECUTOR_QUEUE_LATENCY = ExecutorQueueLatencyMetric
+    EXECUTOR_EXECUTION_LATENCY = ExecutorExecutionLatencyMetric
+    EXECUTOR_PICKLE_LATENCY = ExecutorPickleLatencyMetric
+    EXECUTOR_PICKLE_BYTES = ExecutorPickleBytesMetric
 
     def __str__(self: Self) -> str:
         return str(self.value)
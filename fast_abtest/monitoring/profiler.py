@@ -0,0 +1,146 @@
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Self, Iterable
+
+from fast_abtest.interface import Metric, _ScenarioVariant
+from fast_abtest.monitoring.histogram import LogHistogram
+from fast_abtest.monitoring.interface import Context, Exporter, MetricLabel
+from fast_abtest.variant_selector import VariantSelector
+
+
+class OverheadProfiler:
+    """Measures the time spent inside the A/B layer for every call.
+
+    Phases (nanoseconds, `perf_counter_ns` deltas):
+        select:         variant selection
+        recorder_start: all `Metric.on_start` hooks
+        handler:        the selected variant handler (awaited for coroutine handlers)
+        recorder_end:   all `Metric.on_end` hooks (includes export)
+        export:         a single `Exporter.record` invocation
+
+    The profiler plugs into the existing extension points: the selector and the
+    exporter are wrapped, and two marker metrics are placed around the user metrics,
+    so the non-profiled call path stays untouched.
+    """
+
+    METRIC_NAME = "OverheadLatency"
+    PHASES = ("select", "recorder_start", "handler", "recorder_end", "export")
+
+    def __init__(self: Self, exporter: Exporter | None = None) -> None:
+        self._exporter = exporter
+        self._histograms = {phase: LogHistogram() for phase in self.PHASES}
+        self._stamps: ContextVar[list[int]] = ContextVar("overhead_stamps")
+        self._select_ns: ContextVar[int] = ContextVar("overhead_select_ns", default=0)
+
+    def wrap_exporter(self: Self, exporter: Exporter) -> Exporter:
+        return _TimedExporter(exporter, self._histograms["export"])
+
+    def wrap_selector[R](self: Self, selector: VariantSelector[R]) -> VariantSelector[R]:
+        return _TimedSelector(selector, self._select_ns)  # type: ignore
+
+    def wrap_metrics(self: Self, metrics: Iterable[Metric]) -> list[Metric]:
+        return [_OpeningMarker(self._stamps, self._select_ns), *metrics, _ClosingMarker(self)]
+
+    def observe(self: Self, context: Context, stamps: list[int]) -> None:
+        select_ns, recorder_start, handler_start, handler_end, recorder_end = stamps
+        durations = {
+            "select": select_ns,
+            "recorder_start": handler_start - recorder_start,
+            "handler": handler_end - handler_start,
+            "recorder_end": recorder_end - handler_end,
+        }
+        for phase, duration in durations.items():
+            self._histograms[phase].record(duration)
+        if self._exporter is None:
+            return
+        for phase, duration in durations.items():
+            label = MetricLabel(
+                metric=self.METRIC_NAME,
+                func=context.scenario,
+                variant=context.variant,
+                is_error=False,
+                tags={"phase": phase},
+            )
+            self._exporter.record(label=label, value=duration / 1e9)
+
+    def snapshot(self: Self) -> dict[str, dict[str, float]]:
+        """Returns per-phase statistics in nanoseconds."""
+        return {
+            phase: {
+                "count": histogram.count,
+                "mean": histogram.mean(),
+                "p50": histogram.quantile(0.5),
+                "p90": histogram.quantile(0.9),
+                "p99": histogram.quantile(0.99),
+                "max": float(histogram.max),
+            }
+            for phase, histogram in self._histograms.items()
+        }
+
+    def reset(self: Self) -> None:
+        for histogram in self._histograms.values():
+            histogram.reset()
+
+
+class _TimedSelector[R]:
+    def __init__(self: Self, selector: VariantSelector[R], select_ns: ContextVar[int]) -> None:
+        self._selector = selector
+        self._select_ns = select_ns
+
+    def select(self: Self, bucket: int | None = None) -> _ScenarioVariant[R]:
+        start = perf_counter_ns()
+        variant = self._selector.select(bucket)
+        self._select_ns.set(perf_counter_ns() - start)
+        return variant
+
+    def __getattr__(self: Self, name: str):
+        return getattr(self._selector, name)
+
+
+class _TimedExporter:
+    def __init__(self: Self, exporter: Exporter, histogram: LogHistogram) -> None:
+        self._exporter = exporter
+        self._histogram = histogram
+
+    def record(self: Self, label: MetricLabel, value: float | int) -> None:
+        start = perf_counter_ns()
+        try:
+            self._exporter.record(label=label, value=value)
+        finally:
+            self._histogram.record(perf_counter_ns() - start)
+
+    def __getattr__(self: Self, name: str):
+        return getattr(self._exporter, name)
+
+
+class _OpeningMarker:
+    def __init__(self: Self, stamps: ContextVar[list[int]], select_ns: ContextVar[int]) -> None:
+        self._stamps = stamps
+        self._select_ns = select_ns
+
+    def on_start(self: Self, context: Context) -> Context:
+        # A variant reused from the experiment context skips selection and reports 0.
+        self._stamps.set([self._select_ns.get(), perf_counter_ns()])
+        self._select_ns.set(0)
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        self._stamps.get().append(perf_counter_ns())
+
+
+class _ClosingMarker:
+    CLOSING = True
+
+    def __init__(self: Self, profiler: OverheadProfiler) -> None:
+        self._profiler = profiler
+
+    def on_start(self: Self, context: Context) -> Context:
+        self._profiler._stamps.get().append(perf_counter_ns())
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        stamps = self._profiler._stamps.get()
+        stamps.append(perf_counter_ns())
+        # Stamp order: select, opening start, closing start, opening end, closing end.
+        if len(stamps) == 5:
+            self._profiler.observe(context, stamps)
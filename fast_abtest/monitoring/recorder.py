@@ -1,35 +1,75 @@
 import traceback
 from contextlib import contextmanager
+from contextvars import copy_context
 from logging import Logger
-from typing import Self, Iterable, Iterator
+from typing import Callable, Self, Iterable, Iterator
 
 from fast_abtest.interface import Metric
 from fast_abtest.monitoring.interface import Context
 
 
+class Recording:
+    """Handle of an in-progress recording, allowing its end to be deferred (e.g. until a stream is consumed)."""
+
+    def __init__(self: Self, recorder: "MetricRecorder", context: Context) -> None:
+        self.context = context
+        self.deferred = False
+        self._recorder = recorder
+
+    def defer(self: Self) -> Callable[[bool], None]:
+        """Skips the end of the enclosing `record` block and returns a callback finishing it.
+
+        The callback runs the `on_end` hooks in a copy of the current contextvars context, so
+        metrics relying on context variables set in `on_start` work from any thread or task.
+        """
+        self.deferred = True
+        captured = copy_context()
+        end, context = self._recorder.end, self.context
+
+        def finish(is_error: bool) -> None:
+            captured.run(end, context, is_error)
+
+        return finish
+
+
 class MetricRecorder:
     def __init__(
         self: Self,
         metrics: Iterable[Metric],
         logger: Logger,
     ) -> None:
-        self._metrics = metrics
+        self._metrics = list(metrics)
         self._logger = logger
 
+    def add(self: Self, metric: Metric) -> None:
+        """Adds a metric hook at runtime (the list is replaced, so in-flight recordings are unaffected).
+
+        The hook is placed before trailing `CLOSING` hooks, so the overhead profiler keeps timing it.
+        """
+        position = len(self._metrics)
+        while position and getattr(self._metrics[position - 1], "CLOSING", False):
+            position -= 1
+        self._metrics = [*self._metrics[:position], metric, *self._metrics[position:]]
+
     @contextmanager
-    def record(self: Self, context: Context) -> Iterator[None]:
+    def record(self: Self, context: Context) -> Iterator[Recording]:
+        recording = Recording(self, context)
         try:
             for metric in self._metrics:
-                context = metric.on_start(context=context)
-            yield
+                recording.context = metric.on_start(context=recording.context)
+            yield recording
         except:
             is_error = True
             raise
         else:
             is_error = False
         finally:
-            try:
-                for metric in self._metrics:
-                    metric.on_end(context=context, is_error=is_error)
-            except:
-                self._logger.error(traceback.format_exc())
+            if not recording.deferred:
+                self.end(recording.context, is_error)
+
+    def end(self: Self, context: Context, is_error: bool) -> None:
+        try:
+            for metric in self._metrics:
+                metric.on_end(context=context, is_error=is_error)
+        except:
+            self._logger.error(traceback.format_exc())
@@ -0,0 +1,70 @@
+import sys
+from contextvars import ContextVar
+from random import random
+from threading import get_ident
+from time import thread_time
+from typing import Self
+
+from fast_abtest.config import ConfigManager
+from fast_abtest.monitoring.interface import Exporter, MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+class CpuTimeMetric(BaseMetric):
+    """CPU time of the calling thread spent in the call (seconds).
+
+    Exported as a counter: its rate divided by the calls rate gives the mean CPU cost of
+    a variant. For coroutine handlers the delta also includes CPU used by other tasks of
+    the event loop while the handler awaited. Calls ending in another thread (consumed
+    streams) are not recorded.
+    """
+
+    def __init__(self: Self, exporter: Exporter) -> None:
+        super().__init__(exporter)
+        self._start: ContextVar[tuple[int, float]] = ContextVar("cpu_start")
+
+    def on_start(self: Self, context: Context) -> Context:
+        self._start.set((get_ident(), thread_time()))
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        thread, start = self._start.get()
+        if thread != get_ident():
+            return
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=max(thread_time() - start, 0.0))
+
+
+class AllocationsMetric(BaseMetric):
+    """Net memory blocks allocated during the call (`sys.getallocatedblocks` delta).
+
+    Only a share of calls (`ABTestConfig.allocation_sample_rate`) is measured; sampled deltas
+    are scaled by the inverse rate, so the exported counter estimates the total. The delta is
+    process-wide and includes allocations of concurrently running calls.
+    """
+
+    def __init__(self: Self, exporter: Exporter) -> None:
+        super().__init__(exporter)
+        self._sample_rate = ConfigManager.get_config().allocation_sample_rate
+        self._start: ContextVar[int | None] = ContextVar("allocated_blocks", default=None)
+
+    def on_start(self: Self, context: Context) -> Context:
+        self._start.set(sys.getallocatedblocks() if random() < self._sample_rate else None)
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        start = self._start.get()
+        if start is None:
+            return
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=max(sys.getallocatedblocks() - start, 0) / self._sample_rate)
@@ -0,0 +1,184 @@
+import math
+import traceback
+from dataclasses import dataclass, field
+from logging import Logger
+from threading import Lock
+from typing import Callable, Self
+
+from fast_abtest.monitoring.interface import Context, Exporter, MetricLabel
+from fast_abtest.scheduler import PeriodicTask, Scheduler
+
+
+@dataclass(frozen=True)
+class SrmConfig:
+    """Sample ratio mismatch check settings.
+
+    Attributes:
+        interval: Seconds between two checks, run by the background scheduler
+        alpha: p-value below which the observed split is reported as a mismatch
+        min_calls: Minimum number of recorded calls before the first check
+    """
+
+    interval: float = 60.0
+    alpha: float = 0.001
+    min_calls: int = 100
+
+    def __post_init__(self: Self) -> None:
+        if self.interval <= 0:
+            raise ValueError("interval must be positive")
+        if not 0 < self.alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+
+
+@dataclass
+class SrmResult:
+    observed: dict[str, int]
+    expected: dict[str, float]
+    chi_square: float
+    p_value: float
+    mismatch: bool
+    worst_variant: str = field(default="")
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """Survival function of the chi-square distribution (regularized upper incomplete gamma Q(dof/2, x/2))."""
+    if x <= 0:
+        return 1.0
+    a, x = dof / 2, x / 2
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Series expansion of the lower function P(a, x).
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+    # Lentz's continued fraction of Q(a, x).
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+class SrmMonitor:
+    """Online sample ratio mismatch detection for a scenario.
+
+    Recorded calls are counted per variant by a recorder hook (O(1) per call). A background
+    task periodically compares the counts with the configured traffic split using a
+    chi-square goodness-of-fit test; mismatches are logged as warnings and exported as the
+    `SampleRatioMismatch` counter labeled with the most deviating variant. Counts are reset
+    when the split changes (a variant down-weighted, disabled or re-enabled), so calls
+    routed with the previous weights are not tested against the new ones.
+    """
+
+    METRIC_NAME = "SampleRatioMismatch"
+    WARNING = "Sample ratio mismatch in {} (p-value: {:.2g}, observed: {}, expected: {})"
+
+    def __init__(self: Self, config: SrmConfig, exporter: Exporter | None = None) -> None:
+        self._config = config
+        self._exporter = exporter
+        self._counts: dict[str, int] = {}
+        self._counted_weights: dict[str, int] | None = None
+        self._lock = Lock()
+        self._scenario = ""
+        self._weights: Callable[[], dict[str, int]] = dict
+        self._logger: Logger | None = None
+        self._task: PeriodicTask | None = None
+        self.last_result: SrmResult | None = None
+
+    def start(self: Self, scenario: str, weights: Callable[[], dict[str, int]], logger: Logger) -> None:
+        """Binds the monitor to a scenario and schedules the periodic check."""
+        self._scenario = scenario
+        self._weights = weights
+        self._logger = logger
+        self._task = Scheduler.every(self._config.interval, self._run)
+
+    def stop(self: Self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    def hook(self: Self) -> "_SrmHook":
+        return _SrmHook(self)
+
+    def add(self: Self, variant: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[variant] = self._counts.get(variant, 0) + count
+
+    def check(self: Self) -> SrmResult | None:
+        """Runs the test on the current counts, None until `min_calls` calls were recorded."""
+        weights = {variant: weight for variant, weight in self._weights().items() if weight > 0}
+        with self._lock:
+            if weights != self._counted_weights:
+                if self._counted_weights is not None:
+                    self._counts.clear()
+                self._counted_weights = weights
+            observed = {variant: self._counts.get(variant, 0) for variant in weights}
+        total = sum(observed.values())
+        if total < self._config.min_calls or len(weights) < 2:
+            return None
+        weight_total = sum(weights.values())
+        expected = {variant: total * weight / weight_total for variant, weight in weights.items()}
+        contributions = {
+            variant: (observed[variant] - expected[variant]) ** 2 / expected[variant] for variant in weights
+        }
+        chi_square = sum(contributions.values())
+        p_value = chi2_sf(chi_square, len(weights) - 1)
+        self.last_result = SrmResult(
+            observed=observed,
+            expected=expected,
+            chi_square=chi_square,
+            p_value=p_value,
+            mismatch=p_value < self._config.alpha,
+            worst_variant=max(contributions, key=contributions.__getitem__),
+        )
+        return self.last_result
+
+    def _run(self: Self) -> None:
+        try:
+            result = self.check()
+            if result is None or not result.mismatch:
+                return
+            if self._logger is not None:
+                expected = {variant: round(value) for variant, value in result.expected.items()}
+                self._logger.warning(self.WARNING.format(self._scenario, result.p_value, result.observed, expected))
+            if self._exporter is not None:
+                label = MetricLabel(
+                    metric=self.METRIC_NAME,
+                    func=self._scenario,
+                    variant=result.worst_variant,
+                    is_error=False,
+                )
+                self._exporter.record(label=label, value=1)
+        except Exception:  # noqa
+            if self._logger is not None:
+                self._logger.error(traceback.format_exc())
+
+
+class _SrmHook:
+    # Warm-up calls were routed by the selector too and belong to the observed split.
+    WARMUP = True
+
+    def __init__(self: Self, monitor: SrmMonitor) -> None:
+        self._monitor = monitor
+
+    def on_start(self: Self, context: Context) -> Context:
+        self._monitor.add(context.variant, context.extra.get("batch_size", 1))
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None: ...
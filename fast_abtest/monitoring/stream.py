@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Self
+
+from fast_abtest.monitoring.interface import MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+from fast_abtest.streaming import StreamStats
+
+
+class _StreamMetric(BaseMetric, ABC):
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        stats: StreamStats | None = context.extra.get("stream")
+        if stats is None:
+            return
+        value = self._value(stats)
+        if value is None:
+            return
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=is_error,
+        )
+        self._exporter.record(label=label, value=value)
+
+    @abstractmethod
+    def _value(self: Self, stats: StreamStats) -> float | int | None: ...
+
+
+class FirstChunkLatencyMetric(_StreamMetric):
+    """Time to the first yielded chunk (seconds)."""
+
+    def _value(self: Self, stats: StreamStats) -> float | None:
+        return stats.first_chunk_latency
+
+
+class StreamChunksMetric(_StreamMetric):
+    """Number of yielded chunks/items."""
+
+    def _value(self: Self, stats: StreamStats) -> int:
+        return stats.chunks
+
+
+class StreamBytesMetric(_StreamMetric):
+    """Size of yielded bytes/str chunks."""
+
+    def _value(self: Self, stats: StreamStats) -> int:
+        return stats.bytes
+
+
+class StreamErrorsMetric(_StreamMetric):
+    """Streams that failed while being consumed."""
+
+    def _value(self: Self, stats: StreamStats) -> int | None:
+        return 1 if stats.error else None
@@ -0,0 +1,124 @@
+from array import array
+from threading import Lock
+from time import perf_counter, time
+from typing import Self
+
+from fast_abtest.monitoring.histogram import CompactLogHistogram
+from fast_abtest.monitoring.interface import Context
+
+
+class _VariantSeries:
+    BUCKETS = CompactLogHistogram.SIZE
+
+    def __init__(self: Self, seconds: int) -> None:
+        self.epochs = array("q", [-1]) * seconds
+        self.calls = array("I", bytes(4 * seconds))
+        self.errors = array("I", bytes(4 * seconds))
+        # One compact latency sketch per slot, stored flat: BUCKETS counts starting at slot * BUCKETS.
+        self.latency = array("I", bytes(4 * seconds * self.BUCKETS))
+
+
+_EMPTY_SLOT = array("I", bytes(4 * _VariantSeries.BUCKETS))
+
+
+class TimeSeries:
+    """Fixed-size ring of per-second call, error and latency counts per variant.
+
+    Every second of the last `seconds` owns a slot that is reset when the ring wraps around, so
+    memory is constant regardless of traffic (~0.5 KB per variant and second). Latencies
+    (microseconds) of a slot are counted in `CompactLogHistogram` buckets, merged over the
+    requested window for percentiles.
+    """
+
+    def __init__(self: Self, seconds: int = 300) -> None:
+        if seconds < 1:
+            raise ValueError("seconds must be positive")
+        self._seconds = seconds
+        self._variants: dict[str, _VariantSeries] = {}
+        self._lock = Lock()
+
+    @property
+    def seconds(self: Self) -> int:
+        return self._seconds
+
+    def hook(self: Self) -> "_TimeSeriesHook":
+        """Returns the metric hook feeding the ring from a scenario's recorder."""
+        return _TimeSeriesHook(self)
+
+    def record(
+        self: Self, variant: str, latency: float, is_error: bool, count: int = 1, now: float | None = None
+    ) -> None:
+        second = int(time() if now is None else now)
+        slot = second % self._seconds
+        bucket = CompactLogHistogram.bucket_index(int(latency * 1_000_000))
+        with self._lock:
+            series = self._variants.get(variant)
+            if series is None:
+                series = self._variants[variant] = _VariantSeries(self._seconds)
+            if series.epochs[slot] != second:
+                self._reset(series, slot, second)
+            series.calls[slot] += count
+            if is_error:
+                series.errors[slot] += count
+            series.latency[slot * _VariantSeries.BUCKETS + bucket] += count
+
+    def stats(self: Self, window: int = 60, now: float | None = None) -> dict[str, dict[str, float]]:
+        """Aggregates the last `window` complete seconds per variant.
+
+        Returns calls, RPS, error rate and p50/p90/p99 latency (seconds) per variant.
+        """
+        if not 1 <= window <= self._seconds:
+            raise ValueError(f"window must be between 1 and {self._seconds}")
+        last = int(time() if now is None else now) - 1
+        snapshots = {}
+        # Only copy the slots of the window under the lock, merging happens outside of it.
+        with self._lock:
+            for variant, series in self._variants.items():
+                calls = errors = 0
+                slots = []
+                for second in range(last - window + 1, last + 1):
+                    slot = second % self._seconds
+                    if series.epochs[slot] != second:
+                        continue
+                    calls += series.calls[slot]
+                    errors += series.errors[slot]
+                    offset = slot * _VariantSeries.BUCKETS
+                    slots.append(series.latency[offset : offset + _VariantSeries.BUCKETS])
+                snapshots[variant] = calls, errors, slots
+
+        result = {}
+        for variant, (calls, errors, slots) in snapshots.items():
+            latency = CompactLogHistogram()
+            if slots:
+                counts = [sum(bucket) for bucket in zip(*slots)]
+                latency.record_buckets((index, count) for index, count in enumerate(counts) if count)
+            result[variant] = {
+                "calls": calls,
+                "rps": calls / window,
+                "error_rate": errors / calls if calls else 0.0,
+                "p50": latency.quantile(0.5) / 1_000_000,
+                "p90": latency.quantile(0.9) / 1_000_000,
+                "p99": latency.quantile(0.99) / 1_000_000,
+            }
+        return result
+
+    @staticmethod
+    def _reset(series: _VariantSeries, slot: int, second: int) -> None:
+        series.epochs[slot] = second
+        series.calls[slot] = 0
+        series.errors[slot] = 0
+        offset = slot * _VariantSeries.BUCKETS
+        series.latency[offset : offset + _VariantSeries.BUCKETS] = _EMPTY_SLOT
+
+
+class _TimeSeriesHook:
+    def __init__(self: Self, timeseries: TimeSeries) -> None:
+        self._timeseries = timeseries
+
+    def on_start(self: Self, context: Context) -> Context:
+        context.extra["timeseries_start"] = perf_counter()
+        return context
+
+    def on_end(self: Self, context: Context, is_error: bool) -> None:
+        latency = perf_counter() - context.extra["timeseries_start"]
+        self._timeseries.record(context.variant, latency, is_error, count=context.extra.get("batch_size", 1))
@@ -0,0 +1,22 @@
+from typing import Self
+
+from fast_abtest.monitoring.interface import MetricLabel, BaseMetric
+from fast_abtest.registred_scenario import Context
+
+
+class WarmupCallsMetric(BaseMetric):
+    """Calls served during a variant warm-up, which other metrics do not record."""
+
+    WARMUP = True
+
+    def on_start(self: Self, context: Context) -> Context:
+        if not context.extra.get("warmup"):
+            return context
+        label = MetricLabel(
+            metric=self.__class__.__name__,
+            func=context.scenario,
+            variant=context.variant,
+            is_error=False,
+        )
+        self._exporter.record(label=label, value=1)
+        return context
@@ -0,0 +1,87 @@
+import csv
+import os
+import sqlite3
+from threading import Lock
+from typing import Any, Callable, Iterable, Self
+
+from fast_abtest.experiment_scope import stable_hash
+
+
+class OverrideTable:
+    """Forced variant assignments (QA, internal users) keyed by the experiment assignment key.
+
+    Keys are stored by their `stable_hash`, the hash `ExperimentContext` already computes for
+    bucketing, so a lookup of non-overridden traffic costs a single dict probe. Variant names
+    are checked against `variants` (the scenario's variants) when set or bulk loaded.
+
+    Example:
+        search.overrides.load_csv("qa_users.csv")  # key,variant rows
+        search.overrides.set("qa-user-1", "search_b")
+    """
+
+    def __init__(self: Self, variants: Callable[[], Iterable[str]] | None = None) -> None:
+        self._variants: dict[int, str] = {}
+        self._names = variants
+        self._lock = Lock()
+
+    def __len__(self: Self) -> int:
+        return len(self._variants)
+
+    def get(self: Self, key_hash: int) -> str | None:
+        """Returns the forced variant name for a key hash (`ExperimentContext.key_hash`)."""
+        return self._variants.get(key_hash)
+
+    def set(self: Self, key: Any, variant: str) -> None:
+        self._validate([variant])
+        key_hash = stable_hash(key)
+        with self._lock:
+            self._variants[key_hash] = variant
+
+    def remove(self: Self, key: Any) -> None:
+        with self._lock:
+            self._variants.pop(stable_hash(key), None)
+
+    def clear(self: Self) -> None:
+        with self._lock:
+            self._variants = {}
+
+    def update(self: Self, assignments: Iterable[tuple[Any, str]], replace: bool = False) -> int:
+        """Bulk loads (key, variant) pairs, building the new table aside and swapping it in.
+
+        Returns the number of loaded pairs. Raises ValueError, loading nothing, if a pair names
+        an unknown variant.
+        """
+        loaded = {stable_hash(key): variant for key, variant in assignments}
+        self._validate(loaded.values())
+        with self._lock:
+            self._variants = loaded if replace else {**self._variants, **loaded}
+        return len(loaded)
+
+    def load_csv(self: Self, path: str | os.PathLike, delimiter: str = ",", replace: bool = False) -> int:
+        """Loads `key<delimiter>variant` rows from a local file (empty rows and `#` comments are skipped)."""
+        with open(path, newline="") as file:
+            rows = csv.reader(file, delimiter=delimiter)
+            return self.update(
+                ((row[0].strip(), row[1].strip()) for row in rows if row and not row[0].startswith("#")),
+                replace,
+            )
+
+    def load_sqlite(
+        self: Self,
+        path: str | os.PathLike,
+        query: str = "SELECT key, variant FROM abtest_overrides",
+        replace: bool = False,
+    ) -> int:
+        """Loads (key, variant) rows returned by a query against a SQLite database."""
+        connection = sqlite3.connect(path)
+        try:
+            return self.update(((str(key), variant) for key, variant in connection.execute(query)), replace)
+        finally:
+            connection.close()
+
+    def _validate(self: Self, variants: Iterable[str]) -> None:
+        if self._names is None:
+            return
+        unknown = set(variants).difference(self._names())
+        if unknown:
+            raise ValueError(f"Unknown variants {', '.join(sorted(unknown))}")
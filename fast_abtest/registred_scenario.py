@@ -1,12 +1,36 @@
+import asyncio
 import inspect
 import time
+from functools import partial, wraps
 from logging import Logger
-from typing import Callable, Generic, Iterable, Self
+from random import choices
+from typing import Any, Callable, Generic, Iterable, Self
 
+from fast_abtest.cache import CacheConfig, VariantCache
+from fast_abtest.coalesce import Coalescer
+from fast_abtest.executor import ProcessTask, validate_executor
+from fast_abtest.exporter.fanout import FanOutExporter
+from fast_abtest.experiment_scope import (
+    ExperimentContext,
+    _current_context,
+    current_experiment_context,
+    mix_hash,
+    stable_hash,
+)
 from fast_abtest.interface import R, ScenarioHandler, _ScenarioVariant, Metric
+from fast_abtest.guardrail import LatencyGuard, LatencyGuardrail, LatencyGuards
+from fast_abtest.kill_switch import KillSwitch
+from fast_abtest.layer import Layer
 from fast_abtest.monitoring.interface import Context
-from fast_abtest.monitoring.recorder import MetricRecorder
+from fast_abtest.monitoring.profiler import OverheadProfiler
+from fast_abtest.monitoring.recorder import MetricRecorder, Recording
+from fast_abtest.monitoring.srm import SrmMonitor, SrmResult
+from fast_abtest.monitoring.timeseries import TimeSeries
+from fast_abtest.overrides import OverrideTable
+from fast_abtest.snapshot import SnapshotStore
+from fast_abtest.streaming import StreamStats, is_streaming_response, track_async_stream, track_stream
 from fast_abtest.variant_selector import VariantSelector
+from fast_abtest.warmup import Warmup, WarmupState
 
 
 class RegisteredScenario(Generic[R]):
@@ -18,44 +42,409 @@ class RegisteredScenario(Generic[R]):
         metrics: Iterable[Metric],
         logger: Logger,
         idempotent: bool = False,
+        profiler: OverheadProfiler | None = None,
+        layer: Layer | None = None,
+        layer_traffic_percent: int = 100,
+        routed: bool = False,
+        cache: CacheConfig | None = None,
+        timeseries: TimeSeries | None = None,
+        srm: SrmMonitor | None = None,
+        coalesce: bool = False,
+        snapshot: SnapshotStore | None = None,
+        fanout: FanOutExporter | None = None,
     ) -> None:
+        if timeseries is not None:
+            metrics = [*metrics, timeseries.hook()]
+        if srm is not None:
+            metrics = [*metrics, srm.hook()]
+        if profiler is not None:
+            metrics = profiler.wrap_metrics(metrics)
         self._variants: list[_ScenarioVariant[R]] = []
+        metrics = list(metrics)
         self._metric_recorder = MetricRecorder(metrics, logger)
+        self._warmup_recorder = MetricRecorder([m for m in metrics if getattr(m, "WARMUP", False)], logger)
+        self._profiler = profiler
+        self._timeseries = timeseries
         self._main_scenario = main_scenario
+        self._name = main_scenario.handler.__name__
+        self._salt = stable_hash(self._name)
+        self._layer = layer
+        self._layer_index = layer.join(self._name, layer_traffic_percent) if layer is not None else -1
         self._main_scenario_signature = self._normalize_signature(inspect.signature(self._main_scenario.handler))
         self._variant_selector: VariantSelector | None = None
         self._is_async = inspect.iscoroutinefunction(self._main_scenario.handler)
         self._logger = logger
         self._idempotent = idempotent
+        self._routed = routed
+        self._mixed = False  # routed scenario mixing sync and async variants, only served by `mount`
+        self._cache = cache
+        self._coalesce = coalesce
+        self._mounts: list[tuple[Any, set[str], str]] = []
+        self._srm = srm
+        self._latency_guards: LatencyGuards | None = None
+        self._snapshot = snapshot
+        self._fanout = fanout
+        self._overrides = OverrideTable(self._variant_names)
+        self._killed: _ScenarioVariant[R] | None = None
+        self._short_circuit: Callable[..., R] | None = None
+        if KillSwitch.register(self):
+            self.kill()
+        else:
+            self._apply_kill_switch()
+        if srm is not None:
+            srm.start(self._name, self._traffic_weights, logger)
+        if snapshot is not None:
+            snapshot.track(self)
 
     def register_variant(
         self: Self,
         traffic_percent: int,
         disable_threshold: float = 1.0,
+        cache: CacheConfig | None = None,
+        executor: str | None = None,
+        latency_threshold: float | LatencyGuardrail | None = None,
+        warmup: Warmup | None = None,
+        coalesce: bool | None = None,
     ) -> Callable[[ScenarioHandler[R]], ScenarioHandler[R]]:
         def add_to_variants(variant_func: ScenarioHandler[R]) -> ScenarioHandler[R]:
-            variant_func = self._validate_variant_signature(variant_func)
-            variant_func = self._validate_sync_type(variant_func)
+            if not self._routed:
+                variant_func = self._validate_variant_signature(variant_func)
+                if process_executor is None:
+                    variant_func = self._validate_sync_type(variant_func)
+            elif process_executor is None and inspect.iscoroutinefunction(variant_func) != self._is_async:
+                self._mixed = True
+            if warmup is not None:
+                self._validate_warmup(warmup, variant_func)
             scenario_variant = _ScenarioVariant(
                 handler=variant_func,
                 traffic_percent=tp,
                 threshold=threshold,
+                cache=VariantCache(variant_func, cache_config) if cache_config is not None else None,
+                executor=ProcessTask(variant_func) if process_executor else None,
+                warmup=WarmupState(warmup) if warmup is not None else None,
+                coalescer=Coalescer(variant_func) if coalesce_calls else None,
             )
             self._variants.append(scenario_variant)
             self._main_scenario.traffic_percent -= tp
             self._validate_total_traffic()
+            if self._snapshot is not None:
+                self._snapshot.restore(self._name, scenario_variant)
+            if guardrail is not None:
+                self._add_latency_guard(scenario_variant, guardrail)
             return variant_func
 
         tp = self._validate_traffic_value(traffic_percent)
         threshold = self._validate_disable_threshold(disable_threshold)
+        cache_config = cache or self._cache
+        coalesce_calls = self._coalesce if coalesce is None else coalesce
+        process_executor = validate_executor(executor)
+        guardrail = (
+            LatencyGuardrail(latency_threshold) if isinstance(latency_threshold, float | int) else latency_threshold
+        )
         return add_to_variants
 
+    def _add_latency_guard(self: Self, variant: _ScenarioVariant[R], guardrail: LatencyGuardrail) -> None:
+        if self._latency_guards is None:
+            self._latency_guards = LatencyGuards()
+            self._metric_recorder.add(self._latency_guards)
+        self._latency_guards.add(LatencyGuard(self._main_scenario, variant, guardrail, self._logger))
+
     def enable_variant(self: Self, variant_name: str) -> None:
         for variant in self._variants:
             if variant.handler.__name__ == variant_name:
                 variant.is_active = True
                 variant.error_count = 0
 
+    @property
+    def overrides(self: Self) -> OverrideTable:
+        """Forced assignments by experiment key, checked before the variant draw (see `override`)."""
+        return self._overrides
+
+    def override(self: Self, key: Any, variant_name: str | None) -> None:
+        """Forces the requests of an assignment key (`experiment_context(key=...)`) into a variant.
+
+        `None` removes the override. Use `overrides.load_csv`/`overrides.load_sqlite` for bulk loading.
+        """
+        if variant_name is None:
+            self._overrides.remove(key)
+            return
+        self._overrides.set(key, variant_name)
+
+    def _variant_names(self: Self) -> list[str]:
+        return [variant.handler.__name__ for variant in [self._main_scenario, *self._variants]]
+
+    def kill(self: Self, winner: str | None = None) -> None:
+        """Stops the experiment: every call goes straight to `winner` (the main variant by default).
+
+        Killed calls skip variant selection and metric recording (`map` records a single batch); the
+        winner keeps its executor, cache and coalescer.
+        """
+        for variant in [self._main_scenario, *self._variants]:
+            if winner is None and variant is self._main_scenario or variant.handler.__name__ == winner:
+                self._killed = variant
+                self._apply_kill_switch()
+                return
+        raise ValueError(f"Unknown variant {winner}")
+
+    def revive(self: Self) -> None:
+        """Resumes the experiment stopped by `kill` (the global `KillSwitch` still applies)."""
+        self._killed = None
+        self._apply_kill_switch()
+
+    def _apply_kill_switch(self: Self) -> None:
+        variant = self._killed
+        if variant is None and KillSwitch.is_engaged():
+            variant = self._main_scenario
+        if variant is None:
+            self._short_circuit = None
+        elif variant.executor is None and variant.coalescer is None and variant.cache is None:
+            self._short_circuit = variant.handler
+        else:
+            # The winner keeps its process pool, cache and coalescing, only metrics are skipped.
+            self._short_circuit = partial(self._call_killed_async if self._is_async else self._call_killed, variant)
+
+    def _call_killed(self: Self, variant: _ScenarioVariant[R], *args, **kwargs) -> R:
+        context = Context(scenario=self._name, variant=variant.handler.__name__, timestamp=int(time.time()))
+        handler = self._handler(variant, context, asynchronous=False)
+        if variant.cache is not None:
+            return variant.cache.call(handler, context, args, kwargs)
+        return handler(*args, **kwargs)
+
+    async def _call_killed_async(self: Self, variant: _ScenarioVariant[R], *args, **kwargs) -> R:
+        context = Context(scenario=self._name, variant=variant.handler.__name__, timestamp=int(time.time()))
+        handler = self._handler(variant, context, asynchronous=True)
+        if variant.cache is not None:
+            return await variant.cache.acall(handler, context, args, kwargs)
+        return await handler(*args, **kwargs)
+
+    def warmup_progress(self: Self) -> dict[str, float]:
+        """Returns the warm-up progress (0-1) of variants registered with `warmup`."""
+        return {variant.handler.__name__: variant.warmup.progress() for variant in self._variants if variant.warmup}
+
+    def overhead(self: Self) -> dict[str, dict[str, float]]:
+        """Returns per-phase overhead statistics (ns) collected in profiling mode."""
+        if self._profiler is None:
+            raise RuntimeError("Profiling is disabled for this scenario, use ab_test(profile=True)")
+        return self._profiler.snapshot()
+
+    def stats(self: Self, window: int = 60) -> dict[str, dict[str, float]]:
+        """Returns per-variant calls, RPS, error rate and latency percentiles of the last `window` seconds."""
+        if self._timeseries is None:
+            raise RuntimeError("Live stats are disabled for this scenario, use ab_test(stats_retention=...)")
+        return self._timeseries.stats(window)
+
+    def exporter_stats(self: Self) -> dict[str, dict[str, float]]:
+        """Returns records, errors, drops, queue length and latency (ns) of each exporter of `exporters=[...]`."""
+        if self._fanout is None:
+            raise RuntimeError("Exporter stats require several exporters, use ab_test(exporters=[...])")
+        return self._fanout.stats()
+
+    def check_srm(self: Self) -> SrmResult | None:
+        """Runs the sample ratio mismatch test now (None until enough calls were recorded)."""
+        if self._srm is None:
+            raise RuntimeError("SRM detection is disabled for this scenario, use ab_test(srm=SrmConfig())")
+        return self._srm.check()
+
+    def _traffic_weights(self: Self) -> dict[str, int]:
+        """Effective split: disabled variants get no traffic, the main variant receives the rest."""
+        weights = {
+            variant.handler.__name__: variant.traffic_percent if variant.is_active else 0 for variant in self._variants
+        }
+        return {self._main_scenario.handler.__name__: 100 - sum(weights.values()), **weights}
+
+    def register_batch(
+        self: Self, variant_name: str | None = None
+    ) -> Callable[[Callable[[list], Iterable[R]]], Callable[[list], Iterable[R]]]:
+        """Registers a batched implementation of a variant (the main one by default) used by `map`/`amap`.
+
+        The batch handler receives the list of items assigned to the variant and must return
+        one result per item, in the same order.
+        """
+
+        def add_batch_handler(batch_handler: Callable[[list], Iterable[R]]) -> Callable[[list], Iterable[R]]:
+            for variant in [self._main_scenario, *self._variants]:
+                if (
+                    variant_name is None and variant is self._main_scenario
+                ) or variant.handler.__name__ == variant_name:
+                    variant.batch_handler = batch_handler
+                    return batch_handler
+            raise ValueError(f"Unknown variant {variant_name}")
+
+        return add_batch_handler
+
+    def map(self: Self, items: Iterable[Any], key: Callable[[Any], Any] | None = None) -> list[R]:
+        """Calls the experiment for every item, grouping items by assigned variant.
+
+        Items are assigned in one pass (weighted draws, or hashes of `key(item)` giving the same
+        assignment as `experiment_context(key=...)`), every variant is invoked once with its batch
+        (batch handler or a loop over the handler) and metrics are recorded once per batch
+        with `Context.extra["batch_size"]`. Results keep the order of `items`.
+        """
+        self._reject_mixed_call()
+        self._reject_batch_mode(asynchronous=False)
+        items = list(items)
+        results: list[Any] = [None] * len(items)
+        for variant, indices in self._group_by_variant(items, key):
+            batch = [items[index] for index in indices]
+            context = self._batch_context(variant, len(batch))
+            with self._metric_recorder.record(context):
+                try:
+                    if variant.batch_handler is not None:
+                        batch_results = list(variant.batch_handler(batch))
+                    else:
+                        handler = self._handler(variant, context, asynchronous=False)
+                        batch_results = [handler(item) for item in batch]
+                    self._validate_batch_results(batch, batch_results)
+                except:
+                    self._register_error(variant, len(batch))
+                    raise
+            for index, result in zip(indices, batch_results):
+                results[index] = result
+        return results
+
+    async def amap(self: Self, items: Iterable[Any], key: Callable[[Any], Any] | None = None) -> list[R]:
+        """Async counterpart of `map`: variant batches run concurrently."""
+        self._reject_mixed_call()
+        self._reject_batch_mode(asynchronous=True)
+        items = list(items)
+        results: list[Any] = [None] * len(items)
+
+        async def run_batch(variant: _ScenarioVariant[R], indices: list[int]) -> None:
+            batch = [items[index] for index in indices]
+            context = self._batch_context(variant, len(batch))
+            with self._metric_recorder.record(context):
+                try:
+                    if variant.batch_handler is not None:
+                        batch_results = list(await variant.batch_handler(batch))  # type: ignore
+                    else:
+                        handler = self._handler(variant, context, asynchronous=True)
+                        batch_results = list(await asyncio.gather(*(handler(item) for item in batch)))
+                    self._validate_batch_results(batch, batch_results)
+                except:
+                    self._register_error(variant, len(batch))
+                    raise
+            for index, result in zip(indices, batch_results):
+                results[index] = result
+
+        await asyncio.gather(*(run_batch(variant, indices) for variant, indices in self._group_by_variant(items, key)))
+        return results
+
+    def _group_by_variant(
+        self: Self, items: list[Any], key: Callable[[Any], Any] | None
+    ) -> list[tuple[_ScenarioVariant[R], list[int]]]:
+        if self._short_circuit is not None:
+            return [(self._killed or self._main_scenario, list(range(len(items))))]
+        if self._layer is not None:
+            raise TypeError("map() is not supported for scenarios joining a layer")
+        table = self._selector().bucket_table()
+        if key is None:
+            assigned = choices(table, k=len(items))
+        else:
+            salt = self._salt
+            assigned = [table[mix_hash(stable_hash(key(item)) ^ salt) % 100] for item in items]
+
+        groups: dict[int, tuple[_ScenarioVariant[R], list[int]]] = {}
+        for index, variant in enumerate(assigned):
+            group = groups.get(id(variant))
+            if group is None:
+                group = groups[id(variant)] = (variant, [])
+            group[1].append(index)
+        for variant, indices in groups.values():
+            if variant is not self._main_scenario:
+                variant.increment_call(len(indices))
+        return list(groups.values())
+
+    def _batch_context(self: Self, variant: _ScenarioVariant[R], batch_size: int) -> Context:
+        return Context(
+            scenario=self._name,
+            variant=variant.handler.__name__,
+            timestamp=int(time.time()),
+            extra={"batch_size": batch_size},
+        )
+
+    @staticmethod
+    def _validate_batch_results(batch: list[Any], results: list[Any]) -> None:
+        if len(results) != len(batch):
+            raise ValueError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+
+    def mount(self: Self, app: Any, path: str, methods: Iterable[str] = ("GET",), **route_kwargs: Any) -> None:
+        """Registers every variant as its own FastAPI route for `ExperimentMiddleware`.
+
+        The main variant is served (and documented) at `path`, other variants at hidden
+        `/_abtest/{scenario}/{variant}{path}` routes. The middleware assigns the variant before
+        routing, so FastAPI only resolves the dependencies of the selected variant and variants
+        of a routed scenario (`ab_test(routed=True)`) may declare different signatures.
+        """
+        from starlette.routing import compile_path
+
+        methods = {method.upper() for method in methods}
+        for variant in [self._main_scenario, *self._variants]:
+            variant_path = path if variant is self._main_scenario else self._variant_path(variant, path)
+            app.add_api_route(
+                variant_path,
+                self._bind_variant(variant),
+                methods=list(methods),
+                include_in_schema=variant is self._main_scenario,
+                **route_kwargs,
+            )
+        self._mounts.append((compile_path(path)[0], methods, path))
+
+    def route(self: Self, path: str, method: str) -> str | None:
+        """Returns the mounted path template matching a request or None."""
+        for regex, methods, template in self._mounts:
+            if method in methods and regex.match(path):
+                return template
+        return None
+
+    def _variant_path(self: Self, variant: _ScenarioVariant[R], path: str) -> str:
+        return f"/_abtest/{self._name}/{variant.handler.__name__}{path}"
+
+    def _bind_variant(self: Self, variant: _ScenarioVariant[R]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(variant.handler):
+
+            async def async_endpoint(*args, **kwargs):
+                context = self._routed_context(variant) if self._short_circuit is None else None
+                if context is None:
+                    return await variant.handler(*args, **kwargs)  # type: ignore
+                return await self._invoke_async(variant, context, args, kwargs)
+
+            return wraps(variant.handler)(async_endpoint)
+
+        def endpoint(*args, **kwargs):
+            context = self._routed_context(variant) if self._short_circuit is None else None
+            if context is None:
+                return variant.handler(*args, **kwargs)
+            return self._invoke(variant, context, args, kwargs)
+
+        return wraps(variant.handler)(endpoint)
+
+    def _routed_context(self: Self, variant: _ScenarioVariant[R]) -> Context | None:
+        experiment = current_experiment_context()
+        if experiment is None:
+            return Context(scenario=self._name, variant=variant.handler.__name__, timestamp=int(time.time()))
+        if id(self) not in experiment._selected:
+            # The middleware excluded the request from this experiment (layer slice).
+            return None
+        return self._build_context(variant, experiment)
+
+    def _validate_warmup(self: Self, warmup: Warmup, func: ScenarioHandler[R]) -> None:
+        # Only coroutine calls await the warm-up (routed variants are served by their own route).
+        asynchronous = inspect.iscoroutinefunction(func) if self._routed else self._is_async
+        if inspect.iscoroutinefunction(warmup.function) and not asynchronous:
+            raise TypeError("A coroutine warm-up function requires an async variant")
+
+    def _reject_mixed_call(self: Self) -> None:
+        if self._mixed:
+            raise TypeError(
+                f"Routed scenario {self._name} mixes sync and async variants and can only be served by mount()"
+            )
+
+    def _reject_batch_mode(self: Self, asynchronous: bool) -> None:
+        if asynchronous and not self._is_async:
+            raise TypeError(f"{self._name} is a sync scenario, use map() instead of amap()")
+        if not asynchronous and self._is_async:
+            raise TypeError(f"{self._name} is a coroutine scenario, use amap() instead of map()")
+
     def _validate_sync_type(self: Self, func: ScenarioHandler[R]) -> ScenarioHandler[R]:
         if inspect.iscoroutinefunction(func) != self._is_async:
             raise TypeError("All variants must be either async or sync, cannot mix them")
@@ -106,22 +495,167 @@ class RegisteredScenario(Generic[R]):
         *args,
         **kwargs,
     ) -> R:
+        if self._mixed:
+            self._reject_mixed_call()
+        if self._short_circuit is not None:
+            return self._short_circuit(*args, **kwargs)
+        if self._is_async:
+            return self._call_async(*args, **kwargs)  # type: ignore
+        experiment = _current_context.get()
+        if experiment is not None:
+            return self._call_sync(experiment, args, kwargs)
+        # Implicit context of a top-level call, opened without a context manager on this hot path.
+        experiment = ExperimentContext(_owner=id(self))
+        token = _current_context.set(experiment)
+        try:
+            return self._call_sync(experiment, args, kwargs)
+        finally:
+            _current_context.reset(token)
+
+    def _call_sync(self: Self, experiment: ExperimentContext, args: tuple, kwargs: dict) -> R:
+        variant = self._assign(experiment)
+        if variant is None:
+            return self._main_scenario.handler(*args, **kwargs)
+        return self._invoke(variant, self._build_context(variant, experiment), args, kwargs)
+
+    async def _call_async(self: Self, *args, **kwargs) -> R:
+        experiment = _current_context.get()
+        if experiment is not None:
+            return await self._call_coroutine(experiment, args, kwargs)
+        experiment = ExperimentContext(_owner=id(self))
+        token = _current_context.set(experiment)
+        try:
+            return await self._call_coroutine(experiment, args, kwargs)
+        finally:
+            _current_context.reset(token)
+
+    async def _call_coroutine(self: Self, experiment: ExperimentContext, args: tuple, kwargs: dict) -> R:
+        variant = self._assign(experiment)
+        if variant is None:
+            return await self._main_scenario.handler(*args, **kwargs)  # type: ignore
+        return await self._invoke_async(variant, self._build_context(variant, experiment), args, kwargs)
+
+    def _invoke(self: Self, variant: _ScenarioVariant[R], context: Context, args: tuple, kwargs: dict) -> R:
+        if variant.warmup is not None and not variant.warmup.done:
+            try:
+                variant.warmup.prepare()
+            except:
+                self._register_error(variant)
+                raise
+            if variant.warmup.enter():
+                self._exclude_warmup_call(variant, context)
+                with self._warmup_recorder.record(context):
+                    return self._handler(variant, context, asynchronous=False)(*args, **kwargs)
+        with self._metric_recorder.record(context) as recording:
+            try:
+                handler = self._handler(variant, context, asynchronous=False)
+                if variant.cache is not None:
+                    result = variant.cache.call(handler, context, args, kwargs)
+                else:
+                    result = handler(*args, **kwargs)
+            except:
+                self._register_error(variant)
+                raise
+            return self._track_result(result, variant, recording)
+
+    async def _invoke_async(self: Self, variant: _ScenarioVariant[R], context: Context, args: tuple, kwargs: dict) -> R:
+        if variant.warmup is not None and not variant.warmup.done:
+            try:
+                await variant.warmup.aprepare()
+            except:
+                self._register_error(variant)
+                raise
+            if variant.warmup.enter():
+                self._exclude_warmup_call(variant, context)
+                with self._warmup_recorder.record(context):
+                    return await self._handler(variant, context, asynchronous=True)(*args, **kwargs)
+        with self._metric_recorder.record(context) as recording:
+            try:
+                handler = self._handler(variant, context, asynchronous=True)
+                if variant.cache is not None:
+                    result = await variant.cache.acall(handler, context, args, kwargs)
+                else:
+                    result = await handler(*args, **kwargs)  # type: ignore
+            except:
+                self._register_error(variant)
+                raise
+            return self._track_result(result, variant, recording)
+
+    def _exclude_warmup_call(self: Self, variant: _ScenarioVariant[R], context: Context) -> None:
+        # The selector counted the call; warm-up calls must not feed the error threshold.
+        if variant is not self._main_scenario:
+            variant.increment_call(-1)
+        context.extra["warmup"] = True
+
+    @staticmethod
+    def _handler(variant: _ScenarioVariant[R], context: Context, asynchronous: bool) -> Callable[..., Any]:
+        """Returns the callable running the variant (in the process pool, coalesced when configured)."""
+        handler = variant.handler if variant.executor is None else variant.executor.bind(context, asynchronous)
+        if variant.coalescer is not None:
+            handler = variant.coalescer.bind(handler, context, asynchronous)
+        return handler
+
+    def _track_result(self: Self, result: Any, variant: _ScenarioVariant[R], recording: Recording) -> Any:
+        """Defers the end of the recording until a streamed result (generator/StreamingResponse) is consumed."""
+        if inspect.isgenerator(result):
+            return track_stream(result, *self._stream_tracking(variant, recording))
+        if inspect.isasyncgen(result):
+            return track_async_stream(result, *self._stream_tracking(variant, recording))
+        if is_streaming_response(result):
+            result.body_iterator = track_async_stream(result.body_iterator, *self._stream_tracking(variant, recording))
+        return result
+
+    def _stream_tracking(
+        self: Self, variant: _ScenarioVariant[R], recording: Recording
+    ) -> tuple[StreamStats, Callable[[], None], Callable[[bool], None]]:
+        stats = recording.context.extra["stream"] = StreamStats()
+        return stats, partial(self._register_error, variant), recording.defer()
+
+    def _selector(self: Self) -> VariantSelector[R]:
         if self._variant_selector is None:
-            self._variant_selector = VariantSelector(self._main_scenario, self._variants, self._idempotent)
-        variant: _ScenarioVariant[R] = self._variant_selector.select()
-        context = Context(
-            scenario=self._main_scenario.handler.__name__,
+            self._variant_selector = VariantSelector(
+                self._main_scenario, self._variants, self._idempotent, self._overrides
+            )
+            if self._profiler is not None:
+                self._variant_selector = self._profiler.wrap_selector(self._variant_selector)
+        return self._variant_selector
+
+    def _assign(self: Self, experiment: ExperimentContext) -> _ScenarioVariant[R] | None:
+        """Selects the variant once per request (None when the request is excluded by the layer)."""
+        selector = self._selector()
+        variant: _ScenarioVariant[R] | None = None
+        # The implicit context opened by a call is shared with nested experiments, but a scenario
+        # re-entering itself (e.g. a variant calling the scenario) is assigned again.
+        if experiment._owner != id(self):
+            variant = experiment._selected.get(id(self))
+        if variant is None or not variant.is_active:
+            variant = selector.forced(experiment.key_hash)
+            if variant is None:
+                if self._layer is None:
+                    bucket = experiment.bucket(self._salt)
+                else:
+                    bucket = self._layer.resolve(self._layer_index, experiment)
+                    if bucket is None:
+                        return None
+                variant = selector.select(bucket)
+            experiment._selected[id(self)] = variant
+            experiment.assignments[self._name] = variant.handler.__name__
+        elif variant is not self._main_scenario:
+            variant.increment_call()
+        return variant
+
+    def _build_context(self: Self, variant: _ScenarioVariant[R], experiment: ExperimentContext) -> Context:
+        return Context(
+            scenario=self._name,
             variant=variant.handler.__name__,
             timestamp=int(time.time()),
+            extra={"assignments": experiment.assignments},
         )
-        with self._metric_recorder.record(context):
-            try:
-                return variant.handler(*args, **kwargs)
-            except:
-                if variant.threshold_exceeded():
-                    msg = self.EXCEEDING_THRESHOLD_WARNING.format(
-                        variant.handler.__name__,
-                        variant.error_count / variant.call_count,
-                    )
-                    self._logger.warning(msg)
-                raise
+
+    def _register_error(self: Self, variant: _ScenarioVariant[R], count: int = 1) -> None:
+        if variant.threshold_exceeded(count):
+            msg = self.EXCEEDING_THRESHOLD_WARNING.format(
+                variant.handler.__name__,
+                variant.error_count / variant.call_count,
+            )
+            self._logger.warning(msg)
@@ -0,0 +1,61 @@
+import heapq
+import traceback
+from itertools import count
+from logging import getLogger
+from threading import Condition, Thread
+from time import monotonic
+from typing import Callable, Self
+
+
+class PeriodicTask:
+    """Handle of a callback scheduled with `Scheduler.every`."""
+
+    def __init__(self: Self, interval: float, callback: Callable[[], None]) -> None:
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self: Self) -> None:
+        self.cancelled = True
+
+
+class Scheduler:
+    """Single daemon thread running periodic background checks off the request path.
+
+    Callbacks run sequentially and are expected to log their own errors; an exception
+    is logged and does not stop the schedule.
+    """
+
+    _logger = getLogger(__name__)
+    _heap: list[tuple[float, int, PeriodicTask]] = []
+    _sequence = count()
+    _condition = Condition()
+    _thread: Thread | None = None
+
+    @classmethod
+    def every(cls: type["Scheduler"], interval: float, callback: Callable[[], None]) -> PeriodicTask:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        task = PeriodicTask(interval, callback)
+        with cls._condition:
+            heapq.heappush(cls._heap, (monotonic() + interval, next(cls._sequence), task))
+            if cls._thread is None:
+                cls._thread = Thread(target=cls._run, name="abtest-scheduler", daemon=True)
+                cls._thread.start()
+            cls._condition.notify()
+        return task
+
+    @classmethod
+    def _run(cls: type["Scheduler"]) -> None:
+        while True:
+            with cls._condition:
+                while not cls._heap or cls._heap[0][0] > monotonic():
+                    cls._condition.wait(cls._heap[0][0] - monotonic() if cls._heap else None)
+                _, _, task = heapq.heappop(cls._heap)
+                if task.cancelled:
+                    continue
+                heapq.heappush(cls._heap, (monotonic() + task.interval, next(cls._sequence), task))
+            try:
+                task.callback()
+            except Exception:  # noqa
+                cls._logger.error(traceback.format_exc())
@@ -0,0 +1,150 @@
+import atexit
+import mmap
+import os
+import struct
+import time
+import traceback
+from logging import Logger, getLogger
+from threading import Lock
+from typing import Any, Iterable, Self
+from weakref import WeakSet
+
+from fast_abtest.experiment_scope import stable_hash
+from fast_abtest.interface import _ScenarioVariant
+from fast_abtest.scheduler import PeriodicTask, Scheduler
+
+
+class SnapshotStore:
+    """Binary snapshot of per-variant state (call/error counts, `is_active`) surviving restarts.
+
+    Layout (little-endian, fixed-size so it can be read through `mmap`):
+        header: magic b"ABTS", format version (u16), reserved (u16), record count (u32),
+                write time in unix nanoseconds (i64)
+        records sorted by key: key (u64, hash of "scenario:variant"), config version (u64, hash of
+                the variant traffic share and error threshold), call count (u64), error count (u64),
+                flags (u8, bit 0 = active), 7 padding bytes
+
+    The file is rewritten periodically and at exit through a temporary file and an atomic rename;
+    loaded records of variants not registered in the process are written back unchanged.
+    A record is restored only if its config version matches the registered variant, so stats of a
+    variant whose traffic share or threshold changed are ignored.
+    """
+
+    MAGIC = b"ABTS"
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct("<4sHHIq")
+    RECORD = struct.Struct("<QQQQB7x")
+    ACTIVE = 1
+
+    _stores: dict[str, "SnapshotStore"] = {}
+    _stores_lock = Lock()
+
+    def __init__(self: Self, path: str | os.PathLike, interval: float = 30.0, logger: Logger | None = None) -> None:
+        self._path = os.fspath(path)
+        self._logger = logger or getLogger(__name__)
+        self._scenarios: WeakSet[Any] = WeakSet()
+        self._lock = Lock()
+        self._records = self.read(self._path)
+        self._versions: dict[int, int] = {}
+        self._task: PeriodicTask = Scheduler.every(interval, self.save)
+        atexit.register(self.save)
+
+    @classmethod
+    def open(cls: type["SnapshotStore"], path: str | os.PathLike, interval: float = 30.0) -> "SnapshotStore":
+        """Returns the store of a file, shared by all scenarios snapshotted to it."""
+        key = os.path.abspath(os.fspath(path))
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls._stores[key] = cls(key, interval)
+            return store
+
+    @property
+    def path(self: Self) -> str:
+        return self._path
+
+    @classmethod
+    def read(cls: type["SnapshotStore"], path: str) -> dict[int, tuple[int, int, int, int]]:
+        """Reads records as {key: (config_version, call_count, error_count, flags)}; {} if missing or invalid."""
+        try:
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                magic, version, _, count, _ = cls.HEADER.unpack_from(view, 0)
+                if magic != cls.MAGIC or version != cls.FORMAT_VERSION:
+                    return {}
+                if len(view) < cls.HEADER.size + count * cls.RECORD.size:
+                    return {}
+                records = {}
+                for index in range(count):
+                    key, *record = cls.RECORD.unpack_from(view, cls.HEADER.size + index * cls.RECORD.size)
+                    records[key] = tuple(record)
+                return records  # type: ignore
+        except (OSError, ValueError, struct.error):
+            return {}
+
+    @staticmethod
+    def variant_key(scenario: str, variant: _ScenarioVariant[Any]) -> int:
+        return stable_hash(f"{scenario}:{variant.handler.__name__}")
+
+    @staticmethod
+    def config_version(variant: _ScenarioVariant[Any]) -> int:
+        return stable_hash(f"{variant.traffic_percent}:{variant.threshold}")
+
+    def track(self: Self, scenario: Any) -> None:
+        with self._lock:
+            self._scenarios.add(scenario)
+
+    def restore(self: Self, scenario: str, variant: _ScenarioVariant[Any]) -> bool:
+        """Restores the state of a registered variant from the loaded snapshot; returns True if it matched.
+
+        The config version is taken at registration, so runtime changes of the traffic share
+        (e.g. by a latency guardrail) do not invalidate the snapshot.
+        """
+        key = self.variant_key(scenario, variant)
+        version = self._versions[key] = self.config_version(variant)
+        record = self._records.get(key)
+        if record is None or record[0] != version:
+            return False
+        _, variant.call_count, variant.error_count, flags = record
+        variant.is_active = bool(flags & self.ACTIVE)
+        return True
+
+    def save(self: Self) -> None:
+        try:
+            with self._lock:
+                scenarios = list(self._scenarios)
+            records = {record[0]: record for record in self._collect(scenarios)}
+            # Records of scenarios not registered (yet) in this process are kept for a later restore.
+            for key, record in self._records.items():
+                records.setdefault(key, (key, *record))
+            records = sorted(records.values())
+            buffer = bytearray(self.HEADER.size + len(records) * self.RECORD.size)
+            self.HEADER.pack_into(buffer, 0, self.MAGIC, self.FORMAT_VERSION, 0, len(records), time.time_ns())
+            for index, record in enumerate(records):
+                self.RECORD.pack_into(buffer, self.HEADER.size + index * self.RECORD.size, *record)
+            temporary = f"{self._path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(buffer)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self._path)
+        except Exception:  # noqa
+            self._logger.error(traceback.format_exc())
+
+    def close(self: Self) -> None:
+        self._task.cancel()
+        atexit.unregister(self.save)
+        self.save()
+        with self._stores_lock:
+            self._stores.pop(os.path.abspath(self._path), None)
+
+    def _collect(self: Self, scenarios: Iterable[Any]) -> Iterable[tuple[int, int, int, int, int]]:
+        for scenario in scenarios:
+            for variant in scenario._variants:
+                key = self.variant_key(scenario._name, variant)
+                yield (
+                    key,
+                    self._versions.get(key) or self.config_version(variant),
+                    variant.call_count,
+                    variant.error_count,
+                    self.ACTIVE if variant.is_active else 0,
+                )
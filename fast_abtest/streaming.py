@@ -0,0 +1,75 @@
+from asyncio import CancelledError
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterator, Self
+
+
+@dataclass
+class StreamStats:
+    """Constant-size statistics of a streamed response, exposed as `Context.extra["stream"]`."""
+
+    started: float = field(default_factory=perf_counter)
+    first_chunk_latency: float | None = None
+    chunks: int = 0
+    bytes: int = 0
+    error: bool = False
+    cancelled: bool = False
+
+    def add(self: Self, chunk: Any) -> None:
+        if self.first_chunk_latency is None:
+            self.first_chunk_latency = perf_counter() - self.started
+        self.chunks += 1
+        if isinstance(chunk, (bytes, bytearray, memoryview, str)):
+            # str chunks are counted in characters to avoid re-encoding every chunk.
+            self.bytes += len(chunk)
+
+
+def is_streaming_response(result: Any) -> bool:
+    """Duck-typed check for Starlette/FastAPI `StreamingResponse`."""
+    return hasattr(result, "body_iterator") and hasattr(result, "background")
+
+
+def track_stream(
+    iterator: Iterator[Any],
+    stats: StreamStats,
+    on_error: Callable[[], None],
+    finish: Callable[[bool], None],
+) -> Iterator[Any]:
+    """Yields from `iterator` without buffering and finishes the recording when the stream ends."""
+    is_error = False
+    try:
+        for chunk in iterator:
+            stats.add(chunk)
+            yield chunk
+    except GeneratorExit:
+        stats.cancelled = True
+        raise
+    except:
+        is_error = stats.error = True
+        on_error()
+        raise
+    finally:
+        finish(is_error)
+
+
+async def track_async_stream(
+    iterator: AsyncIterator[Any],
+    stats: StreamStats,
+    on_error: Callable[[], None],
+    finish: Callable[[bool], None],
+) -> AsyncIterator[Any]:
+    """Async counterpart of `track_stream`."""
+    is_error = False
+    try:
+        async for chunk in iterator:
+            stats.add(chunk)
+            yield chunk
+    except (GeneratorExit, CancelledError):
+        stats.cancelled = True
+        raise
+    except:
+        is_error = stats.error = True
+        on_error()
+        raise
+    finally:
+        finish(is_error)
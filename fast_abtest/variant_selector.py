@@ -2,6 +2,7 @@ from random import randint
 from typing import Self, Iterable
 
 from fast_abtest.interface import _ScenarioVariant
+from fast_abtest.overrides import OverrideTable
 
 
 class VariantSelector[R]:
@@ -10,18 +11,52 @@ class VariantSelector[R]:
         main_scenario: _ScenarioVariant[R],
         variants: Iterable[_ScenarioVariant[R]],
         idempotent: bool = False,
+        overrides: OverrideTable | None = None,
     ) -> None:
         self._variants = variants
         self._default_variant = main_scenario
         self._idempotent = idempotent
+        self._overrides = overrides
 
-    def select(self: Self) -> _ScenarioVariant[R]:
+    def forced(self: Self, key_hash: int | None) -> _ScenarioVariant[R] | None:
+        """Returns the variant forced for an assignment key hash by the override table, if any.
+
+        Checked before the draw: forced keys ignore weights, layers and disabled state.
+        """
+        if key_hash is None or self._overrides is None:
+            return None
+        name = self._overrides.get(key_hash)
+        if name is None:
+            return None
+        for variant in (self._default_variant, *self._variants):
+            if variant.handler.__name__ == name:
+                if variant is not self._default_variant:
+                    variant.increment_call()
+                return variant
+        return None
+
+    def select(self: Self, bucket: int | None = None) -> _ScenarioVariant[R]:
+        """Selects a variant. `bucket` (0-99) makes the choice deterministic for an assignment key."""
         if self._idempotent:
             return self._idempotent_select()
+        if bucket is not None:
+            return self._weighted_select(bucket + 1)
         return self._random_select()
 
     def _random_select(self: Self) -> _ScenarioVariant[R]:
-        rand = randint(1, 100)
+        return self._weighted_select(randint(1, 100))
+
+    def bucket_table(self: Self) -> list[_ScenarioVariant[R]]:
+        """Returns the variant of each of the 100 buckets (index = bucket) without counting calls."""
+        return [self._variant_for(rand) for rand in range(1, 101)]
+
+    def _weighted_select(self: Self, rand: int) -> _ScenarioVariant[R]:
+        variant = self._variant_for(rand)
+        if variant is not self._default_variant:
+            variant.increment_call()
+        return variant
+
+    def _variant_for(self: Self, rand: int) -> _ScenarioVariant[R]:
         current = 0
         for variant in self._variants:
             if not variant.is_active:
@@ -29,7 +64,6 @@ class VariantSelector[R]:
 
             current += variant.traffic_percent
             if rand <= current:
-                variant.increment_call()
                 return variant
 
         return self._default_variant
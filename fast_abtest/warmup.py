@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Self
+
+
+@dataclass(frozen=True)
+class Warmup:
+    """Warm-up of a newly registered variant.
+
+    Attributes:
+        calls: Number of first calls excluded from statistics (error threshold and exporters)
+        seconds: Duration since the first call during which calls are excluded
+        function: Callable warming caches or connection pools. A sync function runs at
+            registration (or before the first call with `lazy=True`), a coroutine function
+            is awaited once before the first call and requires an async variant. A failing
+            function counts as an error of the variant and is retried on the next call
+        lazy: Defers a sync `function` to the first call of the variant
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    function: Callable[[], Any] | None = None
+    lazy: bool = False
+
+    def __post_init__(self: Self) -> None:
+        if self.calls < 0 or self.seconds < 0:
+            raise ValueError("calls and seconds must not be negative")
+
+
+class WarmupState:
+    """Tracks the warm-up of a variant; `done` is the only attribute read once warm-up is over."""
+
+    def __init__(self: Self, config: Warmup) -> None:
+        self._config = config
+        self._calls = 0
+        self._deadline: float | None = None
+        self._lock = Lock()
+        self._prepared = config.function is None
+        self._task: asyncio.Future | None = None
+        self.done = self._prepared and not config.calls and not config.seconds
+        if not self._prepared and not config.lazy and not inspect.iscoroutinefunction(config.function):
+            self.prepare()
+
+    @property
+    def calls(self: Self) -> int:
+        return self._calls
+
+    def progress(self: Self) -> float:
+        """Returns the warm-up progress between 0 and 1."""
+        if self.done:
+            return 1.0
+        calls = min(self._calls / self._config.calls, 1.0) if self._config.calls else 1.0
+        seconds = 1.0
+        if self._config.seconds:
+            elapsed = monotonic() - self._deadline + self._config.seconds if self._deadline is not None else 0.0
+            seconds = min(elapsed / self._config.seconds, 1.0)
+        return min(calls, seconds) if self._prepared else 0.0
+
+    def prepare(self: Self) -> None:
+        if self._prepared:
+            return
+        with self._lock:
+            if not self._prepared:
+                self._config.function()  # type: ignore
+                self._prepared = True
+
+    async def aprepare(self: Self) -> None:
+        if self._prepared:
+            return
+        if not inspect.iscoroutinefunction(self._config.function):
+            self.prepare()
+            return
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._config.function())  # type: ignore
+        task = self._task
+        try:
+            await asyncio.shield(task)
+        except BaseException:
+            # A finished task failed: drop it so that the next call retries instead of re-raising its error.
+            if task.done() and self._task is task:
+                self._task = None
+            raise
+        self._prepared = True
+
+    def enter(self: Self) -> bool:
+        """Returns True if the current call belongs to the warm-up (and counts it)."""
+        with self._lock:
+            now = monotonic()
+            if self._deadline is None:
+                self._deadline = now + self._config.seconds
+            if self._calls < self._config.calls or now < self._deadline:
+                self._calls += 1
+                return True
+            self.done = True
+            return False
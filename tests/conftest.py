@@ -0,0 +1,65 @@
+from typing import Iterable
+
+import pytest
+
+from fast_abtest import MetricLabel
+
+
+class MemoryExporter:
+    """Exporter keeping every (label, value) record in memory, with per-metric views for assertions."""
+
+    def __init__(self, metrics: Iterable[str], func_name: str, labelnames: Iterable[str], port: int) -> None:
+        self.metrics = list(metrics)
+        self.labelnames = list(labelnames)
+        self.recorded: list[tuple[MetricLabel, float | int]] = []
+
+    def record(self, label: MetricLabel, value: float | int) -> None:
+        self.recorded.append((label, value))
+
+    def values(self, metric: str) -> list[float | int]:
+        return [value for label, value in self.recorded if label.metric == metric]
+
+    def variants(self, metric: str) -> list[str]:
+        return [label.variant for label, _ in self.recorded if label.metric == metric]
+
+    def by_metric(self) -> dict[str, list[float | int]]:
+        recorded: dict[str, list[float | int]] = {}
+        for label, value in self.recorded:
+            recorded.setdefault(label.metric, []).append(value)
+        return recorded
+
+    def totals(self) -> dict[str, float | int]:
+        return {metric: sum(values) for metric, values in self.by_metric().items()}
+
+    def count(self, metric: str, variant: str) -> int:
+        return sum(1 for label, _ in self.recorded if label.metric == metric and label.variant == variant)
+
+
+class NullExporter:
+    """Exporter discarding every record, for tests that do not inspect exported values."""
+
+    def __init__(self, metrics: Iterable[str], func_name: str, labelnames: Iterable[str], port: int) -> None: ...
+
+    def record(self, label: MetricLabel, value: float | int) -> None: ...
+
+
+def _exporter_of(func) -> MemoryExporter:
+    return func._metric_recorder._metrics[0]._exporter
+
+
+@pytest.fixture(scope="session")
+def memory_exporter() -> type[MemoryExporter]:
+    """Exporter class keeping records in memory, to pass as `ab_test(exporter=...)`."""
+    return MemoryExporter
+
+
+@pytest.fixture(scope="session")
+def null_exporter() -> type[NullExporter]:
+    """Exporter class discarding records, to pass as `ab_test(exporter=...)`."""
+    return NullExporter
+
+
+@pytest.fixture(scope="session")
+def exporter_of():
+    """Function returning the exporter of a scenario's first metric."""
+    return _exporter_of
@@ -0,0 +1,161 @@
+import socket
+
+import pytest
+
+from fast_abtest import ab_test, experiment_context, Metric
+from fast_abtest.aggregator import (
+    Aggregator,
+    AggregatorClient,
+    Summary,
+    decode_push,
+    encode_push,
+    parse_address,
+    HEADER,
+)
+
+
+def _node(client: AggregatorClient, exporter):
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=exporter, aggregator=client)
+    def checkout(fail: bool = False) -> str:
+        return "a"
+
+    @checkout.register_variant(traffic_percent=10, disable_threshold=0.5)
+    def checkout_b(fail: bool = False) -> str:
+        if fail:
+            raise ValueError
+        return "b"
+
+    checkout.override("qa", "checkout_b")
+    return checkout
+
+
+def _call(scenario, fail: bool) -> None:
+    with experiment_context(key="qa"):
+        try:
+            scenario(fail=fail)
+        except ValueError:
+            pass
+
+
+@pytest.mark.parametrize("transport", ["tcp", "unix"])
+def test_fleet_error_rate_disables_variant_on_every_node(transport, tmp_path, null_exporter) -> None:
+    """Test two nodes below the local minimum of calls are disabled by their merged error rate"""
+    aggregator = Aggregator()
+    address = aggregator.start(("127.0.0.1", 0) if transport == "tcp" else str(tmp_path / "abtest.sock"))
+    first = AggregatorClient(address, interval=3600, node="node-1")
+    second = AggregatorClient(address, interval=3600, node="node-2")
+    try:
+        nodes = [_node(first, null_exporter), _node(second, null_exporter)]
+        for node in nodes:
+            for _ in range(6):
+                _call(node, fail=True)
+            assert node._variants[0].is_active
+
+        assert first.push()
+        assert nodes[0]._variants[0].is_active
+        assert second.push()
+        assert not nodes[1]._variants[0].is_active
+        assert first.push()
+        assert not nodes[0]._variants[0].is_active
+
+        stats = aggregator.stats()
+        assert stats["nodes"] == 2
+        variant = stats["scenarios"]["checkout"]["checkout_b"]
+        assert (variant["calls"], variant["errors"], variant["active"]) == (12, 12, False)
+        assert variant["window_calls"] == 12
+        assert first.fleet()["checkout"]["checkout_b"] == {"active": False, "calls": 12, "errors": 12}
+    finally:
+        first.close()
+        second.close()
+        aggregator.stop()
+
+
+def test_local_enable_variant_reenables_fleet(null_exporter) -> None:
+    """Test a variant re-enabled on one node starts a new window and is re-enabled on every node"""
+    aggregator = Aggregator()
+    address = aggregator.start(("127.0.0.1", 0))
+    first = AggregatorClient(address, interval=3600, node="node-1")
+    second = AggregatorClient(address, interval=3600, node="node-2")
+    try:
+        nodes = [_node(first, null_exporter), _node(second, null_exporter)]
+        for _ in range(12):
+            _call(nodes[0], fail=True)
+        assert first.push() and second.push()
+        assert not any(node._variants[0].is_active for node in nodes)
+
+        nodes[0].enable_variant("checkout_b")
+        _call(nodes[0], fail=False)
+        assert first.push()
+        assert nodes[0]._variants[0].is_active
+        assert second.push()
+        assert nodes[1]._variants[0].is_active
+        variant = aggregator.stats()["scenarios"]["checkout"]["checkout_b"]
+        assert (variant["active"], variant["window_calls"], variant["calls"]) == (True, 1, 13)
+
+        aggregator._variants[("checkout", "checkout_b")].active = False
+        assert second.push()
+        assert not nodes[1]._variants[0].is_active
+        aggregator.enable("checkout", "checkout_b")
+        assert second.push()
+        assert nodes[1]._variants[0].is_active
+    finally:
+        first.close()
+        second.close()
+        aggregator.stop()
+
+
+def test_unreachable_aggregator_keeps_summaries(null_exporter) -> None:
+    """Test summaries of a failed push are sent with the next successful one"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    client = AggregatorClient(("127.0.0.1", port), interval=3600, timeout=0.5)
+    node = _node(client, null_exporter)
+    for _ in range(3):
+        _call(node, fail=False)
+    assert not client.push()
+
+    aggregator = Aggregator()
+    aggregator.start(("127.0.0.1", port))
+    try:
+        _call(node, fail=True)
+        assert client.push()
+        variant = aggregator.stats()["scenarios"]["checkout"]["checkout_b"]
+        assert (variant["calls"], variant["errors"]) == (4, 1)
+        assert variant["p50"] > 0
+    finally:
+        client.close()
+        aggregator.stop()
+
+
+def test_push_frame_round_trip() -> None:
+    """Test push frames encode counters, thresholds and latency buckets compactly"""
+    summary = Summary(calls=5, errors=2, threshold=0.25)
+    summary.buckets[40] += 5
+    frame = encode_push("node", {("checkout", "checkout_b"): summary}, 1_700_000_000)
+    node, summaries = decode_push(frame[HEADER.size :], 1)
+    assert node == "node"
+    assert summaries == {("checkout", "checkout_b"): summary}
+    assert len(frame) == HEADER.size + 61
+
+    assert parse_address("127.0.0.1:7070") == ("127.0.0.1", 7070)
+    assert parse_address("unix:/run/abtest.sock") == "/run/abtest.sock"
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_stats_read_under_lock() -> None:
+    """Test stats() reads the window buckets that concurrent pushes mutate only while holding the lock"""
+    aggregator = Aggregator(window=60)
+    aggregator.merge("node", {("checkout", "checkout_b"): Summary(calls=4, errors=1, threshold=0.5)}, 1000)
+    state = aggregator._variants[("checkout", "checkout_b")]
+
+    class GuardedSeconds(dict):
+        def items(self):
+            assert aggregator._lock.locked()
+            return super().items()
+
+    state.seconds = GuardedSeconds(state.seconds)
+    variant = aggregator.stats(window=60, now=1001)["scenarios"]["checkout"]["checkout_b"]
+    assert variant["window_calls"] == 4
+    assert variant["window_error_rate"] == 0.25
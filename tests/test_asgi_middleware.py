@@ -0,0 +1,113 @@
+from collections import Counter
+
+import pytest
+from fastapi import FastAPI, Depends
+from fastapi.testclient import TestClient
+
+from fast_abtest import ab_test, Context, Exporter
+from fast_abtest.asgi import ExperimentMiddleware, header_key, cookie_key, query_key
+
+
+class VariantsMetric:
+    def __init__(self, exporter: Exporter) -> None:
+        self.variants: Counter[str] = Counter()
+
+    def on_start(self, context: Context) -> Context:
+        return context
+
+    def on_end(self, context: Context, is_error: bool) -> None:
+        self.variants[context.variant] += 1
+
+
+resolved: Counter[str] = Counter()
+
+
+def database() -> str:
+    resolved["database"] += 1
+    return "db"
+
+
+def cache() -> str:
+    resolved["cache"] += 1
+    return "cache"
+
+
+@pytest.fixture
+def routed_app(null_exporter):
+    resolved.clear()
+    app = FastAPI()
+
+    @ab_test(metrics=[VariantsMetric], exporter=null_exporter, routed=True)
+    async def feed(item_id: int, source: str = Depends(database)):
+        return {"variant": "A", "item_id": item_id, "source": source}
+
+    @feed.register_variant(traffic_percent=50)
+    def feed_b(item_id: int, limit: int = 10, source: str = Depends(cache)):
+        return {"variant": "B", "item_id": item_id, "source": source, "limit": limit}
+
+    feed.mount(app, "/feed/{item_id}")
+    app.add_middleware(ExperimentMiddleware, experiments=[feed], key=header_key("x-user-id"))
+    return app, feed
+
+
+def test_only_selected_variant_dependencies_resolved(routed_app) -> None:
+    """Test each request resolves the dependency graph of its variant only"""
+    app, feed = routed_app
+    client = TestClient(app)
+
+    responses = [client.get("/feed/7", headers={"x-user-id": str(user)}).json() for user in range(200)]
+
+    variants = Counter(response["variant"] for response in responses)
+    assert variants["A"] == resolved["database"]
+    assert variants["B"] == resolved["cache"]
+    assert 70 <= variants["B"] <= 130
+    assert all(response["item_id"] == 7 for response in responses)
+    assert all(response["limit"] == 10 for response in responses if response["variant"] == "B")
+    metric = feed._metric_recorder._metrics[0]
+    assert metric.variants == Counter({"feed": variants["A"], "feed_b": variants["B"]})
+
+
+def test_assignment_is_sticky_per_key(routed_app) -> None:
+    """Test a header key always routes to the same variant"""
+    app, _ = routed_app
+    client = TestClient(app)
+
+    first = client.get("/feed/1", headers={"x-user-id": "user-42"}).json()["variant"]
+    assert all(client.get("/feed/1", headers={"x-user-id": "user-42"}).json()["variant"] == first for _ in range(10))
+
+
+def test_hidden_variant_routes_not_documented(routed_app) -> None:
+    """Test only the public path appears in the OpenAPI schema"""
+    app, _ = routed_app
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert list(paths) == ["/feed/{item_id}"]
+
+
+def test_routed_variants_skip_signature_validation(null_exporter) -> None:
+    """Test routed variants may differ in signature and sync type"""
+
+    @ab_test(metrics=[], exporter=null_exporter, routed=True)
+    async def handler(a: int):
+        return a
+
+    @handler.register_variant(traffic_percent=10)
+    def handler_b(a: int, b: str = Depends(cache)):
+        return a
+
+    assert len(handler._variants) == 1
+    with pytest.raises(TypeError, match="mixes sync and async"):
+        handler(1)
+    with pytest.raises(TypeError, match="mixes sync and async"):
+        handler.map([1])
+
+
+def test_key_extractors() -> None:
+    """Test header, cookie and query key extraction from the ASGI scope"""
+    scope = {
+        "headers": [(b"x-user-id", b"42"), (b"cookie", b"session=abc; theme=dark")],
+        "query_string": b"user_id=7&x=1",
+    }
+    assert header_key("X-User-Id")(scope) == "42"
+    assert cookie_key("session")(scope) == "abc"
+    assert query_key("user_id")(scope) == "7"
+    assert cookie_key("missing")(scope) is None
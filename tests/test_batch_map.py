@@ -0,0 +1,132 @@
+import asyncio
+from random import seed
+
+import pytest
+
+from fast_abtest import ab_test, experiment_context, Metric
+
+
+@pytest.fixture
+def reset_random():
+    seed(42)
+
+
+def _make_scorer(exporter):
+    @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.LATENCY], exporter=exporter)
+    def score(x: int) -> tuple[str, int]:
+        return "A", x
+
+    @score.register_variant(traffic_percent=30)
+    def score_b(x: int) -> tuple[str, int]:
+        return "B", x
+
+    return score
+
+
+def test_map_keeps_order_and_weights(reset_random, memory_exporter) -> None:
+    """Test batch results keep input order and follow traffic weights"""
+    score = _make_scorer(memory_exporter)
+
+    results = score.map(range(1000))
+
+    assert [x for _, x in results] == list(range(1000))
+    share_b = sum(1 for variant, _ in results if variant == "B") / 1000
+    assert 0.25 <= share_b <= 0.35
+    assert score._variants[0].call_count == sum(1 for variant, _ in results if variant == "B")
+
+
+def test_metrics_recorded_once_per_batch(reset_random, exporter_of, memory_exporter) -> None:
+    """Test each variant batch records metrics once with aggregate call counts"""
+    score = _make_scorer(memory_exporter)
+
+    score.map(range(500))
+
+    exporter = exporter_of(score)
+    calls = {label.variant: value for label, value in exporter.recorded if label.metric == "CallsMetric"}
+    latencies = [label for label, _ in exporter.recorded if label.metric == "LatencyMetric"]
+    assert set(calls) == {"score", "score_b"}
+    assert sum(calls.values()) == 500
+    assert len(latencies) == 2
+
+
+def test_batch_handler_used_per_variant(memory_exporter) -> None:
+    """Test registered batch handlers receive whole variant batches"""
+    score = _make_scorer(memory_exporter)
+    batches: list[list[int]] = []
+
+    @score.register_batch("score_b")
+    def score_b_batch(items: list[int]) -> list[tuple[str, int]]:
+        batches.append(items)
+        return [("B-batch", x) for x in items]
+
+    results = score.map(range(200), key=lambda x: f"user-{x}")
+
+    assert len(batches) == 1
+    assert {variant for variant, _ in results} == {"A", "B-batch"}
+    assert sorted(batches[0]) == [x for variant, x in results if variant == "B-batch"]
+
+
+def test_key_assignment_matches_single_calls(memory_exporter) -> None:
+    """Test keyed batches assign items like experiment_context(key=...)"""
+    score = _make_scorer(memory_exporter)
+
+    batched = score.map(range(100), key=lambda x: f"user-{x}")
+    for x in range(100):
+        with experiment_context(key=f"user-{x}"):
+            assert score(x) == batched[x]
+
+
+def test_batch_handler_result_length_validated(memory_exporter) -> None:
+    """Test a batch handler must return one result per item"""
+    score = _make_scorer(memory_exporter)
+
+    def broken(items: list[int]) -> list[tuple[str, int]]:
+        return []
+
+    score.register_batch()(broken)
+    score.register_batch("score_b")(broken)
+
+    with pytest.raises(ValueError, match="results for"):
+        score.map([1, 2, 3])
+
+
+def test_amap(reset_random, memory_exporter) -> None:
+    """Test the async batch API with coroutine variants"""
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    async def infer(x: int) -> int:
+        return x
+
+    @infer.register_variant(traffic_percent=50)
+    async def infer_b(x: int) -> int:
+        return -x
+
+    @infer.register_batch("infer_b")
+    async def infer_b_batch(items: list[int]) -> list[int]:
+        return [-x for x in items]
+
+    results = asyncio.run(infer.amap(range(100)))
+    assert [abs(x) for x in results] == list(range(100))
+    assert any(x < 0 for x in results)
+
+
+def test_wrong_batch_mode_is_rejected(memory_exporter) -> None:
+    """Test map() on a coroutine scenario and amap() on a sync one fail before any call is counted"""
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    async def infer(x: int) -> int:
+        return x
+
+    @infer.register_variant(traffic_percent=50)
+    async def infer_b(x: int) -> int:
+        return -x
+
+    with pytest.raises(TypeError, match="use amap"):
+        infer.map([1, 2, 3])
+
+    score = _make_scorer(memory_exporter)
+    with pytest.raises(TypeError, match="use map"):
+        asyncio.run(score.amap([1, 2, 3]))
+
+    assert infer._variants[0].call_count == 0
+    assert score._variants[0].call_count == 0
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import pytest
+
+from fast_abtest import ab_test, Metric
+
+
+def test_threads_share_one_execution(memory_exporter, exporter_of) -> None:
+    """Test concurrent threaded calls with equal arguments run the handler once"""
+    executions = []
+    lock = Lock()
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.COALESCED_WAITERS], exporter=memory_exporter, coalesce=True)
+    def item(item_id: int, expand: bool = False) -> dict:
+        with lock:
+            executions.append(item_id)
+        time.sleep(0.1)
+        return {"id": item_id}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: item(42), range(8)))
+
+    assert results == [{"id": 42}] * 8
+    assert executions == [42]
+    assert exporter_of(item).totals() == {"CallsMetric": 8, "CoalescedWaitersMetric": 7}
+
+    item(item_id=42, expand=False)
+    assert executions == [42, 42]
+
+
+def test_coroutines_share_one_execution_and_exception(memory_exporter, exporter_of) -> None:
+    """Test concurrent coroutines share the result or the exception of the in-flight call"""
+    executions = []
+
+    @ab_test(metrics=[Metric.COALESCED_WAITERS], exporter=memory_exporter, coalesce=True)
+    async def item(item_id: int) -> int:
+        executions.append(item_id)
+        await asyncio.sleep(0.05)
+        if item_id < 0:
+            raise ValueError(item_id)
+        return item_id
+
+    async def main() -> list:
+        return await asyncio.gather(
+            *(item(i % 2) for i in range(10)), *(item(-1) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert results[:10] == [0, 1] * 5
+    assert all(isinstance(result, ValueError) for result in results[10:])
+    assert sorted(executions) == [-1, 0, 1]
+    assert exporter_of(item).totals() == {"CoalescedWaitersMetric": 10}
+
+
+def test_variant_can_opt_out(memory_exporter) -> None:
+    """Test register_variant(coalesce=False) overrides the scenario setting"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, coalesce=True)
+    def handler(x: int) -> int:
+        return x
+
+    @handler.register_variant(traffic_percent=10, coalesce=False)
+    def handler_b(x: int) -> int:
+        return x
+
+    assert handler._main_scenario.coalescer is not None
+    assert handler._variants[0].coalescer is None
+
+
+@pytest.mark.parametrize("value", [[1, 2], {"a": [1]}])
+def test_unhashable_arguments_are_normalized(value, memory_exporter) -> None:
+    """Test list/dict arguments are normalized into coalescing keys"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, coalesce=True)
+    def handler(x) -> object:
+        return x
+
+    assert handler(value) == value
+
+
+def test_cancelled_leader_hands_over_to_a_waiter(memory_exporter, exporter_of) -> None:
+    """Test cancelling the leader does not cancel the coroutines waiting for its result"""
+    executions = []
+
+    @ab_test(metrics=[Metric.COALESCED_WAITERS], exporter=memory_exporter, coalesce=True)
+    async def item(item_id: int) -> int:
+        executions.append(item_id)
+        await asyncio.sleep(0.02)
+        return item_id
+
+    async def main() -> list[int]:
+        leader = asyncio.create_task(item(3))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(item(3)) for _ in range(4)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == [3] * 4
+    assert executions == [3, 3]
+    assert exporter_of(item).totals() == {"CoalescedWaitersMetric": 3}
@@ -0,0 +1,142 @@
+import asyncio
+from collections import Counter
+
+import fast_abtest.experiment_scope
+from fast_abtest import ab_test, experiment_context, current_experiment_context, Context, Exporter
+
+
+class AssignmentsMetric:
+    def __init__(self, exporter: Exporter) -> None:
+        self.assignments: list[dict[str, str]] = []
+
+    def on_start(self, context: Context) -> Context:
+        return context
+
+    def on_end(self, context: Context, is_error: bool) -> None:
+        self.assignments.append(dict(context.extra["assignments"]))
+
+
+def _make_nested(exporter):
+    @ab_test(metrics=[AssignmentsMetric], exporter=exporter)
+    def inner() -> str:
+        return "inner_a"
+
+    @inner.register_variant(traffic_percent=50)
+    def inner_b() -> str:
+        return "inner_b"
+
+    @ab_test(metrics=[AssignmentsMetric], exporter=exporter)
+    def outer() -> list[str]:
+        return [inner(), inner()]
+
+    @outer.register_variant(traffic_percent=50)
+    def outer_b() -> list[str]:
+        return [inner(), inner()]
+
+    return outer, inner
+
+
+def test_nested_calls_share_assignment(null_exporter) -> None:
+    """Test a nested experiment keeps one variant per request"""
+    outer, _ = _make_nested(null_exporter)
+
+    for _ in range(50):
+        first, second = outer()
+        assert first == second
+
+    assert current_experiment_context() is None
+
+
+def test_recursive_call_is_reassigned(null_exporter) -> None:
+    """Test a variant calling its own scenario is assigned again instead of recursing forever"""
+
+    @ab_test(metrics=[], exporter=null_exporter)
+    def endpoint() -> str:
+        return "a"
+
+    @endpoint.register_variant(traffic_percent=50)
+    def endpoint_b() -> str:
+        return endpoint()
+
+    assert {endpoint() for _ in range(20)} == {"a"}
+
+
+def test_implicit_context_is_reset_after_an_error(null_exporter) -> None:
+    """Test the context opened by a top-level call does not leak when the handler raises"""
+
+    @ab_test(metrics=[], exporter=null_exporter)
+    def failing() -> None:
+        assert current_experiment_context() is not None
+        raise ValueError
+
+    for _ in range(3):
+        try:
+            failing()
+        except ValueError:
+            pass
+        assert current_experiment_context() is None
+
+
+def test_full_assignment_set_in_context(null_exporter) -> None:
+    """Test the outer metric sees assignments of nested experiments"""
+    outer, inner = _make_nested(null_exporter)
+
+    with experiment_context(key="user-1") as experiments:
+        outer()
+
+    metric = outer._metric_recorder._metrics[0]
+    assert set(metric.assignments[-1]) == {"outer", "inner"}
+    assert metric.assignments[-1] == experiments.assignments
+
+
+def test_key_assignment_is_deterministic(null_exporter) -> None:
+    """Test the same key always lands in the same variants"""
+    outer, _ = _make_nested(null_exporter)
+
+    def run(key: str) -> dict[str, str]:
+        with experiment_context(key=key) as experiments:
+            outer()
+        return dict(experiments.assignments)
+
+    assert all(run("user-42") == run("user-42") for _ in range(10))
+
+    split = Counter(run(f"user-{i}")["outer"] for i in range(2000))
+    assert 900 <= split["outer_b"] <= 1100
+
+
+def test_key_hashed_once_per_request(monkeypatch, null_exporter) -> None:
+    """Test the assignment key is hashed once for all experiments in a request"""
+    outer, _ = _make_nested(null_exporter)
+    calls = 0
+    original = fast_abtest.experiment_scope.stable_hash
+
+    def counting_hash(value):
+        nonlocal calls
+        calls += 1
+        return original(value)
+
+    monkeypatch.setattr(fast_abtest.experiment_scope, "stable_hash", counting_hash)
+    with experiment_context(key="user-7"):
+        outer()
+    assert calls == 1
+
+
+def test_async_context_propagation(null_exporter) -> None:
+    """Test nested coroutine experiments share the request context"""
+
+    @ab_test(metrics=[], exporter=null_exporter)
+    async def leaf() -> str:
+        return "a"
+
+    @leaf.register_variant(traffic_percent=50)
+    async def leaf_b() -> str:
+        return "b"
+
+    @ab_test(metrics=[], exporter=null_exporter)
+    async def root() -> set[str]:
+        return {await leaf() for _ in range(10)}
+
+    async def main() -> list[set[str]]:
+        return [await root() for _ in range(20)]
+
+    assert all(len(result) == 1 for result in asyncio.run(main()))
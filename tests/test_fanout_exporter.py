@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from fast_abtest import ab_test, Metric, MetricLabel
+from fast_abtest.exporter.fanout import FanOutExporter
+
+
+class BatchExporter:
+    def __init__(self, metrics, func_name, labelnames, port) -> None:
+        self.recorded: list[MetricLabel] = []
+
+    async def export(self, records) -> None:
+        await asyncio.sleep(0)
+        self.recorded.extend(label for label, _ in records)
+
+
+def test_records_dispatched_to_all_exporters(memory_exporter) -> None:
+    """Test each label is built once and reaches every exporter, sync and async"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.LATENCY], exporters=[memory_exporter, memory_exporter, BatchExporter])
+    def handler() -> str:
+        return "a"
+
+    for _ in range(10):
+        handler()
+    fanout = handler._fanout
+    fanout.flush()
+
+    first, second, batch = fanout.exporters
+    assert len(first.recorded) == len(second.recorded) == len(batch.recorded) == 20
+    assert all(a is b is c for (a, _), (b, _), c in zip(first.recorded, second.recorded, batch.recorded))
+    stats = handler.exporter_stats()
+    assert set(stats) == {"MemoryExporter", "MemoryExporter-1", "BatchExporter"}
+    assert stats["BatchExporter"]["records"] == 20
+    fanout.close()
+
+
+def test_slow_and_failing_exporters_are_isolated(memory_exporter) -> None:
+    """Test a blocked exporter delays neither the calls nor the other exporters, failures are counted"""
+
+    class SlowExporter(memory_exporter):
+        release = threading.Event()
+
+        def record(self, label: MetricLabel, value: float | int) -> None:
+            self.release.wait(5)
+            super().record(label, value)
+
+    class FailingExporter(memory_exporter):
+        def record(self, label: MetricLabel, value: float | int) -> None:
+            raise ConnectionError("event log is down")
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporters=[SlowExporter, FailingExporter, memory_exporter])
+    def handler() -> str:
+        return "a"
+
+    started = time.perf_counter()
+    for _ in range(50):
+        handler()
+    assert time.perf_counter() - started < 1
+
+    slow, _, memory = handler._fanout.exporters
+    deadline = time.monotonic() + 5
+    while len(memory.recorded) < 50 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(memory.recorded) == 50
+    assert slow.recorded == []
+
+    SlowExporter.release.set()
+    handler._fanout.flush()
+    stats = handler.exporter_stats()
+    assert stats["FailingExporter"]["errors"] == 50
+    assert stats["SlowExporter"]["records"] == 50
+    assert stats["SlowExporter"]["queued"] == 0
+    handler._fanout.close()
+
+
+def test_close_exports_queued_records_and_counts_drops(memory_exporter) -> None:
+    """Test records queued at close are exported and concurrent drops are all counted"""
+
+    class GatedExporter(memory_exporter):
+        release = threading.Event()
+
+        def record(self, label: MetricLabel, value: float | int) -> None:
+            self.release.wait(5)
+            super().record(label, value)
+
+    exporter = GatedExporter([], "handler", [], 0)
+    fanout = FanOutExporter([exporter], max_queue=100)
+    label = MetricLabel(metric="CallsMetric", func="handler", variant="handler", is_error=False)
+
+    threads = [threading.Thread(target=lambda: [fanout.record(label, 1) for _ in range(1000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    GatedExporter.release.set()
+    fanout.close()
+
+    stats = fanout.stats()["GatedExporter"]
+    assert stats["queued"] == 0
+    assert len(exporter.recorded) + stats["dropped"] == 4000
+    assert len(exporter.recorded) == stats["records"]
+
+
+def test_exporter_stats_require_fanout(memory_exporter) -> None:
+    """Test exporter_stats() is only available with exporters=[...]"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=memory_exporter)
+    def handler() -> str:
+        return "a"
+
+    with pytest.raises(RuntimeError):
+        handler.exporter_stats()
+    with pytest.raises(ValueError):
+        ab_test(metrics=[Metric.CALLS_TOTAL], exporters=[])(lambda: None)
@@ -0,0 +1,72 @@
+import gc
+from unittest.mock import patch
+
+from fast_abtest import ab_test, ABTestConfig, ConfigManager, Metric
+
+GC_METRICS = [Metric.LATENCY, Metric.GC_COLLECTIONS, Metric.GC_PAUSE_LATENCY]
+
+
+def _garbage() -> list:
+    cycles = []
+    for _ in range(50_000):
+        node: list = []
+        node.append(node)
+        cycles.append(node)
+    return cycles
+
+
+def test_collections_are_attributed_to_running_variant(memory_exporter, exporter_of) -> None:
+    """Test collections triggered inside a variant are exported for that variant only"""
+
+    @ab_test(metrics=GC_METRICS, exporter=memory_exporter)
+    def allocate(collect: bool) -> None:
+        if collect:
+            gc.collect()
+
+    allocate(False)
+    gc.collect()
+    allocate(True)
+
+    exporter = exporter_of(allocate)
+    assert exporter.values("GcCollectionsMetric") == [0, 1]
+    idle, collected = exporter.values("GcPauseLatencyMetric")
+    assert idle == 0.0
+    assert collected > 0
+
+
+def test_nested_scenarios_share_pause(memory_exporter, exporter_of) -> None:
+    """Test a collection in a nested scenario is attributed to the outer call as well"""
+
+    @ab_test(metrics=GC_METRICS, exporter=memory_exporter)
+    def inner() -> None:
+        gc.collect()
+
+    @ab_test(metrics=GC_METRICS, exporter=memory_exporter)
+    def outer() -> None:
+        inner()
+
+    outer()
+
+    assert exporter_of(inner).variants("GcCollectionsMetric") == ["inner"]
+    assert exporter_of(inner).values("GcCollectionsMetric") == [1]
+    assert exporter_of(outer).variants("GcCollectionsMetric") == ["outer"]
+    assert exporter_of(outer).values("GcCollectionsMetric") == [1]
+
+
+def test_gc_pause_excluded_from_latency(memory_exporter, exporter_of) -> None:
+    """Test ABTestConfig.exclude_gc_from_latency subtracts pauses from the latency metric"""
+    config = ABTestConfig(exclude_gc_from_latency=True)
+    with patch.object(ConfigManager, "get_config", return_value=config):
+
+        @ab_test(metrics=GC_METRICS, exporter=memory_exporter)
+        def collect(garbage: list) -> None:
+            del garbage[:]
+            gc.collect()
+
+    collect([_garbage()])
+
+    exporter = exporter_of(collect)
+    [latency] = exporter.values("LatencyMetric")
+    [pause] = exporter.values("GcPauseLatencyMetric")
+    assert pause > 0
+    assert latency < pause
@@ -0,0 +1,117 @@
+import asyncio
+import os
+from timeit import timeit
+
+import pytest
+
+from fast_abtest import ab_test, CacheConfig, Metric
+from fast_abtest.kill_switch import KillSwitch
+
+
+def _scenario(exporter):
+    @ab_test(metrics=[Metric.LATENCY, Metric.CALLS_TOTAL], exporter=exporter)
+    def handler(item: int = 0) -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=99)
+    def handler_b(item: int = 0) -> str:
+        return "b"
+
+    return handler
+
+
+def test_killed_scenario_serves_winner_without_metrics(exporter_of, memory_exporter) -> None:
+    """Test kill() routes every call to the winner and skips recording"""
+    handler = _scenario(memory_exporter)
+    handler.kill("handler_b")
+
+    assert {handler() for _ in range(50)} == {"b"}
+    assert exporter_of(handler).recorded == []
+    assert handler.map(range(10)) == ["b"] * 10
+
+    handler.revive()
+    handler()
+    assert exporter_of(handler).recorded
+
+    with pytest.raises(ValueError):
+        handler.kill("unknown")
+
+
+def test_global_kill_switch(memory_exporter) -> None:
+    """Test the global switch sends all scenarios to their main handler, except explicit winners"""
+    first, second = _scenario(memory_exporter), _scenario(memory_exporter)
+    second.kill("handler_b")
+    KillSwitch.engage()
+    try:
+        assert {first() for _ in range(50)} == {"a"}
+        assert {second() for _ in range(50)} == {"b"}
+    finally:
+        KillSwitch.release()
+    assert "b" in {first() for _ in range(50)}
+
+
+def test_kill_switch_from_environment(monkeypatch, memory_exporter) -> None:
+    """Test ABTEST_KILL_SWITCH kills the listed scenarios at start-up"""
+    monkeypatch.setenv(KillSwitch.ENV, "other,handler")
+    handler = _scenario(memory_exporter)
+    assert {handler() for _ in range(50)} == {"a"}
+
+
+def test_killed_async_scenario(memory_exporter) -> None:
+    """Test killed coroutine scenarios return the main handler coroutine"""
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    async def handler() -> str:
+        return "a"
+
+    handler.kill()
+    assert asyncio.run(handler()) == "a"
+
+
+def test_killed_call_skips_hooks_and_exporters(exporter_of, memory_exporter) -> None:
+    """Test a killed call runs no metric hook and never reaches the exporter"""
+
+    class CountingHook:
+        calls = 0
+
+        def on_start(self, context):
+            CountingHook.calls += 1
+            return context
+
+        def on_end(self, context, is_error: bool) -> None:
+            CountingHook.calls += 1
+
+    handler = _scenario(memory_exporter)
+    handler._metric_recorder.add(CountingHook())
+    handler.kill()
+
+    assert {handler() for _ in range(100)} == {"a"}
+    assert CountingHook.calls == 0
+    assert exporter_of(handler).recorded == []
+
+
+def test_killed_winner_keeps_its_cache(memory_exporter, exporter_of) -> None:
+    """Test the winner is still served through its cache after kill()"""
+    calls = 0
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=memory_exporter, cache=CacheConfig())
+    def lookup(user_id: int) -> int:
+        nonlocal calls
+        calls += 1
+        return user_id
+
+    lookup.kill()
+    assert [lookup(1) for _ in range(5)] == [1] * 5
+    assert calls == 1
+    assert exporter_of(lookup).recorded == []
+
+
+@pytest.mark.skipif(os.getenv("ABTEST_BENCHMARK") != "1", reason="timing benchmark, run with ABTEST_BENCHMARK=1")
+def test_kill_switch_overhead_benchmark(memory_exporter) -> None:
+    """Benchmark: a killed call costs a fraction of a recorded call"""
+    active, killed = _scenario(memory_exporter), _scenario(memory_exporter)
+    killed.kill()
+
+    active_time = min(timeit(active, number=2000) for _ in range(3))
+    killed_time = min(timeit(killed, number=2000) for _ in range(3))
+    assert killed_time < active_time / 3
@@ -0,0 +1,113 @@
+import time
+from logging import getLogger
+from unittest.mock import MagicMock
+
+import pytest
+
+from fast_abtest import ab_test, LatencyGuardrail
+
+
+def _scenario(exporter, guardrail: LatencyGuardrail | float, logger=getLogger(__name__), profile: bool = False):
+    @ab_test(metrics=[], exporter=exporter, logger=logger, profile=profile)
+    def handler(slow: bool) -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=50, latency_threshold=guardrail)
+    def handler_b(slow: bool) -> str:
+        if slow:
+            time.sleep(0.003)
+        return "b"
+
+    return handler
+
+
+def _guard(scenario):
+    [guard] = scenario._latency_guards.guards
+    guard.stop()
+    return guard
+
+
+def test_slow_variant_is_disabled(null_exporter) -> None:
+    """Test a variant slower than the allowed regression stops receiving traffic"""
+    logger = getLogger("guardrail")
+    logger.warning = MagicMock()
+    handler = _scenario(
+        null_exporter, LatencyGuardrail(max_regression=0.5, quantile=0.9, interval=3600, min_calls=20), logger
+    )
+    guard = _guard(handler)
+
+    for _ in range(200):
+        handler(True)
+
+    assert guard.evaluate()
+    assert not handler._variants[0].is_active
+    assert "handler_b disabled by latency regression" in logger.warning.call_args.args[0]
+    assert {handler(True) for _ in range(20)} == {"a"}
+
+
+def test_similar_latency_is_kept(null_exporter) -> None:
+    """Test variants within the allowed regression keep their traffic"""
+    handler = _scenario(null_exporter, LatencyGuardrail(max_regression=50, interval=3600, min_calls=20))
+    guard = _guard(handler)
+
+    for _ in range(400):
+        handler(False)
+
+    assert not guard.evaluate()
+    assert handler._variants[0].is_active
+
+
+def test_regression_below_min_delta_is_kept(null_exporter) -> None:
+    """Test a relative regression smaller than the absolute minimum difference is ignored"""
+    handler = _scenario(
+        null_exporter, LatencyGuardrail(max_regression=0.5, quantile=0.9, interval=3600, min_calls=20, min_delta=1)
+    )
+    guard = _guard(handler)
+
+    for _ in range(200):
+        handler(True)
+
+    assert not guard.evaluate()
+    assert handler._variants[0].is_active
+
+
+def test_guard_is_timed_by_profiler(null_exporter) -> None:
+    """Test the guard hook runs inside the profiler markers"""
+    handler = _scenario(null_exporter, 1.0, profile=True)
+    _guard(handler)
+    metrics = handler._metric_recorder._metrics
+    assert metrics.index(handler._latency_guards) < len(metrics) - 1
+    assert getattr(metrics[-1], "CLOSING", False)
+
+
+def test_downweight_and_rolling_window(null_exporter) -> None:
+    """Test down-weighting halves the share and old windows stop counting"""
+    guardrail = LatencyGuardrail(max_regression=0.5, quantile=0.9, interval=3600, min_calls=20, action="downweight")
+    handler = _scenario(null_exporter, guardrail)
+    guard = _guard(handler)
+    for _ in range(200):
+        handler(True)
+
+    assert guard.evaluate()
+    assert handler._variants[0].traffic_percent == 25
+    assert handler._main_scenario.traffic_percent == 75
+
+    # Calls made at the previous share are discarded: no halving on every interval.
+    assert not guard.evaluate()
+    assert handler._variants[0].traffic_percent == 25
+
+    for _ in range(300):
+        handler(True)
+    assert guard.evaluate()
+    assert handler._variants[0].traffic_percent == 12
+
+
+def test_guardrail_validation(null_exporter) -> None:
+    """Test invalid guardrail settings are rejected"""
+    with pytest.raises(ValueError):
+        LatencyGuardrail(max_regression=0)
+    with pytest.raises(ValueError):
+        LatencyGuardrail(max_regression=1, action="drop")
+    with pytest.raises(ValueError):
+        LatencyGuardrail(max_regression=1, min_delta=-1)
+    assert isinstance(_guard(_scenario(null_exporter, 1.0))._config, LatencyGuardrail)
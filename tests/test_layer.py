@@ -0,0 +1,86 @@
+from collections import Counter
+
+import pytest
+
+from fast_abtest import ab_test, experiment_context, Layer
+
+
+def _make_layer_experiments(layer: Layer, exporter):
+    @ab_test(metrics=[], exporter=exporter, layer=layer, layer_traffic_percent=40)
+    def pricing() -> str:
+        return "pricing_a"
+
+    @pricing.register_variant(traffic_percent=50)
+    def pricing_b() -> str:
+        return "pricing_b"
+
+    @ab_test(metrics=[], exporter=exporter, layer=layer, layer_traffic_percent=60)
+    def shipping() -> str:
+        return "shipping_a"
+
+    @shipping.register_variant(traffic_percent=50)
+    def shipping_b() -> str:
+        return "shipping_b"
+
+    return pricing, shipping
+
+
+def test_layer_experiments_are_mutually_exclusive(null_exporter) -> None:
+    """Test a user is part of at most one experiment of a layer"""
+    layer = Layer("checkout")
+    pricing, shipping = _make_layer_experiments(layer, null_exporter)
+    owners: Counter[str] = Counter()
+
+    for user_id in range(3000):
+        with experiment_context(key=user_id) as experiments:
+            pricing()
+            shipping()
+        assert len(experiments.assignments) == 1
+        owners.update(experiments.assignments.keys())
+
+    assert 1080 <= owners["pricing"] <= 1320
+    assert 1620 <= owners["shipping"] <= 1980
+
+
+def test_excluded_requests_use_main_handler(null_exporter) -> None:
+    """Test requests outside an experiment's slice get its main variant"""
+    layer = Layer("search")
+    pricing, shipping = _make_layer_experiments(layer, null_exporter)
+    results: Counter[str] = Counter()
+
+    for user_id in range(2000):
+        with experiment_context(key=user_id) as experiments:
+            result = pricing()
+        if layer.experiment_for(experiments) != "pricing":
+            assert result == "pricing_a"
+            assert "pricing" not in experiments.assignments
+        results[result] += 1
+
+    assert 300 <= results["pricing_b"] <= 500
+
+
+def test_layer_assignment_is_deterministic(null_exporter) -> None:
+    """Test the same key resolves to the same experiment and variant"""
+    layer = Layer("feed")
+    pricing, shipping = _make_layer_experiments(layer, null_exporter)
+
+    def run() -> dict[str, str]:
+        with experiment_context(key="user-1") as experiments:
+            pricing()
+            shipping()
+        return dict(experiments.assignments)
+
+    assert all(run() == run() for _ in range(10))
+
+
+def test_layer_traffic_validation(null_exporter) -> None:
+    """Test the total share of a layer cannot exceed 100 percent"""
+    layer = Layer("full")
+
+    @ab_test(metrics=[], exporter=null_exporter, layer=layer, layer_traffic_percent=70)
+    def first() -> None: ...
+
+    with pytest.raises(ValueError, match="exceeds 100"):
+
+        @ab_test(metrics=[], exporter=null_exporter, layer=layer, layer_traffic_percent=40)
+        def second() -> None: ...
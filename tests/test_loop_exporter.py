@@ -0,0 +1,121 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from fast_abtest import ab_test, ABTestConfig, ConfigManager, Metric, MetricLabel
+from fast_abtest.exporter.loop import LoopExporter
+
+
+class ThreadRecordingExporter:
+    def __init__(self, metrics, func_name, labelnames, port) -> None:
+        self.recorded: list[tuple[MetricLabel, int]] = []
+
+    def record(self, label: MetricLabel, value: float | int) -> None:
+        self.recorded.append((label, threading.get_ident()))
+
+
+class BatchExporter:
+    def __init__(self, metrics, func_name, labelnames, port) -> None:
+        self.batches: list[list[str]] = []
+
+    async def export(self, records) -> None:
+        await asyncio.sleep(0)
+        self.batches.append([label.metric for label, _ in records])
+
+
+def _metric(func):
+    return func._metric_recorder._metrics[0]
+
+
+def test_coroutine_scenario_buffers_records_on_loop() -> None:
+    """Test records of coroutine scenarios are exported off the loop, at the latest at loop shutdown"""
+
+    with patch.object(ConfigManager, "get_config", return_value=ABTestConfig(async_export=True)):
+
+        @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.LATENCY], exporter=ThreadRecordingExporter)
+        async def handler() -> str:
+            return "a"
+
+    exporter = _metric(handler)._exporter
+    assert isinstance(exporter, LoopExporter)
+
+    async def main() -> int:
+        for _ in range(10):
+            await handler()
+        return len(exporter.recorded)
+
+    assert asyncio.run(main()) == 0
+    assert len(exporter.recorded) == 20
+    assert threading.get_ident() not in {thread for _, thread in exporter.recorded}
+
+    async def flushed() -> int:
+        await handler()
+        return await exporter.flush()
+
+    assert asyncio.run(flushed()) == 2
+    assert len(exporter.recorded) == 22
+
+
+def test_async_exporter() -> None:
+    """Test AsyncExporter batches are awaited and the buffer is flushed once full"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=BatchExporter)
+    async def handler() -> str:
+        return "a"
+
+    exporter = _metric(handler)._exporter
+    exporter._max_buffer = 5
+
+    async def main() -> None:
+        for _ in range(5):
+            await handler()
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert exporter.batches == [["CallsMetric"] * 5]
+
+    with pytest.raises(TypeError):
+
+        @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=BatchExporter)
+        def sync_handler() -> str:
+            return "a"
+
+
+def test_sync_scenario_keeps_direct_export() -> None:
+    """Test sync scenarios, and coroutine scenarios by default, still call the exporter inline"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=ThreadRecordingExporter)
+    def handler() -> str:
+        return "a"
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=ThreadRecordingExporter)
+    async def async_handler() -> str:
+        return "a"
+
+    handler()
+    asyncio.run(async_handler())
+    assert [thread for _, thread in _metric(handler)._exporter.recorded] == [threading.get_ident()]
+    assert [thread for _, thread in _metric(async_handler)._exporter.recorded] == [threading.get_ident()]
+
+
+def test_counters_are_thread_safe_across_loops() -> None:
+    """Test loops running in different threads share the metric counters without lost updates"""
+    with patch.object(ConfigManager, "get_config", return_value=ABTestConfig(async_export=True)):
+
+        @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=ThreadRecordingExporter)
+        async def handler() -> str:
+            return "a"
+
+    async def main() -> None:
+        for _ in range(500):
+            await handler()
+
+    threads = [threading.Thread(target=asyncio.run, args=(main(),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert _metric(handler)._calls == 2000
@@ -0,0 +1,99 @@
+from functools import partial
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.metrics import MeterProvider  # noqa: E402
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+
+from fast_abtest import ab_test, Metric, MetricLabel, OpenTelemetryExporter  # noqa: E402
+
+
+@pytest.fixture
+def reader():
+    return InMemoryMetricReader()
+
+
+@pytest.fixture
+def exporter(reader):
+    return OpenTelemetryExporter(
+        metrics=[Metric.CALLS_TOTAL.value.__name__, Metric.LATENCY.value.__name__],
+        func_name="otel_func",
+        labelnames=["endpoint"],
+        port=9095,
+        meter_provider=MeterProvider(metric_readers=[reader]),
+    )
+
+
+def _collect(reader) -> dict:
+    points = {}
+    for resource_metrics in reader.get_metrics_data().resource_metrics:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                points[metric.name.lower()] = list(metric.data.data_points)
+    return points
+
+
+def test_counter_and_histogram_recording(exporter, reader):
+    """Test counters are summed and latency metrics become histograms"""
+    for _ in range(3):
+        exporter.record(
+            MetricLabel(metric="CallsMetric", func="otel_func", variant="A", is_error=False, tags={"endpoint": "/a"}),
+            value=1,
+        )
+    exporter.record(MetricLabel(metric="LatencyMetric", func="otel_func", variant="B", is_error=False), value=0.25)
+
+    points = _collect(reader)
+    (calls,) = points["abtest_otel_func_callsmetric"]
+    assert calls.value == 3
+    assert dict(calls.attributes) == {
+        "variant": "A",
+        "func": "otel_func",
+        "metric": "abtest_otel_func_CallsMetric",
+        "endpoint": "/a",
+    }
+    (latency,) = points["abtest_otel_func_latencymetric"]
+    assert latency.count == 1 and latency.sum == 0.25
+
+
+def test_unknown_tags_are_dropped(exporter, reader):
+    """Test only configured labelnames become attributes"""
+    exporter.record(
+        MetricLabel(metric="CallsMetric", func="otel_func", variant="A", is_error=False, tags={"user_id": "42"}),
+        value=1,
+    )
+    (calls,) = _collect(reader)["abtest_otel_func_callsmetric"]
+    assert "user_id" not in calls.attributes
+
+
+def test_span_attributes(exporter):
+    """Test experiment and variant are attached to the active span"""
+    spans = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(spans))
+
+    with provider.get_tracer(__name__).start_as_current_span("request"):
+        exporter.record(MetricLabel(metric="CallsMetric", func="otel_func", variant="B", is_error=False), value=1)
+
+    (span,) = spans.get_finished_spans()
+    assert span.attributes["abtest.experiment"] == "otel_func"
+    assert span.attributes["abtest.variant"] == "B"
+
+
+def test_decorator_integration(reader):
+    """Test the exporter works through ab_test"""
+    provider = MeterProvider(metric_readers=[reader])
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=partial(OpenTelemetryExporter, meter_provider=provider))
+    def traced() -> str:
+        return "ok"
+
+    for _ in range(5):
+        traced()
+
+    (calls,) = _collect(reader)["abtest_traced_callsmetric"]
+    assert calls.value == 5
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from fast_abtest import ab_test, Metric
+from fast_abtest.monitoring.histogram import LogHistogram
+
+
+def test_overhead_phases_are_recorded(memory_exporter) -> None:
+    """Test every internal phase is measured once per call"""
+
+    @ab_test(metrics=[Metric.LATENCY, Metric.CALLS_TOTAL], exporter=memory_exporter, profile=True)
+    def profiled(x: int) -> int:
+        return x + 1
+
+    for _ in range(50):
+        assert profiled(1) == 2
+
+    stats = profiled.overhead()
+    for phase in ("select", "recorder_start", "handler", "recorder_end"):
+        assert stats[phase]["count"] == 50
+        assert stats[phase]["p99"] >= stats[phase]["p50"] >= 0
+    assert stats["export"]["count"] == 100
+
+
+def test_overhead_exported_as_metric(memory_exporter) -> None:
+    """Test overhead phases are exported with a phase label"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, profile=True)
+    def exported() -> str:
+        return "ok"
+
+    exported()
+
+    exporter = exported._profiler._exporter
+    assert "OverheadLatency" in exporter.metrics
+    assert "phase" in exporter.labelnames
+    phases = {label.tags["phase"] for label, _ in exporter.recorded if label.metric == "OverheadLatency"}
+    assert phases == {"select", "recorder_start", "handler", "recorder_end"}
+
+
+def test_overhead_async_handler_is_awaited(memory_exporter) -> None:
+    """Test the handler phase of coroutine variants covers the awaited body"""
+
+    @ab_test(metrics=[Metric.LATENCY], exporter=memory_exporter, profile=True)
+    async def slow() -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert asyncio.run(slow()) == "done"
+    assert slow.overhead()["handler"]["p50"] >= 5_000_000
+
+
+def test_overhead_requires_profile_flag(memory_exporter) -> None:
+    """Test overhead statistics are unavailable without profiling"""
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    def plain() -> None: ...
+
+    with pytest.raises(RuntimeError, match="Profiling is disabled"):
+        plain.overhead()
+
+
+def test_log_histogram_quantiles() -> None:
+    """Test the histogram keeps quantile error within bucket precision"""
+    histogram = LogHistogram()
+    histogram.record_many(range(1, 10_001))
+
+    assert histogram.count == 10_000
+    assert histogram.max == 10_000
+    assert abs(histogram.quantile(0.5) - 5_000) / 5_000 < 0.07
+    assert abs(histogram.quantile(0.99) - 9_900) / 9_900 < 0.07
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+from fast_abtest import ab_test, experiment_context, Layer, Metric
+from fast_abtest.experiment_scope import stable_hash
+from fast_abtest.overrides import OverrideTable
+
+
+def _scenario(exporter, **kwargs):
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=exporter, **kwargs)
+    def search() -> str:
+        return "a"
+
+    @search.register_variant(traffic_percent=1)
+    def search_b() -> str:
+        return "b"
+
+    return search
+
+
+def _serve(scenario, key) -> str:
+    with experiment_context(key=key):
+        return scenario()
+
+
+def test_override_forces_variant(null_exporter) -> None:
+    """Test overridden keys ignore weights while other keys keep their hash assignment"""
+    search = _scenario(null_exporter)
+    search.override("qa-1", "search_b")
+    search.override(42, "search_b")
+
+    assert _serve(search, "qa-1") == "b"
+    assert _serve(search, "42") == "b"
+    assert search._variants[0].call_count == 2
+    assert _serve(search, None) in {"a", "b"}
+
+    search._variants[0].is_active = False
+    assert _serve(search, "qa-1") == "b"
+
+    search.override("qa-1", None)
+    assert _serve(search, "qa-1") == "a"
+
+    with pytest.raises(ValueError):
+        search.override("qa-2", "unknown")
+
+
+def test_override_bypasses_layer_exclusion(null_exporter) -> None:
+    """Test forced keys enter the experiment even outside its layer slice"""
+    search = _scenario(null_exporter, layer=Layer("override-layer"), layer_traffic_percent=1)
+    keys = [f"user-{index}" for index in range(200)]
+    excluded = next(key for key in keys if search._layer.experiment_for(_context(key)) is None)
+    search.override(excluded, "search_b")
+    assert _serve(search, excluded) == "b"
+
+
+def _context(key):
+    with experiment_context(key=key) as experiment:
+        return experiment
+
+
+def test_bulk_loading(tmp_path) -> None:
+    """Test CSV and SQLite sources load hundreds of thousands of keys"""
+    csv_path = tmp_path / "overrides.csv"
+    csv_path.write_text("# key,variant\n" + "".join(f"user-{index},search_b\n" for index in range(200_000)))
+    database = tmp_path / "overrides.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE abtest_overrides (key INTEGER, variant TEXT)")
+        connection.executemany("INSERT INTO abtest_overrides VALUES (?, 'search')", ((i,) for i in range(1000)))
+    connection.close()
+
+    table = OverrideTable()
+    assert table.load_csv(csv_path) == 200_000
+    assert table.load_sqlite(database) == 1000
+    assert len(table) == 201_000
+    assert table.get(stable_hash("user-199999")) == "search_b"
+    assert table.get(stable_hash(999)) == "search"
+    assert table.get(stable_hash("user-200000")) is None
+
+    assert table.load_sqlite(database, replace=True) == 1000
+    assert table.get(stable_hash("user-1")) is None
+
+
+def test_bulk_loading_rejects_unknown_variants(tmp_path, null_exporter) -> None:
+    """Test a source naming an unknown variant is rejected without loading any row"""
+    search = _scenario(null_exporter)
+    csv_path = tmp_path / "overrides.csv"
+    csv_path.write_text("qa-1,search_b\nqa-2,serch_b\n")
+    with pytest.raises(ValueError, match="serch_b"):
+        search.overrides.load_csv(csv_path)
+    assert len(search.overrides) == 0
+
+    database = tmp_path / "overrides.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE abtest_overrides (key INTEGER, variant TEXT)")
+        connection.executemany("INSERT INTO abtest_overrides VALUES (?, ?)", [(1, "search"), (2, "unknown")])
+    connection.close()
+    with pytest.raises(ValueError, match="unknown"):
+        search.overrides.load_sqlite(database)
+    assert len(search.overrides) == 0
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+from functools import wraps
+from unittest.mock import patch
+
+import pytest
+
+from fast_abtest import ab_test, Metric
+from fast_abtest.executor import ProcessPool, _resolve
+
+EXECUTOR_METRICS = [
+    Metric.LATENCY,
+    Metric.EXECUTOR_QUEUE_LATENCY,
+    Metric.EXECUTOR_EXECUTION_LATENCY,
+    Metric.EXECUTOR_PICKLE_LATENCY,
+    Metric.EXECUTOR_PICKLE_BYTES,
+]
+
+
+# Handlers are module attributes so that worker processes resolve them by name.
+def rerank(items: list[int]) -> tuple[int, list[int]]:
+    return os.getpid(), sorted(items)
+
+
+async def arerank(items: list[int]) -> tuple[int, list[int]]:
+    return os.getpid(), sorted(items)
+
+
+def arerank_process(items: list[int]) -> tuple[int, list[int]]:
+    if not items:
+        raise ValueError("empty")
+    return os.getpid(), sorted(items, reverse=True)
+
+
+def reversed_result(func):
+    @wraps(func)
+    def wrapper(items: list[int]) -> tuple[int, list[int]]:
+        pid, result = func(items)
+        return pid, result[::-1]
+
+    return wrapper
+
+
+def decorated(items: list[int]) -> tuple[int, list[int]]:
+    return os.getpid(), sorted(items)
+
+
+@reversed_result
+def decorated_process(items: list[int]) -> tuple[int, list[int]]:
+    return os.getpid(), sorted(items)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def process_pool():
+    ProcessPool.configure(max_workers=1, mp_context="spawn")
+    yield
+    ProcessPool.shutdown()
+
+
+@pytest.fixture(scope="module")
+def reranker(memory_exporter):
+    return ab_test(metrics=EXECUTOR_METRICS, exporter=memory_exporter, executor="process")(rerank)
+
+
+@pytest.fixture(scope="module")
+def async_reranker(memory_exporter):
+    scenario = ab_test(metrics=EXECUTOR_METRICS, exporter=memory_exporter)(arerank)
+    scenario.register_variant(traffic_percent=99, executor="process")(arerank_process)
+    return scenario
+
+
+@pytest.fixture(scope="module")
+def decorated_reranker(memory_exporter):
+    scenario = ab_test(metrics=[], exporter=memory_exporter)(decorated)
+    scenario.register_variant(traffic_percent=99, executor="process")(decorated_process)
+    return scenario
+
+
+def test_main_function_runs_in_worker_process(reranker, exporter_of) -> None:
+    """Test executor='process' runs the undecorated main function in the pool"""
+    pid, result = reranker([3, 1, 2])
+
+    assert result == [1, 2, 3]
+    assert pid != os.getpid()
+    recorded = exporter_of(reranker).by_metric()
+    assert recorded["ExecutorPickleBytesMetric"][0] > 0
+    assert recorded["ExecutorExecutionLatencyMetric"][0] >= 0
+    assert recorded["ExecutorQueueLatencyMetric"][0] >= 0
+    assert recorded["ExecutorPickleLatencyMetric"][0] > 0
+    assert recorded["LatencyMetric"][0] >= recorded["ExecutorExecutionLatencyMetric"][0]
+
+
+def test_async_caller_awaits_process_variant(async_reranker, exporter_of) -> None:
+    """Test sync process variants of an async scenario are awaited without blocking the loop"""
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main() -> list[tuple[int, list[int]]]:
+        task = asyncio.create_task(ticker())
+        results = [await async_reranker([1, 3, 2]) for _ in range(20)]
+        task.cancel()
+        return results
+
+    results = asyncio.run(main())
+
+    process_results = [result for pid, result in results if pid != os.getpid()]
+    assert process_results and all(result == [3, 2, 1] for result in process_results)
+    assert ticks > 0
+    variants = set(exporter_of(async_reranker).variants("ExecutorQueueLatencyMetric"))
+    assert variants == {"arerank_process"}
+
+
+def test_worker_exception_propagates(async_reranker) -> None:
+    """Test exceptions raised in the worker propagate to the caller"""
+
+    async def main() -> None:
+        for _ in range(50):
+            await async_reranker([])
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_process_executor_validation(reranker, memory_exporter) -> None:
+    """Test invalid executor options are rejected"""
+    with pytest.raises(ValueError):
+        reranker.register_variant(traffic_percent=10, executor="thread")
+
+    with pytest.raises(TypeError):
+
+        @reranker.register_variant(traffic_percent=10, executor="process")
+        def local_variant(items: list[int]) -> tuple[int, list[int]]:
+            return 0, items
+
+    with pytest.raises(TypeError):
+
+        @ab_test(metrics=[], exporter=memory_exporter, executor="process")
+        async def async_main() -> None: ...
+
+
+def test_decorated_variant_keeps_its_decorator(decorated_reranker) -> None:
+    """Test functools.wraps decorators of a process variant run in the worker"""
+    with patch("fast_abtest.variant_selector.randint", return_value=1):
+        pid, result = decorated_reranker([3, 1, 2])
+
+    assert result == [3, 2, 1]
+    assert pid != os.getpid()
+
+
+def test_scenario_replacing_its_main_function_is_unwrapped(reranker, monkeypatch) -> None:
+    """Test a main function replaced by its scenario in the module resolves to the function"""
+    monkeypatch.setattr(sys.modules[__name__], "rerank", reranker)
+    assert _resolve(__name__, "rerank") is reranker.__wrapped__
@@ -0,0 +1,66 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from fast_abtest import PrometheusExporter, MetricLabel, Metric
+
+CALLS = Metric.CALLS_TOTAL.value.__name__
+LATENCY = Metric.LATENCY.value.__name__
+
+
+def _label(metric: str, variant: str) -> MetricLabel:
+    return MetricLabel(metric=metric, func="f", variant=variant, is_error=False)
+
+
+def _labels(func_name: str, metric: str, variant: str) -> dict[str, str]:
+    return {"variant": variant, "func": "f", "metric": f"abtest_{func_name}_{metric}"}
+
+
+def test_array_store_is_collected_at_scrape() -> None:
+    """Test counters and histograms written into array slots are exposed by the collector"""
+    exporter = PrometheusExporter(
+        metrics=[CALLS, LATENCY], func_name="array_store", labelnames=[], port=0, store="array"
+    )
+    for variant, latency in [("a", 0.05), ("a", 0.7), ("b", 3.0)]:
+        exporter.record(_label(CALLS, variant), 1)
+        exporter.record(_label(LATENCY, variant), latency)
+
+    calls = f"abtest_array_store_{CALLS}"
+    latency = f"abtest_array_store_{LATENCY}"
+    assert REGISTRY.get_sample_value(f"{calls}_total", _labels("array_store", CALLS, "a")) == 2
+    assert REGISTRY.get_sample_value(f"{calls}_total", _labels("array_store", CALLS, "b")) == 1
+    a_labels = _labels("array_store", LATENCY, "a")
+    assert REGISTRY.get_sample_value(f"{latency}_bucket", {**a_labels, "le": "0.1"}) == 1
+    assert REGISTRY.get_sample_value(f"{latency}_bucket", {**a_labels, "le": "1.0"}) == 2
+    assert REGISTRY.get_sample_value(f"{latency}_count", a_labels) == 2
+    assert REGISTRY.get_sample_value(f"{latency}_sum", a_labels) == pytest.approx(0.75)
+
+
+def test_snapshot_returns_slots() -> None:
+    """Test snapshot() exposes the arrays indexed by series"""
+    exporter = PrometheusExporter(
+        metrics=[CALLS, LATENCY], func_name="array_snapshot", labelnames=[], port=0, store="array", max_series=2
+    )
+    exporter.record(_label(CALLS, "a"), 3)
+    exporter.record(_label(LATENCY, "b"), 0.3)
+    exporter.record(_label(LATENCY, "c"), 0.3)
+
+    snapshot = exporter.snapshot()
+    assert snapshot.labelnames == ["func", "metric", "variant"]
+    index = {values[2]: position for position, (_, values) in enumerate(snapshot.series)}
+    assert set(index) == {"a", "b"}
+    assert snapshot.counters[f"abtest_array_snapshot_{CALLS}"][index["a"]] == 3
+    buckets, counts, sums = snapshot.histograms[f"abtest_array_snapshot_{LATENCY}"]
+    width = len(buckets) + 1
+    assert list(counts[index["b"] * width : (index["b"] + 1) * width]) == [0, 1, 0, 0, 0, 0]
+    assert sums[index["b"]] == pytest.approx(0.3)
+    assert REGISTRY.get_sample_value(
+        "abtest_array_snapshot_series_dropped_total",
+        {"metric": f"abtest_array_snapshot_{LATENCY}", "reason": "overflow"},
+    )
+
+
+def test_snapshot_requires_array_store() -> None:
+    """Test snapshot() is only available in array mode"""
+    exporter = PrometheusExporter(metrics=[CALLS], func_name="array_client", labelnames=[], port=0)
+    with pytest.raises(RuntimeError):
+        exporter.snapshot()
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from fast_abtest import PrometheusExporter, MetricLabel, Metric
+
+CALLS = Metric.CALLS_TOTAL.value.__name__
+
+
+def _exporter(func_name: str, **kwargs) -> PrometheusExporter:
+    return PrometheusExporter(metrics=[CALLS], func_name=func_name, labelnames=["path"], port=0, **kwargs)
+
+
+def _record(exporter: PrometheusExporter, path: str) -> None:
+    exporter.record(MetricLabel(metric=CALLS, func="f", variant="a", is_error=False, tags={"path": path}), value=1)
+
+
+def _sample(func_name: str, path: str) -> float | None:
+    return REGISTRY.get_sample_value(
+        f"abtest_{func_name}_{CALLS}_total",
+        {"variant": "a", "func": "f", "metric": f"abtest_{func_name}_{CALLS}", "path": path},
+    )
+
+
+def _dropped(func_name: str, reason: str) -> float | None:
+    return REGISTRY.get_sample_value(
+        f"abtest_{func_name}_series_dropped_total", {"metric": f"abtest_{func_name}_{CALLS}", "reason": reason}
+    )
+
+
+def test_series_over_limit_go_to_overflow() -> None:
+    """Test label sets over the limit are recorded in the overflow series, drops counted per record"""
+    exporter = _exporter("cardinality_overflow", max_series=3)
+    for user in range(10):
+        _record(exporter, f"/users/{user}")
+    _record(exporter, "/users/0")
+
+    assert _sample("cardinality_overflow", "/users/0") == 2
+    assert _sample("cardinality_overflow", "/users/3") is None
+    assert _sample("cardinality_overflow", PrometheusExporter.OVERFLOW_VALUE) == 7
+    assert _dropped("cardinality_overflow", "overflow") == 7
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used series is removed when overflow is disabled"""
+    exporter = _exporter("cardinality_lru", max_series=2, overflow=False)
+    _record(exporter, "/a")
+    _record(exporter, "/b")
+    _record(exporter, "/a")
+    _record(exporter, "/c")
+
+    assert _sample("cardinality_lru", "/a") == 2
+    assert _sample("cardinality_lru", "/b") is None
+    assert _sample("cardinality_lru", "/c") == 1
+    assert _dropped("cardinality_lru", "lru") == 1
+
+
+def test_idle_series_expire() -> None:
+    """Test series idle for longer than the TTL are removed"""
+    exporter = _exporter("cardinality_ttl", series_ttl=60)
+    with patch("fast_abtest.exporter.prometheus.monotonic", return_value=1000.0):
+        _record(exporter, "/old")
+    with patch("fast_abtest.exporter.prometheus.monotonic", return_value=1050.0):
+        _record(exporter, "/recent")
+    with patch("fast_abtest.exporter.prometheus.monotonic", return_value=1070.0):
+        _record(exporter, "/new")
+
+    assert _sample("cardinality_ttl", "/old") is None
+    assert _sample("cardinality_ttl", "/recent") == 1
+    assert _sample("cardinality_ttl", "/new") == 1
+    assert _dropped("cardinality_ttl", "ttl") == 1
+
+
+def test_dropped_counter_is_created_on_first_drop() -> None:
+    """Test exporters of same-named scenarios without drops register no shared collector"""
+    for _ in range(2):
+        PrometheusExporter(metrics=[], func_name="cardinality_lazy", labelnames=["path"], port=0)
+    assert "cardinality_lazy" not in PrometheusExporter._dropped
@@ -0,0 +1,52 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fast_abtest import ab_test, ABTestConfig, ConfigManager, Metric
+
+
+def test_cpu_time_separates_busy_from_waiting(memory_exporter, exporter_of) -> None:
+    """Test CPU time grows with computation, not with sleeping"""
+
+    @ab_test(metrics=[Metric.CPU_TIME], exporter=memory_exporter)
+    def work(busy: bool) -> None:
+        if busy:
+            deadline = time.thread_time() + 0.05
+            while time.thread_time() < deadline:
+                pass
+        else:
+            time.sleep(0.05)
+
+    work(True)
+    work(False)
+
+    busy, waiting = exporter_of(work).values("CpuTimeMetric")
+    assert busy >= 0.05
+    assert waiting < 0.02
+
+
+def test_allocations_are_sampled_and_scaled(memory_exporter, exporter_of) -> None:
+    """Test allocation deltas are recorded for sampled calls only and scaled by the rate"""
+    config = ABTestConfig(allocation_sample_rate=0.5)
+    with patch.object(ConfigManager, "get_config", return_value=config):
+
+        @ab_test(metrics=[Metric.ALLOCATIONS], exporter=memory_exporter)
+        def allocate(n: int) -> list:
+            return [object() for _ in range(n)]
+
+    keep = [allocate(1000) for _ in range(200)]
+
+    recorded = exporter_of(allocate).values("AllocationsMetric")
+    assert 50 < len(recorded) < 150
+    assert all(value % 2 == 0 for value in recorded)
+    assert sum(recorded) / len(recorded) >= 2 * 1000
+    assert len(keep) == 200
+
+
+def test_allocation_sample_rate_validation() -> None:
+    """Test invalid allocation sample rates are rejected"""
+    with pytest.raises(ValueError):
+        ABTestConfig(allocation_sample_rate=0)
+    with pytest.raises(ValueError):
+        ABTestConfig(allocation_sample_rate=1.5)
@@ -0,0 +1,25 @@
+import time
+from logging import getLogger
+from unittest.mock import MagicMock
+
+from fast_abtest.scheduler import Scheduler
+
+
+def test_failing_callback_is_logged_and_rescheduled(monkeypatch) -> None:
+    """Test an exception raised by a callback is logged and does not stop the schedule"""
+    logger = getLogger("fast_abtest.scheduler")
+    monkeypatch.setattr(logger, "error", MagicMock())
+    calls = []
+
+    def callback() -> None:
+        calls.append(1)
+        raise ValueError("broken check")
+
+    task = Scheduler.every(0.01, callback)
+    deadline = time.monotonic() + 2
+    while len(calls) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    task.cancel()
+
+    assert len(calls) >= 2
+    assert "ValueError: broken check" in logger.error.call_args.args[0]
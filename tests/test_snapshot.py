@@ -0,0 +1,86 @@
+import os
+
+from fast_abtest import ab_test, Metric, SnapshotStore
+
+
+def _scenario(exporter, store: SnapshotStore, traffic_percent: int = 60, disable_threshold: float = 0.5):
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=exporter, snapshot=store)
+    def checkout(fail: bool = False) -> str:
+        return "a"
+
+    @checkout.register_variant(traffic_percent=traffic_percent, disable_threshold=disable_threshold)
+    def checkout_b(fail: bool = False) -> str:
+        if fail:
+            raise ValueError
+        return "b"
+
+    return checkout
+
+
+def _variant(scenario):
+    return scenario._variants[0]
+
+
+def test_state_survives_restart(tmp_path, memory_exporter) -> None:
+    """Test counts and disabled state are restored by a new scenario reading the same file"""
+    path = tmp_path / "abtest.snapshot"
+    store = SnapshotStore(path, interval=3600)
+    scenario = _scenario(memory_exporter, store)
+    variant = _variant(scenario)
+    variant.call_count, variant.error_count, variant.is_active = 40, 30, False
+    store.close()
+
+    assert os.path.getsize(path) == SnapshotStore.HEADER.size + SnapshotStore.RECORD.size
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    restarted_store = SnapshotStore(path, interval=3600)
+    restarted = _variant(_scenario(memory_exporter, restarted_store))
+    assert (restarted.call_count, restarted.error_count, restarted.is_active) == (40, 30, False)
+    assert {_scenario(memory_exporter, restarted_store)() for _ in range(20)} == {"a"}
+    restarted_store.close()
+
+
+def test_stale_snapshot_is_ignored(tmp_path, memory_exporter) -> None:
+    """Test a changed traffic share or threshold invalidates the stored state of the variant"""
+    path = tmp_path / "abtest.snapshot"
+    store = SnapshotStore(path, interval=3600)
+    scenario = _scenario(memory_exporter, store)
+    _variant(scenario).call_count = 40
+    store.close()
+
+    store = SnapshotStore(path, interval=3600)
+    assert _variant(_scenario(memory_exporter, store, traffic_percent=50)).call_count == 0
+    assert _variant(_scenario(memory_exporter, store, disable_threshold=0.9)).call_count == 0
+    assert _variant(_scenario(memory_exporter, store)).call_count == 40
+    store.close()
+
+
+def test_untracked_records_are_kept(tmp_path, memory_exporter) -> None:
+    """Test saving before every scenario is registered keeps the records of the missing ones"""
+    path = tmp_path / "abtest.snapshot"
+    store = SnapshotStore(path, interval=3600)
+    scenario = _scenario(memory_exporter, store)
+    _variant(scenario).call_count = 40
+    store.close()
+
+    store = SnapshotStore(path, interval=3600)
+    store.save()
+    store.close()
+
+    store = SnapshotStore(path, interval=3600)
+    assert _variant(_scenario(memory_exporter, store)).call_count == 40
+    store.close()
+
+
+def test_invalid_file_is_ignored(tmp_path, memory_exporter) -> None:
+    """Test missing, truncated or foreign files start the experiment from scratch"""
+    path = tmp_path / "abtest.snapshot"
+    assert SnapshotStore.read(str(path)) == {}
+    path.write_bytes(b"ABTS\x01\x00\x00\x00\x05\x00\x00\x00")
+    assert SnapshotStore.read(str(path)) == {}
+    path.write_bytes(b"not a snapshot at all, just some text")
+    assert SnapshotStore.read(str(path)) == {}
+
+    store = SnapshotStore(path, interval=3600)
+    assert _variant(_scenario(memory_exporter, store)).call_count == 0
+    store.close()
@@ -0,0 +1,119 @@
+import time
+from logging import getLogger
+from unittest.mock import MagicMock
+
+import pytest
+
+from fast_abtest import ab_test, experiment_context, SrmConfig, Warmup
+from fast_abtest.monitoring.srm import chi2_sf
+
+
+@pytest.mark.parametrize(
+    "x, dof, expected",
+    [(3.841, 1, 0.05), (5.991, 2, 0.05), (10.828, 1, 0.001), (0.5, 3, 0.9189)],
+)
+def test_chi2_survival_function(x: float, dof: int, expected: float) -> None:
+    """Test p-values against chi-square distribution tables"""
+    assert chi2_sf(x, dof) == pytest.approx(expected, rel=1e-3)
+
+
+def test_balanced_split_passes(memory_exporter) -> None:
+    """Test a split matching traffic_percent is not reported"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, srm=SrmConfig(interval=3600, min_calls=100))
+    def handler() -> None: ...
+
+    @handler.register_variant(traffic_percent=30)
+    def handler_b() -> None: ...
+
+    assert handler.check_srm() is None
+    for _ in range(2000):
+        handler()
+
+    result = handler.check_srm()
+    assert result is not None
+    assert sum(result.observed.values()) == 2000
+    assert result.expected == {"handler": 1400, "handler_b": 600}
+    assert not result.mismatch
+
+
+def test_warmup_calls_are_counted(memory_exporter) -> None:
+    """Test calls served during a variant warm-up still count towards the observed split"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, srm=SrmConfig(interval=3600, min_calls=100))
+    def handler() -> None: ...
+
+    @handler.register_variant(traffic_percent=50, warmup=Warmup(calls=100))
+    def handler_b() -> None: ...
+
+    for _ in range(2000):
+        handler()
+
+    result = handler.check_srm()
+    assert result is not None
+    assert sum(result.observed.values()) == 2000
+    assert not result.mismatch
+
+
+def test_mismatch_is_logged_and_exported(memory_exporter) -> None:
+    """Test calls routed outside the configured split are reported in the background"""
+    logger = getLogger("srm")
+    logger.warning = MagicMock()
+
+    @ab_test(metrics=[], exporter=memory_exporter, logger=logger, srm=SrmConfig(interval=0.05, min_calls=100))
+    def skewed() -> None: ...
+
+    @skewed.register_variant(traffic_percent=50)
+    def skewed_b() -> None: ...
+
+    skewed.override("qa", "skewed_b")
+    for _ in range(1000):
+        with experiment_context(key="qa"):
+            skewed()
+
+    def srm_warnings() -> list[str]:
+        return [call.args[0] for call in logger.warning.call_args_list if "Sample ratio mismatch" in call.args[0]]
+
+    deadline = time.monotonic() + 2
+    while not srm_warnings() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    skewed._srm.stop()
+
+    assert skewed.check_srm().mismatch
+    assert srm_warnings()[0].startswith("Sample ratio mismatch in skewed")
+    exporter = skewed._srm._exporter
+    assert "SampleRatioMismatch" in exporter.metrics
+    label, _ = exporter.recorded[0]
+    assert label.metric == "SampleRatioMismatch"
+    assert label.variant in {"skewed", "skewed_b"}
+
+
+def test_split_change_resets_counts(memory_exporter) -> None:
+    """Test a variant disabled by its error threshold restarts the counts instead of reporting a mismatch"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, srm=SrmConfig(interval=3600, min_calls=100))
+    def flaky(fail: bool) -> None: ...
+
+    @flaky.register_variant(traffic_percent=50, disable_threshold=0.01)
+    def flaky_b(fail: bool) -> None:
+        if fail:
+            raise ValueError
+
+    @flaky.register_variant(traffic_percent=20)
+    def flaky_c(fail: bool) -> None: ...
+
+    assert flaky.check_srm() is None
+    for _ in range(1000):
+        try:
+            flaky(True)
+        except ValueError:
+            pass
+
+    assert not flaky._variants[0].is_active
+    assert flaky.check_srm() is None
+    for _ in range(1000):
+        flaky(False)
+    result = flaky.check_srm()
+    assert sum(result.observed.values()) == 1000
+    assert result.expected == {"flaky": 800, "flaky_c": 200}
+    assert not result.mismatch
@@ -0,0 +1,151 @@
+import socket
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from fast_abtest import ab_test, ABTestConfig, ConfigManager, Metric, MetricLabel, StatsDExporter
+
+
+@pytest.fixture
+def udp_server():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1.0)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def exporter(udp_server):
+    exporter = StatsDExporter(
+        metrics=["CallsMetric", "LatencyMetric"],
+        func_name="statsd_func",
+        labelnames=["endpoint"],
+        port=udp_server.getsockname()[1],
+        flush_interval=3600,
+    )
+    yield exporter
+    exporter.close()
+
+
+def _receive(server: socket.socket) -> list[bytes]:
+    datagrams = []
+    server.settimeout(0.2)
+    try:
+        while True:
+            datagrams.append(server.recv(65535))
+    except socket.timeout:
+        return datagrams
+
+
+def test_counters_aggregated_into_single_datagram(exporter, udp_server):
+    """Test many calls are flushed as one aggregated counter line"""
+    for _ in range(100):
+        exporter.record(
+            MetricLabel(metric="CallsMetric", func="statsd_func", variant="A", is_error=False, tags={"endpoint": "/a"}),
+            value=1,
+        )
+    exporter.record(MetricLabel(metric="LatencyMetric", func="statsd_func", variant="B", is_error=False), value=0.5)
+
+    assert exporter.flush() == 1
+    (datagram,) = _receive(udp_server)
+    lines = datagram.decode().split("\n")
+    assert "abtest.statsd_func.CallsMetric:100|c|#endpoint:/a,func:statsd_func,variant:A" in lines
+    assert "abtest.statsd_func.LatencyMetric:500.000|ms|#func:statsd_func,variant:B" in lines
+
+
+def test_values_and_tags_are_not_mangled(exporter, udp_server):
+    """Test counters keep full precision and tag values cannot break the line format"""
+    tags = {"endpoint": "/a,b|c:d"}
+    exporter.record(MetricLabel(metric="CallsMetric", func="statsd_func", variant="A", is_error=False), value=10**6)
+    exporter.record(MetricLabel(metric="Bytes", func="statsd_func", variant="A", is_error=False), value=1234567.25)
+    exporter.record(MetricLabel(metric="Cost", func="statsd_func", variant="A", is_error=False), value=1.5e-05)
+    exporter.record(MetricLabel(metric="CallsMetric", func="statsd_func", variant="B", is_error=False, tags=tags), 1)
+
+    exporter.flush()
+    (datagram,) = _receive(udp_server)
+    lines = datagram.decode().split("\n")
+    assert "abtest.statsd_func.CallsMetric:1000000|c|#func:statsd_func,variant:A" in lines
+    assert "abtest.statsd_func.Bytes:1234567.25|c|#func:statsd_func,variant:A" in lines
+    assert "abtest.statsd_func.Cost:0.000015|c|#func:statsd_func,variant:A" in lines
+    assert "abtest.statsd_func.CallsMetric:1|c|#endpoint:/a_b_c_d,func:statsd_func,variant:B" in lines
+
+
+def test_datagrams_respect_mtu(exporter, udp_server):
+    """Test lines are packed into datagrams not larger than the MTU"""
+    for variant in range(200):
+        exporter.record(MetricLabel(metric="CallsMetric", func="statsd_func", variant=f"v{variant}", is_error=False), 1)
+
+    sent = exporter.flush()
+    datagrams = _receive(udp_server)
+    assert sent == len(datagrams) > 1
+    assert all(len(datagram) <= StatsDExporter.MTU for datagram in datagrams)
+    assert sum(len(datagram.split(b"\n")) for datagram in datagrams) == 200
+
+
+def test_timer_reservoir_is_bounded(exporter, udp_server):
+    """Test timers keep a bounded sample with a sample rate"""
+    for _ in range(1000):
+        exporter.record(MetricLabel(metric="LatencyMetric", func="statsd_func", variant="A", is_error=False), 0.001)
+
+    exporter.flush()
+    lines = b"\n".join(_receive(udp_server)).decode().split("\n")
+    assert len(lines) == StatsDExporter.TIMER_RESERVOIR
+    assert all("|@0.128|" in line for line in lines)
+
+
+def test_empty_flush_sends_nothing(exporter, udp_server):
+    """Test nothing is sent when no metrics were recorded"""
+    assert exporter.flush() == 0
+    assert _receive(udp_server) == []
+
+
+def test_decorator_integration(udp_server):
+    """Test the exporter works through ab_test"""
+    port = udp_server.getsockname()[1]
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=partial(StatsDExporter, flush_interval=3600))
+    def pushed() -> str:
+        return "ok"
+
+    exporter = pushed._metric_recorder._metrics[0]._exporter
+    exporter._address = ("127.0.0.1", port)
+    for _ in range(10):
+        pushed()
+    exporter.close()
+
+    (datagram,) = _receive(udp_server)
+    assert datagram.decode() == "abtest.pushed.CallsMetric:10|c|#func:pushed,variant:pushed"
+
+
+def test_port_comes_from_statsd_setting_or_partial():
+    """Test the decorator passes the StatsD port setting unless the partial binds a port"""
+    config = ABTestConfig(prometheus_port=9000, statsd_port=9125)
+    with patch.object(ConfigManager, "get_config", return_value=config):
+
+        @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=partial(StatsDExporter, flush_interval=3600))
+        def configured() -> None: ...
+
+        @ab_test(metrics=[Metric.CALLS_TOTAL], exporter=partial(StatsDExporter, port=8200, flush_interval=3600))
+        def bound() -> None: ...
+
+    for scenario, port in ((configured, 9125), (bound, 8200)):
+        exporter = scenario._metric_recorder._metrics[0]._exporter
+        assert exporter._address == ("127.0.0.1", port)
+        exporter.close()
+
+
+def test_close_runs_at_exit(udp_server):
+    """Test the last interval is flushed at interpreter exit"""
+    registered = []
+    with patch("fast_abtest.exporter.statsd.atexit.register", registered.append):
+        exporter = StatsDExporter(
+            metrics=[], func_name="statsd_func", labelnames=[], port=udp_server.getsockname()[1], flush_interval=3600
+        )
+    assert registered == [exporter.close]
+
+    exporter.record(MetricLabel(metric="CallsMetric", func="statsd_func", variant="A", is_error=False), 1)
+    registered[0]()
+    (datagram,) = _receive(udp_server)
+    assert datagram.decode() == "abtest.statsd_func.CallsMetric:1|c|#func:statsd_func,variant:A"
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from fast_abtest import ab_test, Metric
+
+STREAM_METRICS = [
+    Metric.LATENCY,
+    Metric.ERRORS_TOTAL,
+    Metric.STREAM_FIRST_CHUNK_LATENCY,
+    Metric.STREAM_CHUNKS,
+    Metric.STREAM_BYTES,
+    Metric.STREAM_ERRORS,
+]
+
+
+def test_sync_generator_is_not_buffered(memory_exporter, exporter_of) -> None:
+    """Test chunks are forwarded lazily and metrics end with the stream"""
+    produced = []
+
+    @ab_test(metrics=STREAM_METRICS, exporter=memory_exporter)
+    def chunks(n: int):
+        for i in range(n):
+            produced.append(i)
+            time.sleep(0.01)
+            yield b"chunk"
+
+    stream = chunks(3)
+    assert produced == []
+    assert next(stream) == b"chunk"
+    assert produced == [0]
+    assert exporter_of(chunks).recorded == []
+
+    assert list(stream) == [b"chunk", b"chunk"]
+    recorded = exporter_of(chunks).by_metric()
+    assert recorded["StreamChunksMetric"] == [3]
+    assert recorded["StreamBytesMetric"] == [15]
+    assert recorded["LatencyMetric"][0] >= 0.03
+    assert 0 < recorded["FirstChunkLatencyMetric"][0] < recorded["LatencyMetric"][0]
+    assert "StreamErrorsMetric" not in recorded
+
+
+def test_async_generator_mid_stream_error(memory_exporter, exporter_of) -> None:
+    """Test errors raised while streaming are recorded per variant"""
+
+    @ab_test(metrics=STREAM_METRICS, exporter=memory_exporter)
+    async def events():
+        yield "first"
+        raise RuntimeError("broken stream")
+
+    async def consume() -> list[str]:
+        return [item async for item in events()]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(consume())
+
+    recorded = exporter_of(events).by_metric()
+    assert recorded["StreamErrorsMetric"] == [1]
+    assert recorded["ErrorsMetric"] == [1]
+    assert recorded["StreamChunksMetric"] == [1]
+    assert events._main_scenario.error_count == 1
+
+
+def test_closed_stream_is_not_an_error(memory_exporter, exporter_of) -> None:
+    """Test a consumer stopping early ends the recording without an error"""
+
+    @ab_test(metrics=STREAM_METRICS, exporter=memory_exporter)
+    def infinite():
+        while True:
+            yield "tick"
+
+    stream = infinite()
+    next(stream)
+    stream.close()
+
+    recorded = exporter_of(infinite).by_metric()
+    assert recorded["StreamChunksMetric"] == [1]
+    assert "ErrorsMetric" not in recorded
+
+
+def test_fastapi_streaming_response(memory_exporter, exporter_of) -> None:
+    """Test StreamingResponse bodies are tracked from a sync endpoint"""
+    app = FastAPI()
+
+    @app.get("/stream")
+    @ab_test(metrics=STREAM_METRICS, exporter=memory_exporter)
+    def stream_endpoint():
+        def body():
+            for _ in range(4):
+                yield b"data"
+
+        return StreamingResponse(body())
+
+    response = TestClient(app).get("/stream")
+    assert response.content == b"data" * 4
+
+    recorded = exporter_of(stream_endpoint).by_metric()
+    assert recorded["StreamChunksMetric"] == [4]
+    assert recorded["StreamBytesMetric"] == [16]
+    assert len(recorded["LatencyMetric"]) == 1
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fast_abtest import ab_test
+from fast_abtest.asgi import stats_app
+from fast_abtest.monitoring.timeseries import TimeSeries
+
+
+def test_ring_aggregates_window() -> None:
+    """Test RPS, error rate and percentiles are computed over complete seconds of the window"""
+    series = TimeSeries(seconds=10)
+    for second in range(100, 105):
+        for _ in range(10):
+            series.record("a", 0.010, is_error=False, now=second)
+        series.record("a", 0.500, is_error=True, now=second)
+    series.record("a", 1.0, is_error=True, now=105)
+
+    stats = series.stats(window=5, now=105)["a"]
+    assert stats["calls"] == 55
+    assert stats["rps"] == 11
+    assert stats["error_rate"] == pytest.approx(5 / 55)
+    assert stats["p50"] == pytest.approx(0.010, rel=0.15)
+    assert stats["p99"] == pytest.approx(0.500, rel=0.15)
+
+
+def test_ring_memory_is_fixed() -> None:
+    """Test slots are reused once the ring wraps around"""
+    series = TimeSeries(seconds=10)
+    series.record("a", 0.01, is_error=False, now=100)
+    series.record("a", 0.01, is_error=False, now=110)
+
+    assert series.stats(window=10, now=111)["a"]["calls"] == 1
+    assert len(series._variants["a"].calls) == 10
+    latency = series._variants["a"].latency
+    assert len(latency) * latency.itemsize == 10 * 512
+
+    series.record("a", 86_400.0, is_error=False, now=111)
+    assert series.stats(window=1, now=112)["a"]["p50"] > 3600
+
+    with pytest.raises(ValueError):
+        series.stats(window=11)
+
+
+def test_scenario_stats_and_route(null_exporter) -> None:
+    """Test scenarios feed the ring through the recorder and expose it over ASGI"""
+
+    @ab_test(metrics=[], exporter=null_exporter, stats_retention=60)
+    def handler(fail: bool) -> str:
+        if fail:
+            raise ValueError
+        return "a"
+
+    @handler.register_variant(traffic_percent=1)
+    def handler_b(fail: bool) -> str:
+        if fail:
+            raise ValueError
+        return "b"
+
+    with patch("fast_abtest.monitoring.timeseries.time", return_value=1000.0):
+        for _ in range(20):
+            handler(False)
+        with pytest.raises(ValueError):
+            handler(True)
+
+    with patch("fast_abtest.monitoring.timeseries.time", return_value=1001.0):
+        stats = handler.stats(window=10)
+    assert sum(variant["calls"] for variant in stats.values()) == 21
+    assert sum(variant["error_rate"] * variant["calls"] for variant in stats.values()) == pytest.approx(1)
+
+    app = FastAPI()
+    app.mount("/abtest/stats", stats_app([handler]))
+    client = TestClient(app)
+    response = client.get("/abtest/stats", params={"window": 30})
+    assert response.status_code == 200
+    assert set(response.json()) == {"handler"}
+    assert client.get("/abtest/stats", params={"window": 3600}).status_code == 400
+
+    with pytest.raises(RuntimeError):
+
+        @ab_test(metrics=[], exporter=null_exporter)
+        def disabled() -> None: ...
+
+        disabled.stats()
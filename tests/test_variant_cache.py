@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+from random import seed
+
+import pytest
+
+from fast_abtest import ab_test, CacheConfig, Metric
+
+
+@pytest.fixture
+def reset_random():
+    seed(42)
+
+
+def test_cache_hit_skips_handler(memory_exporter, exporter_of) -> None:
+    """Test repeated calls with equal normalized arguments are served from cache"""
+    calls = 0
+
+    @ab_test(metrics=[Metric.CACHE_HITS, Metric.CACHE_MISSES], exporter=memory_exporter, cache=CacheConfig())
+    def lookup(user_id: int, limit: int = 10) -> list[int]:
+        nonlocal calls
+        calls += 1
+        return list(range(user_id, user_id + limit))
+
+    assert lookup(1) == lookup(1, 10) == lookup(user_id=1, limit=10)
+    assert calls == 1
+
+    exporter = exporter_of(lookup)
+    assert exporter.count("CacheHitsMetric", "lookup") == 2
+    assert exporter.count("CacheMissesMetric", "lookup") == 1
+
+
+def test_caches_are_separate_per_variant(reset_random, memory_exporter) -> None:
+    """Test results never leak between variants"""
+
+    @ab_test(metrics=[], exporter=memory_exporter, cache=CacheConfig())
+    def recommend(user_id: int) -> str:
+        return "A"
+
+    @recommend.register_variant(traffic_percent=50)
+    def recommend_b(user_id: int) -> str:
+        return "B"
+
+    results = {recommend(1) for _ in range(50)}
+    assert results == {"A", "B"}
+    assert len(recommend._main_scenario.cache) == 1
+    assert len(recommend._variants[0].cache) == 1
+
+
+def test_cache_lru_and_ttl(memory_exporter) -> None:
+    """Test the cache is bounded and entries expire"""
+    calls = 0
+
+    @ab_test(metrics=[], exporter=memory_exporter, cache=CacheConfig(maxsize=2, ttl=0.05))
+    def square(x: int) -> int:
+        nonlocal calls
+        calls += 1
+        return x * x
+
+    square(1), square(2), square(3)
+    assert len(square._main_scenario.cache) == 2
+    square(1)
+    assert calls == 4
+
+    time.sleep(0.06)
+    square(3)
+    assert calls == 5
+
+
+def test_uncacheable_arguments_and_errors(memory_exporter) -> None:
+    """Test unhashable arguments bypass the cache and exceptions are not cached"""
+    calls = 0
+
+    @ab_test(metrics=[], exporter=memory_exporter, cache=CacheConfig())
+    def process(payload: object) -> int:
+        nonlocal calls
+        calls += 1
+        if payload == "fail":
+            raise ValueError("fail")
+        return calls
+
+    assert process({"a": [1, 2]}) == process({"a": [1, 2]}) == 1
+    process(bytearray(b"x"))
+    process(bytearray(b"x"))
+    assert calls == 3
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            process("fail")
+    assert calls == 5
+
+
+def test_async_in_flight_misses_deduplicated(memory_exporter, exporter_of) -> None:
+    """Test concurrent coroutine misses share one handler execution"""
+    calls = 0
+
+    @ab_test(metrics=[Metric.CACHE_HITS, Metric.CACHE_MISSES], exporter=memory_exporter, cache=CacheConfig())
+    async def fetch(item_id: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return item_id * 2
+
+    async def main() -> list[int]:
+        return await asyncio.gather(*(fetch(7) for _ in range(20)))
+
+    assert asyncio.run(main()) == [14] * 20
+    assert calls == 1
+    exporter = exporter_of(fetch)
+    assert exporter.count("CacheMissesMetric", "fetch") == 1
+    assert exporter.count("CacheHitsMetric", "fetch") == 19
+
+
+def test_cancelled_in_flight_miss_is_retried_by_waiters(memory_exporter) -> None:
+    """Test waiters of a cancelled in-flight execution run the handler instead of being cancelled"""
+    calls = 0
+
+    @ab_test(metrics=[], exporter=memory_exporter, cache=CacheConfig())
+    async def fetch(item_id: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return item_id * 2
+
+    async def main() -> list[int]:
+        leader = asyncio.create_task(fetch(7))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(fetch(7)) for _ in range(5)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == [14] * 5
+    assert calls == 2
+
+
+def test_in_flight_misses_are_scoped_to_the_event_loop(memory_exporter) -> None:
+    """Test coroutines of event loops in different threads never await each other's execution"""
+    barrier = threading.Barrier(2, timeout=2)
+
+    @ab_test(metrics=[], exporter=memory_exporter, cache=CacheConfig())
+    async def fetch(item_id: int) -> int:
+        barrier.wait()
+        return item_id * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(fetch(7)))) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [14, 14]
@@ -0,0 +1,148 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fast_abtest import ab_test, Metric, Warmup
+
+
+def test_warmup_calls_are_excluded_from_statistics(memory_exporter, exporter_of) -> None:
+    """Test first N calls neither trip the error threshold nor reach other metrics"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.ERRORS_TOTAL, Metric.WARMUP_CALLS], exporter=memory_exporter)
+    def handler(fail: bool) -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=99, disable_threshold=0.5, warmup=Warmup(calls=20))
+    def handler_b(fail: bool) -> str:
+        if fail:
+            raise ValueError
+        return "b"
+
+    variant = handler._variants[0]
+    with patch("fast_abtest.variant_selector.randint", return_value=1):
+        for _ in range(20):
+            with pytest.raises(ValueError):
+                handler(True)
+        assert handler.warmup_progress() == {"handler_b": 1.0}
+        assert variant.is_active
+        assert variant.call_count == 0
+        assert variant.error_count == 0
+
+        assert handler(False) == "b"
+
+    exporter = exporter_of(handler)
+    assert exporter.variants("WarmupCallsMetric") == ["handler_b"] * 20
+    assert exporter.variants("CallsMetric") == ["handler_b"]
+    assert exporter.variants("ErrorsMetric") == []
+
+
+def test_warmup_duration(memory_exporter, exporter_of) -> None:
+    """Test calls within the warm-up duration are excluded"""
+
+    @ab_test(metrics=[Metric.CALLS_TOTAL, Metric.WARMUP_CALLS], exporter=memory_exporter)
+    def handler() -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=99, warmup=Warmup(seconds=60))
+    def handler_b() -> str:
+        return "b"
+
+    with patch("fast_abtest.variant_selector.randint", return_value=1):
+        with patch("fast_abtest.warmup.monotonic", return_value=1000.0):
+            handler()
+            assert handler.warmup_progress() == {"handler_b": 0.0}
+        with patch("fast_abtest.warmup.monotonic", return_value=1030.0):
+            handler()
+            assert handler.warmup_progress() == {"handler_b": 0.5}
+        with patch("fast_abtest.warmup.monotonic", return_value=1061.0):
+            handler()
+
+    exporter = exporter_of(handler)
+    assert exporter.variants("WarmupCallsMetric") == ["handler_b"] * 2
+    assert exporter.variants("CallsMetric") == ["handler_b"]
+
+
+def test_warmup_function(memory_exporter) -> None:
+    """Test sync warm-up functions run at registration and coroutine ones before the first call"""
+    warm_sync = MagicMock()
+    warm_async_calls = []
+
+    async def warm_async() -> None:
+        await asyncio.sleep(0.01)
+        warm_async_calls.append(1)
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    async def handler() -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=50, warmup=Warmup(function=warm_sync))
+    async def handler_b() -> str:
+        return "b"
+
+    @handler.register_variant(traffic_percent=49, warmup=Warmup(function=warm_async))
+    async def handler_c() -> str:
+        assert warm_async_calls == [1]
+        return "c"
+
+    warm_sync.assert_called_once()
+
+    async def main() -> set[str]:
+        return set(await asyncio.gather(*(handler() for _ in range(50))))
+
+    with patch("fast_abtest.variant_selector.randint", return_value=60):
+        assert asyncio.run(main()) == {"c"}
+    assert warm_async_calls == [1]
+    assert handler.warmup_progress() == {"handler_b": 1.0, "handler_c": 1.0}
+
+
+def test_coroutine_warmup_requires_async_variant(memory_exporter) -> None:
+    """Test a coroutine warm-up function is rejected for a sync variant, which could never await it"""
+
+    async def warm() -> None: ...
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    def handler() -> str:
+        return "a"
+
+    with pytest.raises(TypeError, match="requires an async variant"):
+
+        @handler.register_variant(traffic_percent=50, warmup=Warmup(function=warm))
+        def handler_b() -> str:
+            return "b"
+
+    assert handler._variants == []
+
+
+def test_failed_coroutine_warmup_is_retried_and_counted(memory_exporter) -> None:
+    """Test a failing coroutine warm-up counts against the variant and is retried on the next call"""
+    attempts = []
+
+    async def warm() -> None:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError
+
+    @ab_test(metrics=[], exporter=memory_exporter)
+    async def handler() -> str:
+        return "a"
+
+    @handler.register_variant(traffic_percent=99, warmup=Warmup(function=warm))
+    async def handler_b() -> str:
+        return "b"
+
+    async def main() -> list[str | None]:
+        results = []
+        for _ in range(4):
+            try:
+                results.append(await handler())
+            except ConnectionError:
+                results.append(None)
+        return results
+
+    variant = handler._variants[0]
+    with patch("fast_abtest.variant_selector.randint", return_value=1):
+        assert asyncio.run(main()) == [None, None, "b", "b"]
+    assert len(attempts) == 3
+    assert variant.error_count == 2
+    assert variant.call_count == 4